@@ -0,0 +1,72 @@
+# benchmarks/bench_text_extraction.py
+"""
+Mikro-Benchmark der HTML-Extraktion auf gespeicherten Artikeln aus test/fixtures/html.
+
+Vergleicht den bisherigen Weg (ein BeautifulSoup-Parse mit 'html.parser' pro
+Absatz bzw. pro Seite) mit allen installierten Backends des TextExtractors.
+
+Aufruf: python benchmarks/bench_text_extraction.py [Wiederholungen]
+"""
+import sys
+import os
+import json
+import timeit
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.text_extraction import TextExtractor, available_backends
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), '..', 'test', 'fixtures', 'html')
+SPIEGEL_SELECTOR = 'div[data-area="text"] p'
+
+
+def load_fixtures() -> dict:
+    with open(os.path.join(FIXTURE_DIR, 'spiegel_article.html'), encoding='utf-8') as fixture_file:
+        spiegel_html = fixture_file.read()
+    with open(os.path.join(FIXTURE_DIR, 'tagesschau_article.json'), encoding='utf-8') as fixture_file:
+        tagesschau_blocks = [block['value'] for block in json.load(fixture_file)['content'] if block['type'] == 'text']
+    with open(os.path.join(FIXTURE_DIR, 'handelsblatt_article.json'), encoding='utf-8') as fixture_file:
+        handelsblatt_paragraphs = [element['data']['text'] for element in json.load(fixture_file)['elements']
+                                   if element['type'] == 'paragraphStorylineElement']
+    return {'spiegel': spiegel_html, 'tagesschau': tagesschau_blocks, 'handelsblatt': handelsblatt_paragraphs}
+
+
+def legacy_extraction(fixtures: dict) -> list:
+    """Der bisherige Weg: ein html.parser-Durchgang pro Fragment bzw. pro Seite."""
+    tagesschau = [BeautifulSoup(block, "html.parser").get_text(strip=True) for block in fixtures['tagesschau']]
+    handelsblatt = [BeautifulSoup(text, "html.parser").get_text(strip=True) for text in fixtures['handelsblatt']]
+    soup = BeautifulSoup(fixtures['spiegel'], 'html.parser')
+    spiegel = [p.get_text(strip=True) for p in soup.select(SPIEGEL_SELECTOR)]
+    return [tagesschau, handelsblatt, spiegel]
+
+
+def extractor_extraction(extractor: TextExtractor, fixtures: dict) -> list:
+    return [
+        extractor.fragments_to_text(fixtures['tagesschau']),
+        extractor.fragments_to_text(fixtures['handelsblatt']),
+        extractor.select_text(fixtures['spiegel'], SPIEGEL_SELECTOR),
+    ]
+
+
+def run_benchmark(repeats: int = 50):
+    fixtures = load_fixtures()
+    print(f"--- Benchmark HTML-Extraktion ({repeats} Wiederholungen, je 3 Artikel) ---\n")
+    legacy_seconds = min(timeit.repeat(lambda: legacy_extraction(fixtures), number=repeats, repeat=3)) / repeats
+    print(f"{'bisher (html.parser je Fragment)':<36} {legacy_seconds * 1000:8.2f} ms")
+
+    reference = None
+    for backend in available_backends():
+        extractor = TextExtractor(backend)
+        output = extractor_extraction(extractor, fixtures)
+        if reference is None:
+            reference = output
+        elif output != reference:
+            print(f"-> Warnung: Backend '{backend}' liefert abweichenden Text.")
+        seconds = min(timeit.repeat(lambda: extractor_extraction(extractor, fixtures), number=repeats,
+                                    repeat=3)) / repeats
+        print(f"{backend:<36} {seconds * 1000:8.2f} ms  ({legacy_seconds / seconds:.1f}x schneller)")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
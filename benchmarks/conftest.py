@@ -0,0 +1,261 @@
+# benchmarks/conftest.py
+"""
+Gemeinsame Fixtures der Benchmarks.
+
+Zu Beginn einer Sitzung wird eine synthetische Nachrichtenseite (Such- und
+Artikel-APIs von Tagesschau, Spiegel und Handelsblatt) zusammen mit Kursen und
+Gemini-Antworten einmal über RecordingTransport und RecordingGenAIClient
+aufgezeichnet. Die Benchmarks selbst laufen ausschließlich im Replay-Modus,
+also ohne Netzwerk und ohne API-Schlüssel. Als Modellantworten dienen die
+echten Rohantworten aus 'results/'.
+"""
+import os
+import sys
+import json
+import random
+import contextlib
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.controller import ExperimentController
+from src.finance_provider import FinanceClient
+from src.replay import RecordingTransport, RecordingGenAIClient
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HTML_FIXTURE_DIR = os.path.join(REPO_DIR, 'test', 'fixtures', 'html')
+RAW_RESULTS_PATH = os.path.join(REPO_DIR, 'results', 'REAL_experiment_results_20250924_134743.csv')
+
+BENCH_MODEL = 'gemini-bench'
+BENCH_END_DATE = '2025-09-23'
+BENCH_TIMEFRAMES = [2, 7, 14]
+BENCH_COMPANIES = {
+    'Volkswagen': 'Automobil',
+    'Siemens': 'Industrie',
+    'Allianz': 'Finanzen',
+    'Apple': 'Technologie',
+    'Microsoft': 'Technologie',
+    'SAP': 'Software',
+    'Deutsche Bank': 'Finanzen',
+    'Rheinmetall': 'Rüstung',
+    'BMW': 'Automobil',
+    'Adidas': 'Konsumgüter'
+}
+# Neuester Artikel der synthetischen Seite, kurz vor dem simulierten Analysezeitpunkt
+_LATEST_ARTICLE = datetime(2025, 9, 22, 18, 0, tzinfo=timezone.utc)
+
+_SUBJECTS = ["{company}", "Der Konzern", "Das Unternehmen", "Der Vorstand von {company}", "Analysten",
+             "Die Aktie von {company}", "Anleger", "Der Finanzchef"]
+_PREDICATES = [
+    "meldet für das dritte Quartal einen Umsatz von {n} Milliarden Euro",
+    "hebt den Ausblick für das Gesamtjahr um {n} Prozent an",
+    "rechnet mit einem Rückgang des operativen Gewinns um {n} Prozent",
+    "kündigt ein Aktienrückkaufprogramm über {n} Milliarden Euro an",
+    "verliert im frühen Handel {n} Prozent",
+    "legt nach den Zahlen um {n} Prozent zu",
+    "bestätigt die Dividende von {n} Euro je Aktie",
+    "sieht die Nachfrage in China um {n} Prozent schwächer als erwartet",
+    "plant den Abbau von {n} hundert Stellen in Europa",
+    "übernimmt einen Zulieferer für {n} Millionen Euro",
+    "senkt das Kursziel auf {n} Euro",
+    "warnt vor Belastungen durch Zölle in Höhe von {n} Millionen Euro",
+]
+_TAGS = ['<strong>{}</strong>', '<a href="https://example.org/{n}">{}</a>', '<em>{}</em>', '{}', '{}', '{}']
+
+
+def _article_paragraphs(company: str, seed: str, paragraph_count: int = 6) -> list[str]:
+    """Erzeugt reproduzierbare HTML-Absätze zu einem Unternehmen."""
+    rng = random.Random(seed)
+    paragraphs = []
+    for _ in range(paragraph_count):
+        sentences = []
+        for _ in range(4):
+            subject = rng.choice(_SUBJECTS).format(company=company)
+            predicate = rng.choice(_PREDICATES).format(n=rng.randint(2, 90))
+            sentences.append(rng.choice(_TAGS).format(f"{subject} {predicate}.", n=rng.randint(1, 999)))
+        paragraphs.append("<p>" + " ".join(sentences) + "</p>")
+    return paragraphs
+
+
+def _response(url: str, body: str, content_type: str = 'application/json') -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = 200
+    response.headers['Content-Type'] = content_type
+    response.encoding = 'utf-8'
+    response._content = body.encode('utf-8')
+    return response
+
+
+class SyntheticNewsSite:
+    """
+    Beantwortet die Anfragen der drei Provider wie die echten APIs, aber mit
+    erzeugten Artikeln. Jede vierte Handelsblatt-Meldung ist eine Agenturmeldung,
+    die auch bei der Tagesschau erscheint, damit die Duplikaterkennung Arbeit hat.
+    """
+    tagesschau_interval = timedelta(hours=8)
+    spiegel_interval = timedelta(hours=24)
+    handelsblatt_interval = timedelta(hours=36)
+
+    def __init__(self):
+        with open(os.path.join(HTML_FIXTURE_DIR, 'spiegel_article.html'), encoding='utf-8') as fixture_file:
+            page = fixture_file.read()
+        # Die echte Seite dient als Hülle; nur der Artikeltext wird ersetzt
+        start = page.index("data-area='text'>") + len("data-area='text'>")
+        end = page.index("</div>", start)
+        self._spiegel_head, self._spiegel_tail = page[:start], page[end:]
+
+    @staticmethod
+    def _company_from(term: str) -> str:
+        return term.split('"')[1] if '"' in term else term
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None, timeout=None):
+        params = params or {}
+        if url.startswith('https://www.tagesschau.de/api2u/search/'):
+            return _response(url, self._tagesschau_search(self._company_from(params['searchText']),
+                                                          params['resultPage'], params['pageSize']))
+        if url.startswith('https://bench.tagesschau.de/'):
+            company, index = url.rsplit('/', 2)[-2:]
+            blocks = [{'type': 'text', 'value': paragraph}
+                      for paragraph in _article_paragraphs(company, f"ts:{company}:{index.split('.')[0]}")]
+            return _response(url, json.dumps({'content': blocks}))
+        if url.startswith('https://www.spiegel.de/services/sitesearch/'):
+            query = requests.utils.urlparse(url).query
+            arguments = dict(part.split('=', 1) for part in query.split('&'))
+            return _response(url, self._spiegel_search(requests.utils.unquote(arguments['q']),
+                                                       int(arguments['page']), int(arguments['page_size'])))
+        if url.startswith('https://bench.spiegel.de/'):
+            company, index = url.rsplit('/', 2)[-2:]
+            paragraphs = "".join(_article_paragraphs(company, f"sp:{company}:{index}"))
+            return _response(url, self._spiegel_head + paragraphs + self._spiegel_tail, 'text/html')
+        if url.startswith('https://content.www.handelsblatt.com/api/search/'):
+            return _response(url, self._handelsblatt_search(params['searchTerm'], params['page']))
+        if url.startswith('https://content.www.handelsblatt.com/api/content/'):
+            company, index = params['url'].rsplit('/', 2)[-2:]
+            index = int(index)
+            seed = f"ts:{company}:{index}" if index % 4 == 0 else f"hb:{company}:{index}"
+            elements = [{'type': 'paragraphStorylineElement', 'data': {'text': paragraph}}
+                        for paragraph in _article_paragraphs(company, seed)]
+            header = {'headline': f"{company}: Zahlen im Fokus", 'leadText': "Die Anleger reagieren gemischt."}
+            return _response(url, json.dumps({'header': header, 'elements': elements}))
+        raise requests.exceptions.ConnectionError(f"Unbekannte URL in der synthetischen Seite: {url}")
+
+    def _tagesschau_search(self, company: str, page: int, page_size: int) -> str:
+        first = (page - 1) * page_size
+        results = [{'details': f"https://bench.tagesschau.de/{company}/{index}.json",
+                    'date': (_LATEST_ARTICLE - index * self.tagesschau_interval).isoformat()}
+                   for index in range(first, first + page_size)]
+        return json.dumps({'searchResults': results})
+
+    def _spiegel_search(self, company: str, page: int, page_size: int) -> str:
+        first = (page - 1) * page_size
+        results = [{'url': f"https://bench.spiegel.de/{company}/{index}",
+                    'publish_date': (_LATEST_ARTICLE - index * self.spiegel_interval).timestamp(),
+                    'access_level': 'free' if index % 2 == 0 else 'paid'}
+                   for index in range(first, first + page_size)]
+        return json.dumps({'results': results})
+
+    def _handelsblatt_search(self, company: str, page: int, page_size: int = 10) -> str:
+        first = (page - 1) * page_size
+        teasers = [{'url': {'href': f"/unternehmen/{company}/{index}"},
+                    'dates': {'published': (_LATEST_ARTICLE - index * self.handelsblatt_interval)
+                              .strftime('%Y-%m-%dT%H:%M:%SZ')},
+                    'contentAccessCategory': 'NONE' if index % 3 else 'PAID'}
+                   for index in range(first, first + page_size)]
+        return json.dumps({'teasers': teasers})
+
+    def close(self):
+        pass
+
+
+def load_raw_responses() -> list[str]:
+    """Die gespeicherten Rohantworten von Gemini aus dem bisherigen Experiment."""
+    results = pd.read_csv(RAW_RESULTS_PATH, sep=';', encoding='utf-8-sig')
+    return results['KI_Prognose_Roh_Text'].dropna().tolist()
+
+
+class _CannedResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _CannedModels:
+    def __init__(self, responses: list[str]):
+        self._responses = responses
+
+    def generate_content(self, model: str, contents, config=None):
+        # Gleicher Prompt -> gleiche Antwort, damit Aufnahme und Wiedergabe übereinstimmen
+        return _CannedResponse(self._responses[sum(map(ord, contents[-200:])) % len(self._responses)])
+
+
+class CannedGenAIClient:
+    """Antwortet wie Gemini mit einer der gespeicherten Rohantworten."""
+
+    files = None
+    batches = None
+
+    def __init__(self, responses: list[str]):
+        self.models = _CannedModels(responses)
+
+
+def write_price_fixtures(price_dir: str):
+    """Schreibt synthetische Tageskurse aller Benchmark-Ticker im Format von FixturePriceSource."""
+    os.makedirs(price_dir, exist_ok=True)
+    dates = pd.bdate_range('2025-05-01', '2025-10-31', name='Date')
+    rng = np.random.default_rng(7)
+    for company in BENCH_COMPANIES:
+        ticker = FinanceClient().ticker_map[company.lower()]
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(dates))))
+        pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                      'Volume': rng.integers(100_000, 5_000_000, len(dates))},
+                     index=dates).to_csv(os.path.join(price_dir, f"{ticker}.csv"))
+
+
+@contextlib.contextmanager
+def working_directory(path: str):
+    """Der DataManager schreibt relativ zum Arbeitsverzeichnis nach 'results/'."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def make_replay_controller(fixture_dir: str, **options) -> ExperimentController:
+    """Controller, der alle externen Quellen aus fixture_dir abspielt und keine Caches nutzt."""
+    controller = ExperimentController(
+        BENCH_MODEL, max_workers=options.pop('max_workers', 4), article_cache_path=None,
+        response_cache_path=None, price_store_dir=None, gemini_requests_per_minute=1_000_000,
+        fixture_mode='replay', fixture_dir=fixture_dir, **options)
+    for provider in controller.news_providers:
+        # Die Höflichkeitspause schützt echte Server und würde den Benchmark dominieren
+        provider.politeness_delay = 0
+    return controller
+
+
+@pytest.fixture(scope='session')
+def fixture_dir(tmp_path_factory) -> str:
+    """Zeichnet die synthetische Seite, Kurse und Gemini-Antworten einmal für die ganze Sitzung auf."""
+    base_dir = tmp_path_factory.mktemp('bench')
+    recorded_dir = str(base_dir / 'recorded')
+    write_price_fixtures(os.path.join(recorded_dir, 'prices'))
+    with working_directory(str(base_dir)):
+        controller = make_replay_controller(recorded_dir)
+        recorder = RecordingTransport(os.path.join(recorded_dir, 'http'), SyntheticNewsSite())
+        for provider in controller.news_providers:
+            provider.transport = recorder
+        controller.ai_client.client = RecordingGenAIClient(os.path.join(recorded_dir, 'gemini'),
+                                                           CannedGenAIClient(load_raw_responses()))
+        controller.run_experiment_for(BENCH_COMPANIES, BENCH_TIMEFRAMES, BENCH_END_DATE)
+    return recorded_dir
+
+
+@pytest.fixture
+def bench_workdir(tmp_path):
+    with working_directory(str(tmp_path)):
+        yield str(tmp_path)
@@ -0,0 +1,119 @@
+# benchmarks/test_pipeline.py
+"""
+Benchmarks der Experiment-Pipeline mit pytest-benchmark auf aufgezeichneten Fixtures.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m pytest benchmarks                                        # messen, Vergleich mit der Baseline
+    python -m pytest benchmarks --benchmark-compare-fail=median:30%    # Regression > 30 % schlägt fehl
+    python -m pytest benchmarks --benchmark-save=baseline              # neue Baseline speichern
+
+Die Baseline liegt in 'benchmarks/baseline/<Plattform>/' und wird automatisch
+mit dem letzten gespeicherten Lauf verglichen (siehe pytest.ini). Die
+gespeicherten Werte stammen von einem einzelnen Referenzrechner; auf anderer
+Hardware sollte zuerst eine eigene Baseline gespeichert werden.
+"""
+import os
+from datetime import timedelta
+import pandas as pd
+import pytest
+
+from conftest import (BENCH_COMPANIES, BENCH_END_DATE, BENCH_MODEL, BENCH_TIMEFRAMES, RAW_RESULTS_PATH,
+                      _LATEST_ARTICLE, _article_paragraphs, load_raw_responses, make_replay_controller)
+from src.ai_client import AIClient
+from src.data_manager import DataManager
+from src.news_provider import TagesschauAPI, SpiegelAPI, HandelsblattAPI, as_of_datetime
+from src.replay import ReplayTransport, ReplayGenAIClient
+from src.text_extraction import TextExtractor
+
+# Größenordnung der Rohantworten eines vollständigen Backtests
+PARSED_RESPONSES = 1400
+DATA_MANAGER_ROWS = 10_000
+
+
+@pytest.mark.parametrize('provider_class', [TagesschauAPI, SpiegelAPI, HandelsblattAPI],
+                         ids=lambda provider_class: provider_class.source_name)
+def test_fetch_and_extract_articles(benchmark, fixture_dir, provider_class):
+    """Suche, Download und Textextraktion eines Providers für ein Unternehmen (14 Tage)."""
+    transport = ReplayTransport(os.path.join(fixture_dir, 'http'))
+    provider = provider_class(transport=transport, text_extractor=TextExtractor())
+    provider.politeness_delay = 0
+    articles = benchmark(provider.fetch_and_extract_articles, 'Siemens', max(BENCH_TIMEFRAMES),
+                         as_of_datetime(BENCH_END_DATE))
+    assert articles and transport.missing_requests == 0
+
+
+def _dated_articles(count: int) -> list[dict]:
+    sources = ['Tagesschau', 'Spiegel Online', 'Handelsblatt']
+    return [{'source': sources[index % 3], 'identifier': str(index),
+             'date': _LATEST_ARTICLE - timedelta(hours=4 * index),
+             'text': "\n\n".join(_article_paragraphs('Siemens', f"prompt:{index}"))}
+            for index in range(count)]
+
+
+@pytest.mark.parametrize('article_count', [50, 500, 2000])
+def test_build_prompt(benchmark, fixture_dir, article_count):
+    """Relevanzsortierung und Packen großer Artikelmengen in das Token-Budget."""
+    ai_client = AIClient(BENCH_MODEL, client=ReplayGenAIClient(os.path.join(fixture_dir, 'gemini')))
+    articles = _dated_articles(article_count)
+    history = pd.DataFrame({'Close': 100.0, 'Volume': 1_000_000},
+                           index=pd.bdate_range(end=BENCH_END_DATE, periods=40, name='Date'))
+    prompt = benchmark(ai_client.build_prompt, 'Siemens', articles, history)
+    assert 'Siemens' in prompt
+
+
+def test_parse_prediction(benchmark, fixture_dir, bench_workdir):
+    """Auswertung der gespeicherten Rohantworten, auf einen vollständigen Backtest hochgerechnet."""
+    raw_responses = load_raw_responses()
+    responses = (raw_responses * (PARSED_RESPONSES // len(raw_responses) + 1))[:PARSED_RESPONSES]
+    controller = make_replay_controller(fixture_dir)
+    parsed = benchmark(lambda: [controller._parse_prediction(text) for text in responses])
+    assert sum(row['KI_Handlungsempfehlung'] != "Nicht gefunden" for row in parsed) > PARSED_RESPONSES // 2
+
+
+def _result_rows(count: int) -> list[dict]:
+    """Ergebniszeilen mit den Texten der gespeicherten Ergebnisse und gültigen Kursen."""
+    stored = pd.read_csv(RAW_RESULTS_PATH, sep=';', encoding='utf-8-sig')
+    # Die Kursspalten der gespeicherten Datei wurden von einer Tabellenkalkulation verfälscht
+    stored = stored.drop(columns=['CloseWert_30_september'])
+    stored_rows = stored.to_dict('records')
+    return [dict(stored_rows[index % len(stored_rows)], Durchlauf_ID=index + 1,
+                 Kurs_bei_Prognose=100.0 + index % 50, Kurs_nach_7_Tagen=101.0 + index % 45)
+            for index in range(count)]
+
+
+@pytest.mark.parametrize('output_format', ['csv', 'parquet'])
+def test_data_manager_write(benchmark, bench_workdir, output_format):
+    """Schreiben von 10.000 Ergebniszeilen mit dem Flush-Intervall des Controllers."""
+    rows = _result_rows(DATA_MANAGER_ROWS)
+    round_counter = iter(range(1_000_000))
+
+    def setup():
+        output_dir = os.path.join(bench_workdir, f"round_{next(round_counter)}")
+        return (DataManager(columns=list(rows[0]), output_dir=output_dir, flush_every=5,
+                            output_format=output_format),), {}
+
+    def write(data_manager):
+        for row in rows:
+            data_manager.add_result(row)
+            data_manager.save_results()
+        data_manager.close()
+
+    benchmark.pedantic(write, setup=setup, rounds=5)
+
+
+def test_full_sweep(benchmark, fixture_dir, bench_workdir):
+    """Vollständiger run_experiment_for-Durchlauf (10 Unternehmen x 3 Zeiträume) im Replay-Modus."""
+    controllers = []
+
+    def setup():
+        controllers.append(make_replay_controller(fixture_dir))
+        return (controllers[-1],), {}
+
+    def sweep(controller):
+        controller.run_experiment_for(BENCH_COMPANIES, BENCH_TIMEFRAMES, BENCH_END_DATE)
+
+    benchmark.pedantic(sweep, setup=setup, rounds=3)
+    results = controllers[-1].data_manager.results_df
+    assert len(results) == len(BENCH_COMPANIES) * len(BENCH_TIMEFRAMES)
+    assert controllers[-1].http_transport.missing_requests == 0
+    assert not results['KI_Prognose_Roh_Text'].str.startswith("Fehler bei der Analyse").any()
@@ -0,0 +1,38 @@
+import argparse
+from src.http_transport import HttpTransport
+from src.news_index import NewsIndex
+from src.news_ingestion import NewsIngestor
+from src.news_provider import TagesschauAPI, SpiegelAPI, HandelsblattAPI
+from src.text_extraction import TextExtractor
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sammelt fortlaufend neue Nachrichten aller Unternehmen in einen lokalen Index.")
+    parser.add_argument('--index', default='cache/news_index.sqlite', help="Pfad des Nachrichten-Index")
+    parser.add_argument('--interval', type=float, default=60, help="Minuten zwischen zwei Abfragerunden")
+    parser.add_argument('--backfill-days', type=int, default=14,
+                        help="Zeitraum der ersten Abfrage eines Unternehmens in Tagen")
+    parser.add_argument('--once', action='store_true', help="Nur eine Abfragerunde ausführen")
+    args = parser.parse_args()
+
+    companies_to_analyze = [
+        'Volkswagen', 'Siemens', 'Allianz', 'Apple', 'Microsoft',
+        'SAP', 'Deutsche Bank', 'Rheinmetall', 'BMW', 'Adidas'
+    ]
+
+    transport = HttpTransport()
+    text_extractor = TextExtractor()
+    providers = [provider_class(transport=transport, text_extractor=text_extractor)
+                 for provider_class in (TagesschauAPI, SpiegelAPI, HandelsblattAPI)]
+    news_index = NewsIndex(args.index)
+    ingestor = NewsIngestor(news_index, providers, companies_to_analyze,
+                            poll_interval_minutes=args.interval, backfill_days=args.backfill_days)
+    print(f"Starte Einsammeln der Nachrichten in '{args.index}'...")
+    ingestor.run(max_polls=1 if args.once else None)
+    news_index.close()
+    transport.close()
+
+    print("\nExperimente können den Index über ExperimentController(news_index_path=...) nutzen.")
+
+if __name__ == "__main__":
+    main()
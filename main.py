@@ -18,7 +18,8 @@ def main():
 
     news_timeframes_to_test = [2, 7, 14]
 
-    controller = ExperimentController(model_name="gemini-2.5-pro")
+    controller = ExperimentController(model_name="gemini-2.5-pro", max_workers=4,
+                                      journal_path="results/run_journal.jsonl", news_token_budget=6000)
     controller.run_experiment_for(companies_to_analyze, news_timeframes_to_test, end_date_str="2025-09-23")
 
     print("\nExperiment vollständig beendet. Ergebnisse sind im 'results'-Ordner gespeichert.")
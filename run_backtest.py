@@ -0,0 +1,30 @@
+from src.controller import ExperimentController
+from src.backtest import trading_days
+
+def main():
+    print("Starte Backtest über einen Zeitraum von Enddaten...")
+
+    companies_to_analyze = {
+        'Volkswagen': 'Automobil',
+        'Siemens': 'Industrie',
+        'Allianz': 'Finanzen',
+        'Apple': 'Technologie',
+        'Microsoft': 'Technologie',
+        'SAP': 'Software',
+        'Deutsche Bank': 'Finanzen',
+        'Rheinmetall': 'Rüstung',
+        'BMW': 'Automobil',
+        'Adidas': 'Konsumgüter'
+    }
+
+    news_timeframes_to_test = [2, 7, 14]
+    end_dates = trading_days("2025-07-01", "2025-09-23")
+
+    controller = ExperimentController(model_name="gemini-2.5-pro", max_workers=8,
+                                      journal_path="results/run_journal.jsonl", news_token_budget=6000)
+    controller.run_backtest(companies_to_analyze, news_timeframes_to_test, end_dates)
+
+    print(f"\nBacktest über {len(end_dates)} Handelstage beendet. Ergebnisse sind im 'results'-Ordner gespeichert.")
+
+if __name__ == "__main__":
+    main()
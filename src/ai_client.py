@@ -3,105 +3,374 @@ from google import genai
 import pandas as pd
 from dotenv import load_dotenv
 import time
+import random
+import asyncio
+from .rate_limiter import TokenBucketRateLimiter
+from .response_cache import ResponseCache
+from .batch_client import BatchBackend, GeminiBatchBackend, write_batch_request_file
+from .prompt_builder import PromptBuilder, estimate_tokens
+from .structured_output import (generation_config as structured_generation_config, parse_prediction,
+                                repair_prompt, validation_error_message)
+from .metrics import metrics
+
+def create_genai_client() -> genai.Client:
+    """Erstellt einen genai.Client mit dem API-Schlüssel aus der Umgebungsvariable GEMINI_API_KEY."""
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "GEMINI_API_KEY Umgebungsvariable nicht gesetzt! Bitte fügen Sie Ihren API-Schlüssel hinzu.")
+    return genai.Client(api_key=api_key)
 
 class AIClient:
     """
     Ein Client zur Interaktion mit der Google Gemini API für Aktienprognosen.
     """
 
-    def __init__(self, model: str):
+    def __init__(self, model: str, requests_per_minute: float = 5, tokens_per_minute: float | None = None,
+                 max_retries: int = 6, backoff_base_seconds: float = 2.0, backoff_max_seconds: float = 60.0,
+                 response_cache: ResponseCache | None = None, replay_only: bool = False,
+                 prompt_builder: PromptBuilder | None = None, client=None, structured_output: bool = False):
         """
         Initialisiert den Client und konfiguriert die API.
         Stellt sicher, dass der API-Schlüssel als Umgebungsvariable gesetzt ist.
-        """
-        load_dotenv()
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "GEMINI_API_KEY Umgebungsvariable nicht gesetzt! Bitte fügen Sie Ihren API-Schlüssel hinzu.")
 
-        self.client = genai.Client(api_key=api_key)
+        Args:
+            model (str): Das zu verwendende Gemini-Modell.
+            requests_per_minute (float): Erlaubte Anfragen pro Minute (RPM) des Kontos.
+            tokens_per_minute (float | None): Erlaubte Eingabe-Tokens pro Minute (TPM). None = unbegrenzt.
+            max_retries (int): Maximale Anzahl an Wiederholungen bei Überlastung (503/429).
+            backoff_base_seconds (float): Wartezeit vor der ersten Wiederholung; verdoppelt sich je Versuch.
+            backoff_max_seconds (float): Obergrenze der Wartezeit zwischen zwei Versuchen.
+            response_cache (ResponseCache | None): Optionaler Cache für Modellantworten.
+            replay_only (bool): Beantwortet Anfragen ausschließlich aus dem Cache und sendet
+                                nie eine Anfrage an die API. Ein API-Schlüssel ist dann nicht nötig.
+            prompt_builder (PromptBuilder | None): Stellt die Prompts zusammen. Standard ist ein
+                                PromptBuilder mit einem Nachrichten-Budget von 6000 Tokens.
+            client: Optionaler Ersatz für genai.Client, z.B. ein ReplayGenAIClient für Offline-Läufe.
+            structured_output (bool): Fordert die Prognose als JSON nach structured_output.StockPrediction
+                                an und validiert sie. Ungültige Antworten werden einmal repariert.
+        """
+        if replay_only and response_cache is None:
+            raise ValueError("Der Replay-Modus benötigt einen ResponseCache.")
         self.model = model
+        self.response_cache = response_cache
+        self.replay_only = replay_only
+        # Generierungseinstellungen für generate_content; fließen in den Cache-Schlüssel ein
+        self.structured_output = structured_output
+        self.generation_config = structured_generation_config() if structured_output else None
+        self.prompt_builder = prompt_builder if prompt_builder is not None else PromptBuilder()
+
+        if client is not None:
+            self.client = client
+        elif replay_only:
+            self.client = None
+        else:
+            self.client = create_genai_client()
+        self.rate_limiter = TokenBucketRateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
         print("AIClient erfolgreich initialisiert.")
 
+    @staticmethod
+    def _estimate_tokens(prompt: str) -> int:
+        """Grobe Schätzung der Token-Anzahl (ca. 4 Zeichen pro Token) für das TPM-Kontingent."""
+        return estimate_tokens(prompt)
+
+    @staticmethod
+    def is_error_response(response_text: str | None) -> bool:
+        """Erkennt die Fehlertexte, die anstelle einer Modellantwort zurückgegeben werden, und fehlende Antworten."""
+        return response_text is None or response_text.startswith("Fehler bei der Analyse für ")
+
+    @staticmethod
+    def _is_retryable_error(error: Exception) -> bool:
+        """Überlastung (503) und Kontingentüberschreitung (429) sind vorübergehend."""
+        message = str(error)
+        return ("503" in message and "UNAVAILABLE" in message) or \
+               ("429" in message and "RESOURCE_EXHAUSTED" in message)
+
+    def _cache_key(self, prompt: str) -> str:
+        return ResponseCache.make_key(self.model, prompt, self.generation_config)
+
+    def _lookup_cached_response(self, company_name: str, prompt: str) -> str | None:
+        """
+        Sucht die Antwort im Cache. Im Replay-Modus wird bei einem Fehlschlag
+        eine Fehlermeldung statt None zurückgegeben, damit keine Anfrage gesendet wird.
+        """
+        if self.response_cache is None:
+            return None
+        cached_response = self.response_cache.get(self._cache_key(prompt))
+        if cached_response is not None:
+            metrics.increment('gemini.cache_hits')
+            print(f"-> Antwort für {company_name} aus dem Cache geladen.")
+            return cached_response
+        if self.replay_only:
+            print(f"-> Replay-Modus: Keine gespeicherte Antwort für {company_name} vorhanden.")
+            return f"Fehler bei der Analyse für {company_name}."
+        return None
+
+    def _store_response(self, prompt: str, response_text: str):
+        if self.response_cache is not None and response_text and not self.is_error_response(response_text):
+            self.response_cache.put(self._cache_key(prompt), self.model, response_text)
+
+    @staticmethod
+    def _record_request(prompt: str, attempt: int):
+        """Zählt gesendete Anfragen, Wiederholungen und die übertragenen Prompt-Zeichen."""
+        metrics.increment('gemini.requests')
+        metrics.increment('gemini.prompt_chars', len(prompt))
+        if attempt > 1:
+            metrics.increment('gemini.retries')
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponentieller Backoff mit Jitter, damit parallele Aufrufe nicht gleichzeitig wiederholen."""
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
     def get_prediction(self, company_name: str, news_articles: list, stock_history: pd.DataFrame):
         """
         Generiert eine Aktienkursprognose basierend auf Nachrichten und historischen Kursdaten.
-        Versucht bei einer API-Überlastung unendlich oft, die Anfrage erneut zu senden.
+        Wartet vor jeder Anfrage auf das Rate-Limit-Kontingent und wiederholt die Anfrage
+        bei einer API-Überlastung höchstens max_retries-mal mit exponentiellem Backoff.
+        Im strukturierten Modus wird die Antwort validiert und bei Bedarf einmal repariert.
         """
         if not news_articles:
             print(f"-> Keine Nachrichten für {company_name} vorhanden. Überspringe KI-Analyse.")
             return "Keine ausreichenden Daten für eine Prognose."
 
         print(f"-> Generiere Prompt für {company_name}...")
-        prompt = self._build_prompt(company_name, news_articles, stock_history)
+        prompt = self.build_prompt(company_name, news_articles, stock_history)
+        return self.get_prediction_for_prompt(company_name, prompt)
+
+    def get_prediction_for_prompt(self, company_name: str, prompt: str) -> str:
+        """
+        Wie get_prediction, aber mit einem bereits erstellten Prompt. So kann derselbe
+        Prompt an mehrere Modelle gehen, ohne ihn für jedes Modell neu zusammenzustellen.
+        """
+        cached_response = self._lookup_cached_response(company_name, prompt)
+        if cached_response is not None:
+            return cached_response
+
+        response_text = self._generate_with_retries(company_name, prompt)
+        if self.structured_output:
+            response_text = self._validated_response(company_name, response_text)
+        self._store_response(prompt, response_text)
+        return response_text
 
-        attempt_counter = 1
-        while True:
+    def _generate_with_retries(self, company_name: str, prompt: str) -> str:
+        """Sendet den Prompt unter dem Rate Limit und wiederholt ihn bei Überlastung mit Backoff."""
+        for attempt_counter in range(1, self.max_retries + 2):
+            wait_seconds = self.rate_limiter.acquire(self._estimate_tokens(prompt))
+            if wait_seconds > 0:
+                metrics.increment('gemini.rate_limit_wait_seconds', wait_seconds)
+                print(f"-> {wait_seconds:.1f} Sekunden auf das Rate Limit gewartet.")
             print(f"-> Sende Anfrage an die Gemini API für {company_name} (Versuch {attempt_counter})...")
+            self._record_request(prompt, attempt_counter)
             try:
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                )
-                print(f"-> Antwort von Gemini für {company_name} erfolgreich erhalten.")
-                print("-> Pausiere für 13 Sekunden, um das Rate Limit (5 RPM) einzuhalten.")
-                time.sleep(13)
-
-                return response.text
+                with metrics.timer('gemini.request'):
+                    response = self.client.models.generate_content(
+                        model=self.model,
+                        contents=prompt,
+                        config=self.generation_config
+                    )
+                return self._response_text(company_name, response)
             except Exception as e:
-                if "503" in str(e) and "UNAVAILABLE" in str(e):
-                    print(f"-> API überlastet. Warte 30 Sekunden vor dem nächsten Versuch...")
-                    time.sleep(30)
-                    attempt_counter += 1
-                else:
+                if not self._is_retryable_error(e):
                     print(f"-> Ein unerwarteter, nicht behebbarer Fehler bei der Gemini API ist aufgetreten: {e}")
                     return f"Fehler bei der Analyse für {company_name}."
+                if attempt_counter > self.max_retries:
+                    break
+                delay = self._backoff_delay(attempt_counter)
+                metrics.increment('gemini.backoff_seconds', delay)
+                print(f"-> API überlastet. Warte {delay:.1f} Sekunden vor dem nächsten Versuch...")
+                time.sleep(delay)
+
+        print(f"-> Gemini API nach {self.max_retries} Wiederholungen weiterhin überlastet. Gebe auf.")
+        return f"Fehler bei der Analyse für {company_name}."
+
+    @staticmethod
+    def _response_text(company_name: str, response) -> str:
+        """
+        Liest den Text einer Antwort. Blockierte Anfragen oder Antworten ohne Kandidaten
+        haben keinen Text und werden als Fehler behandelt.
+        """
+        if response.text is None:
+            print(f"-> Gemini hat für {company_name} keinen Text geliefert (blockiert oder leer).")
+            return f"Fehler bei der Analyse für {company_name}."
+        print(f"-> Antwort von Gemini für {company_name} erfolgreich erhalten.")
+        return response.text
+
+    def _validated_response(self, company_name: str, response_text: str) -> str:
+        """
+        Prüft eine strukturierte Antwort gegen das Schema. Eine ungültige Antwort wird
+        einmal mit einem kurzen Reparatur-Prompt (ohne Nachrichten) nachgefordert.
+        """
+        response_text, repair_request = self._check_structured(company_name, response_text)
+        if repair_request is None:
+            return response_text
+        return self._accept_repair(company_name, self._generate_with_retries(company_name, repair_request))
 
+    async def _validated_response_async(self, company_name: str, response_text: str) -> str:
+        """Asynchrone Variante von _validated_response."""
+        response_text, repair_request = self._check_structured(company_name, response_text)
+        if repair_request is None:
+            return response_text
+        return self._accept_repair(company_name,
+                                   await self._generate_with_retries_async(company_name, repair_request))
 
-    def _build_prompt(self, company_name: str, news_articles: list, stock_history: pd.DataFrame):
+    def _check_structured(self, company_name: str, response_text: str) -> tuple[str, str | None]:
         """
-        Erstellt den detaillierten Text-Prompt für die Gemini API.
+        Gemeinsame Prüfung beider Varianten von _validated_response.
+
+        Returns:
+            tuple: (Antwort- bzw. Fehlertext, Reparatur-Prompt). Ist ein Reparatur-Prompt
+                   gesetzt, muss die Antwort damit nachgefordert werden.
         """
-        MAX_CHARS = 25000
-        formatted_news = "\n\n---\n\n".join(news_articles)
+        error = self._structured_error(response_text)
+        if error is None:
+            return response_text, None
+        if isinstance(error, str):
+            return error, None
+        print(f"-> Antwort für {company_name} entspricht nicht dem Schema "
+              f"({validation_error_message(error)}). Fordere Reparatur an...")
+        metrics.increment('gemini.structured_repairs')
+        return response_text, repair_prompt(response_text, error)
 
-        if len(formatted_news) > MAX_CHARS:
-            formatted_news = formatted_news[
-                                 :MAX_CHARS] + "\n\n... [HINWEIS: Nachrichten wurden zur Analyse gekürzt] ..."
-            print(
-                f"-> Warnung: Nachrichten für {company_name} wurden gekürzt, um das Token-Limit nicht zu überschreiten.")
+    async def get_prediction_async(self, company_name: str, news_articles: list, stock_history: pd.DataFrame):
+        """
+        Asynchrone Variante von get_prediction. Mehrere Prognosen können gleichzeitig
+        laufen; das gemeinsame Rate-Limit-Kontingent begrenzt, wie viele davon senden.
+        """
+        if not news_articles:
+            print(f"-> Keine Nachrichten für {company_name} vorhanden. Überspringe KI-Analyse.")
+            return "Keine ausreichenden Daten für eine Prognose."
 
-        history_string = stock_history.to_string()
-        days_in_history = len(stock_history)
+        print(f"-> Generiere Prompt für {company_name}...")
+        prompt = self.build_prompt(company_name, news_articles, stock_history)
+        cached_response = self._lookup_cached_response(company_name, prompt)
+        if cached_response is not None:
+            return cached_response
 
-        prompt = f"""
-        **Analyse-Auftrag: Aktienkursprognose**
+        response_text = await self._generate_with_retries_async(company_name, prompt)
+        if self.structured_output:
+            response_text = await self._validated_response_async(company_name, response_text)
+        self._store_response(prompt, response_text)
+        return response_text
 
-        **Unternehmen:** {company_name}
+    async def _generate_with_retries_async(self, company_name: str, prompt: str) -> str:
+        """Asynchrone Variante von _generate_with_retries."""
+        for attempt_counter in range(1, self.max_retries + 2):
+            wait_seconds = await self.rate_limiter.acquire_async(self._estimate_tokens(prompt))
+            if wait_seconds > 0:
+                metrics.increment('gemini.rate_limit_wait_seconds', wait_seconds)
+            print(f"-> Sende Anfrage an die Gemini API für {company_name} (Versuch {attempt_counter})...")
+            self._record_request(prompt, attempt_counter)
+            try:
+                with metrics.timer('gemini.request'):
+                    response = await self.client.aio.models.generate_content(
+                        model=self.model,
+                        contents=prompt,
+                        config=self.generation_config
+                    )
+                return self._response_text(company_name, response)
+            except Exception as e:
+                if not self._is_retryable_error(e):
+                    print(f"-> Ein unerwarteter, nicht behebbarer Fehler bei der Gemini API ist aufgetreten: {e}")
+                    return f"Fehler bei der Analyse für {company_name}."
+                if attempt_counter > self.max_retries:
+                    break
+                delay = self._backoff_delay(attempt_counter)
+                metrics.increment('gemini.backoff_seconds', delay)
+                print(f"-> API überlastet. Warte {delay:.1f} Sekunden vor dem nächsten Versuch...")
+                await asyncio.sleep(delay)
 
-        **Analyse-Grundlage:**
-        Du erhältst im Folgenden aktuelle Nachrichtenartikel und die Aktienkursentwicklung der letzten {days_in_history} Handelstage für das oben genannte Unternehmen. Deine Aufgabe ist es, diese Informationen als Finanzexperte zu analysieren.
+        print(f"-> Gemini API nach {self.max_retries} Wiederholungen weiterhin überlastet. Gebe auf.")
+        return f"Fehler bei der Analyse für {company_name}."
 
-        **Aufgaben:**
-        1.  **Stimmungsanalyse:** Analysiere die Tonalität und den Inhalt der Nachrichten. Sind sie überwiegend positiv, negativ oder neutral? Gibt es wichtige Ankündigungen (z.B. Quartalszahlen, neue Produkte, Rechtsstreitigkeiten)?
-        2.  **Kursanalyse:** Bewerte den bisherigen Kursverlauf. Gibt es einen klaren Trend?
-        3.  **Prognose:** Erstelle basierend auf deiner Analyse eine Prognose für den Aktienkurs für die **nächsten 5 Handelstage**.
-        4.  **Handlungsempfehlung:** Gib eine klare und prägnante Handlungsempfehlung ab. Entscheide dich zwingend für eine der beiden Optionen: **KAUFEN oder VERKAUFEN**.
-        5.  **Begründung:** Fasse die wichtigsten Gründe für deine Empfehlung in 2-3 Sätzen zusammen.
+    def _structured_error(self, response_text: str) -> ValueError | str | None:
+        """
+        Gibt None für eine gültige Antwort zurück, den Validierungsfehler für eine
+        reparierbare Antwort und den unveränderten Text für Fehlermeldungen der API.
+        """
+        if self.is_error_response(response_text):
+            return response_text
+        try:
+            parse_prediction(response_text)
+            return None
+        except ValueError as error:
+            return error
 
-        **Hier sind die Daten:**
+    def _accept_repair(self, company_name: str, repaired_text: str) -> str:
+        error = self._structured_error(repaired_text)
+        if error is None:
+            print(f"-> Reparierte Antwort für {company_name} ist gültig.")
+            return repaired_text
+        metrics.increment('gemini.structured_failures')
+        if not isinstance(error, str):
+            print(f"-> Auch die reparierte Antwort für {company_name} ist ungültig: "
+                  f"{validation_error_message(error)}")
+        return f"Fehler bei der Analyse für {company_name}."
 
-        **1. Aktuelle Nachrichtenartikel:**
-        ---
-        {formatted_news}
-        ---
+    def get_predictions_batch(self, prediction_requests: dict, request_file: str,
+                              backend: BatchBackend | None = None) -> dict:
+        """
+        Erstellt die Prompts für viele Prognosen und reicht sie gesammelt als einen
+        Batch-Job ein, statt sie einzeln unter dem Rate Limit zu senden.
 
-        **2. Aktienkursverlauf der letzten {days_in_history} Handelstage:**
-        ---
-        {history_string}
-        ---
+        Args:
+            prediction_requests (dict): Schlüssel -> (company_name, news_articles, stock_history).
+            request_file (str): Pfad, unter dem die JSONL-Anfragedatei geschrieben wird.
+            backend (BatchBackend | None): Ausführende Batch-Schnittstelle. Standard ist die Gemini Batch API.
 
-        **Bitte gib deine vollständige Analyse jetzt aus.**
+        Returns:
+            dict: Schlüssel -> Antworttext (bzw. Hinweis- oder Fehlertext wie bei get_prediction).
+        """
+        predictions = {}
+        pending_prompts = {}
+        for key, (company_name, news_articles, stock_history) in prediction_requests.items():
+            if not news_articles:
+                print(f"-> Keine Nachrichten für {company_name} vorhanden. Überspringe KI-Analyse.")
+                predictions[key] = "Keine ausreichenden Daten für eine Prognose."
+                continue
+            prompt = self.build_prompt(company_name, news_articles, stock_history)
+            cached_response = self._lookup_cached_response(company_name, prompt)
+            if cached_response is not None:
+                predictions[key] = cached_response
+                continue
+            pending_prompts[key] = prompt
+
+        if not pending_prompts:
+            return predictions
+
+        if backend is None:
+            backend = GeminiBatchBackend(self.client)
+        write_batch_request_file(request_file, {str(key): prompt for key, prompt in pending_prompts.items()},
+                                 self.generation_config)
+        metrics.increment('gemini.batch_requests', len(pending_prompts))
+        metrics.increment('gemini.prompt_chars', sum(len(prompt) for prompt in pending_prompts.values()))
+        with metrics.timer('gemini.batch_job'):
+            job_id = backend.submit(request_file, self.model)
+            responses = backend.wait_for_results(job_id)
+
+        for key, prompt in pending_prompts.items():
+            company_name = prediction_requests[key][0]
+            response_text = responses.get(str(key))
+            if not response_text:
+                print(f"-> Keine Batch-Antwort für {company_name} (Schlüssel {key}) erhalten.")
+                predictions[key] = f"Fehler bei der Analyse für {company_name}."
+                continue
+            if self.structured_output:
+                # Reparaturen laufen als einzelne, kurze Anfragen außerhalb des Batch-Jobs
+                response_text = self._validated_response(company_name, response_text)
+            self._store_response(prompt, response_text)
+            predictions[key] = response_text
+        print(f"-> Batch-Job abgeschlossen: {len(responses)} von {len(pending_prompts)} Antworten erhalten.")
+        return predictions
+
+    def build_prompt(self, company_name: str, news_articles: list, stock_history: pd.DataFrame):
+        """
+        Erstellt den detaillierten Text-Prompt für die Gemini API über den PromptBuilder.
         """
-        return prompt
\ No newline at end of file
+        with metrics.timer('prompt.build'):
+            return self.prompt_builder.build(company_name, news_articles, stock_history,
+                                             structured=self.structured_output)
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+class ArticleCache:
+    """
+    Persistenter Zwischenspeicher für extrahierte Artikeltexte auf Basis von SQLite.
+
+    Einträge sind über (Provider, Artikel-URL bzw. -Pfad) adressiert und speichern
+    neben dem Volltext auch das Veröffentlichungsdatum. Abgelaufene Einträge (TTL)
+    gelten als nicht vorhanden; überschreitet der Cache seine Maximalgröße, werden
+    die am längsten nicht genutzten Einträge entfernt.
+
+    Die Gesamtgröße wird beim Öffnen einmal ermittelt und danach mitgeführt. Der
+    Zeitpunkt des letzten Zugriffs wird bei Treffern nur aktualisiert, wenn er älter
+    als touch_interval_seconds ist, damit Lesezugriffe in der Regel nichts schreiben.
+    """
+    touch_interval_seconds = 3600
+
+    def __init__(self, db_path: str = 'cache/articles.sqlite', ttl_days: float | None = 30,
+                 max_size_mb: float = 200):
+        """
+        Args:
+            db_path (str): Pfad zur SQLite-Datei. Das Verzeichnis wird bei Bedarf angelegt.
+            ttl_days (float | None): Gültigkeitsdauer eines Eintrags in Tagen. None = unbegrenzt.
+            max_size_mb (float): Maximale Gesamtgröße der gespeicherten Texte in Megabyte.
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.db_path = db_path
+        self.ttl_seconds = ttl_days * 86400 if ttl_days is not None else None
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                provider TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                published TEXT,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (provider, identifier)
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_articles_last_access ON articles (last_access)")
+        self._connection.commit()
+        self.size_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, provider: str, identifier: str) -> str | None:
+        """Gibt den gespeicherten Volltext zurück oder None, wenn kein gültiger Eintrag existiert."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT text, size, fetched_at, last_access FROM articles WHERE provider = ? AND identifier = ?",
+                (provider, identifier)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            text, size, fetched_at, last_access = row
+            if self.ttl_seconds is not None and now - fetched_at > self.ttl_seconds:
+                self._connection.execute(
+                    "DELETE FROM articles WHERE provider = ? AND identifier = ?", (provider, identifier))
+                self._connection.commit()
+                self.size_bytes -= size
+                self.misses += 1
+                return None
+            # Für die Verdrängung genügt ein grober Zugriffszeitpunkt
+            if now - last_access > self.touch_interval_seconds:
+                self._connection.execute(
+                    "UPDATE articles SET last_access = ? WHERE provider = ? AND identifier = ?",
+                    (now, provider, identifier)
+                )
+                self._connection.commit()
+            self.hits += 1
+            return text
+
+    def put(self, provider: str, identifier: str, text: str, published: datetime | None = None):
+        """Speichert einen Volltext und entfernt bei Bedarf alte Einträge."""
+        now = time.time()
+        published_str = published.isoformat() if published is not None else None
+        size = len(text.encode('utf-8'))
+        with self._lock:
+            replaced = self._connection.execute(
+                "SELECT size FROM articles WHERE provider = ? AND identifier = ?", (provider, identifier)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO articles (provider, identifier, published, text, size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (provider, identifier, published_str, text, size, now, now)
+            )
+            self.size_bytes += size - (replaced[0] if replaced else 0)
+            self._evict_if_needed()
+            self._connection.commit()
+
+    def _evict_if_needed(self):
+        """Löscht die am längsten nicht genutzten Einträge, bis die Maximalgröße eingehalten wird."""
+        if self.size_bytes <= self.max_size_bytes:
+            return
+        # Der Cursor liest über den Index auf last_access nur so viele Zeilen wie nötig
+        rows = self._connection.execute(
+            "SELECT provider, identifier, size FROM articles ORDER BY last_access ASC")
+        to_delete = []
+        for provider, identifier, size in rows:
+            if self.size_bytes <= self.max_size_bytes:
+                break
+            to_delete.append((provider, identifier))
+            self.size_bytes -= size
+        self._connection.executemany("DELETE FROM articles WHERE provider = ? AND identifier = ?", to_delete)
+        print(f"-> Artikel-Cache: {len(to_delete)} alte Einträge entfernt.")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
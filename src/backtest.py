@@ -0,0 +1,13 @@
+import pandas as pd
+
+
+def trading_days(start_date_str: str, end_date_str: str) -> list[str]:
+    """
+    Gibt alle Handelstage (Montag bis Freitag) zwischen start_date_str und end_date_str
+    (jeweils einschließlich) im Format 'YYYY-MM-DD' zurück, z.B. als Enddaten für
+    ExperimentController.run_backtest.
+
+    Börsenfeiertage sind enthalten; für sie liefert der Kursspeicher den letzten
+    Schlusskurs davor, sodass die Durchläufe trotzdem gültig bleiben.
+    """
+    return [day.strftime('%Y-%m-%d') for day in pd.bdate_range(start_date_str, end_date_str)]
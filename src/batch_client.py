@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable
+from google.genai import types
+
+
+def write_batch_request_file(path: str, prompts: dict, generation_config: dict | None = None):
+    """
+    Schreibt die Prompts als JSONL-Anfragedatei im Format der Gemini Batch API.
+    Jede Zeile enthält einen eindeutigen 'key', über den die Antwort später zugeordnet wird.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, 'w', encoding='utf-8') as request_file:
+        for key, prompt in prompts.items():
+            request = {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}
+            if generation_config:
+                request['generation_config'] = generation_config
+            request_file.write(json.dumps({'key': str(key), 'request': request}, ensure_ascii=False) + "\n")
+
+
+def read_batch_request_file(path: str) -> dict:
+    """Liest eine JSONL-Anfragedatei und gibt die Prompts nach 'key' zurück."""
+    prompts = {}
+    with open(path, 'r', encoding='utf-8') as request_file:
+        for line in request_file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            parts = entry['request']['contents'][0]['parts']
+            prompts[entry['key']] = "".join(part.get('text', '') for part in parts)
+    return prompts
+
+
+def parse_batch_result_lines(lines: list[str]) -> dict:
+    """
+    Wertet die JSONL-Ergebniszeilen eines Batch-Jobs aus.
+
+    Returns:
+        dict: Antworttext nach 'key'. Fehlgeschlagene Anfragen fehlen im Ergebnis.
+    """
+    results = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get('response')
+        if not response:
+            print(f"-> Batch-Anfrage '{entry.get('key')}' fehlgeschlagen: {entry.get('error')}")
+            continue
+        candidates = response.get('candidates', [])
+        if not candidates:
+            continue
+        parts = candidates[0].get('content', {}).get('parts', [])
+        results[entry['key']] = "".join(part.get('text', '') for part in parts)
+    return results
+
+
+class BatchBackend(ABC):
+    """
+    Abstrakte Schnittstelle für die Ausführung einer Batch-Anfragedatei.
+    Erlaubt es, die Gemini Batch API durch eine lokale Implementierung zu ersetzen.
+    """
+
+    @abstractmethod
+    def submit(self, request_file: str, model: str) -> str:
+        """Reicht die JSONL-Anfragedatei ein und gibt die Job-ID zurück."""
+        pass
+
+    @abstractmethod
+    def wait_for_results(self, job_id: str) -> dict:
+        """Wartet auf den Abschluss des Jobs und gibt die Antworttexte nach 'key' zurück."""
+        pass
+
+
+class GeminiBatchBackend(BatchBackend):
+    """Führt Batch-Jobs über die Batch-Schnittstelle der Gemini API aus."""
+
+    terminal_states = {'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED'}
+
+    def __init__(self, client, poll_interval_seconds: float = 60):
+        """
+        Args:
+            client: Eine genai.Client-Instanz.
+            poll_interval_seconds (float): Abstand zwischen zwei Statusabfragen.
+        """
+        self.client = client
+        self.poll_interval_seconds = poll_interval_seconds
+
+    def submit(self, request_file: str, model: str) -> str:
+        display_name = os.path.splitext(os.path.basename(request_file))[0]
+        uploaded_file = self.client.files.upload(
+            file=request_file,
+            config=types.UploadFileConfig(display_name=display_name, mime_type='jsonl')
+        )
+        batch_job = self.client.batches.create(
+            model=model,
+            src=uploaded_file.name,
+            config={'display_name': display_name}
+        )
+        print(f"-> Batch-Job '{batch_job.name}' mit Datei '{request_file}' eingereicht.")
+        return batch_job.name
+
+    def wait_for_results(self, job_id: str) -> dict:
+        batch_job = self.client.batches.get(name=job_id)
+        while batch_job.state.name not in self.terminal_states:
+            print(f"-> Batch-Job '{job_id}' im Status {batch_job.state.name}. "
+                  f"Prüfe erneut in {self.poll_interval_seconds} Sekunden...")
+            time.sleep(self.poll_interval_seconds)
+            batch_job = self.client.batches.get(name=job_id)
+
+        if batch_job.state.name != 'JOB_STATE_SUCCEEDED':
+            print(f"-> Batch-Job '{job_id}' beendet mit Status {batch_job.state.name}: {batch_job.error}")
+            return {}
+
+        result_bytes = self.client.files.download(file=batch_job.dest.file_name)
+        return parse_batch_result_lines(result_bytes.decode('utf-8').splitlines())
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Lokaler Ersatz für die Batch API, etwa für Tests ohne Netzwerk.
+    Beantwortet jede Anfrage der Datei mit responder(prompt).
+    """
+
+    def __init__(self, responder: Callable[[str], str] | None = None):
+        self.responder = responder or (lambda prompt: "Handlungsempfehlung: KAUFEN")
+        self._jobs = {}
+        self._submitted_jobs = 0
+        # Der Controller reicht die Batches mehrerer Modelle gleichzeitig ein
+        self._lock = threading.Lock()
+
+    def submit(self, request_file: str, model: str) -> str:
+        prompts = read_batch_request_file(request_file)
+        with self._lock:
+            self._submitted_jobs += 1
+            job_id = f"local-batch-{self._submitted_jobs}"
+            self._jobs[job_id] = prompts
+        print(f"-> Lokaler Batch-Job '{job_id}' mit {len(self._jobs[job_id])} Anfragen eingereicht.")
+        return job_id
+
+    def wait_for_results(self, job_id: str) -> dict:
+        prompts = self._jobs.pop(job_id)
+        return {key: self.responder(prompt) for key, prompt in prompts.items()}
@@ -1,35 +1,189 @@
 import datetime
+import os
 import re
-import time
-from .news_provider import NewsProvider, TagesschauAPI, SpiegelAPI, HandelsblattAPI
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable
+from .news_provider import NewsProvider, TagesschauAPI, SpiegelAPI, HandelsblattAPI, filter_articles_by_timeframe, \
+    as_of_datetime
+from .article_cache import ArticleCache
+from .news_index import NewsIndex, IndexedNewsProvider
 from .finance_provider import FinanceClient
-from .ai_client import AIClient
+from .price_store import PriceStore, FixturePriceSource, YFinancePriceSource
+from .http_transport import HttpTransport
+from .ai_client import AIClient, create_genai_client
+from .prompt_builder import PromptBuilder
+from .batch_client import BatchBackend
+from .response_cache import ResponseCache
 from .data_manager import DataManager
+from .run_journal import RunJournal
+from .dedup import NearDuplicateFilter
+from .text_extraction import TextExtractor
+from .replay import (FaultInjector, RecordingTransport, ReplayTransport, RecordingPriceSource,
+                     RecordingGenAIClient, ReplayGenAIClient)
+from .metrics import metrics, profiled
+from .structured_output import STRUCTURED_RESULT_COLUMNS, parse_prediction as parse_structured_prediction, \
+    to_result_columns
+
+
+DEFAULT_GEMINI_REQUESTS_PER_MINUTE = 5
 
 
 class ExperimentController:
     """Steuert den gesamten Ablauf des Experiments und sammelt die Daten."""
 
-    def __init__(self, model_name: str):
+    def __init__(self, model_name: str | Iterable[str], max_workers: int = 4,
+                 article_cache_path: str | None = 'cache/articles.sqlite', http_pool_size: int = 8,
+                 gemini_requests_per_minute: float | dict[str, float] = DEFAULT_GEMINI_REQUESTS_PER_MINUTE,
+                 response_cache_path: str | None = 'cache/responses.sqlite', replay_only: bool = False,
+                 results_flush_every: int = 5, results_format: str = 'csv',
+                 journal_path: str | None = None, price_store_dir: str | None = 'cache/prices',
+                 price_fixture_dir: str | None = None, text_extraction_backend: str | None = None,
+                 fixture_mode: str | None = None, fixture_dir: str = 'fixtures/recorded',
+                 fault_injector: FaultInjector | None = None, profile_path: str | None = None,
+                 structured_output: bool = False, news_index_path: str | None = None,
+                 news_token_budget: int = 6000):
+        """
+        Args:
+            model_name (str | Iterable[str]): Das zu verwendende Gemini-Modell oder eine Liste von Modellen.
+                               Bei mehreren Modellen werden Nachrichten, Kurse und Prompt jedes
+                               Durchlaufs nur einmal erstellt und gleichzeitig an alle Modelle
+                               geschickt; die Spalte 'Modell' unterscheidet die Ergebniszeilen.
+            max_workers (int): Anzahl der Durchläufe, die gleichzeitig bearbeitet werden.
+                               Mit 1 laufen alle Durchläufe strikt nacheinander.
+            article_cache_path (str | None): Pfad des persistenten Artikel-Caches.
+                                             None deaktiviert den Cache.
+            http_pool_size (int): Maximale Anzahl gleichzeitiger Verbindungen pro Nachrichten-Host.
+            gemini_requests_per_minute (float | dict[str, float]): RPM-Kontingent des Gemini-Kontos,
+                               entweder für jedes Modell gleich oder als Dict je Modell.
+                               Jedes Modell hat sein eigenes Rate-Limit.
+            response_cache_path (str | None): Pfad des Caches für Modellantworten.
+                                              None deaktiviert den Cache.
+            replay_only (bool): Prognosen nur aus dem Antwort-Cache laden, keine Gemini-Anfragen senden.
+            results_flush_every (int): Anzahl Ergebniszeilen, nach der die Ergebnisdatei gesichert wird.
+            results_format (str): Format der Ergebnisdatei, 'csv' oder 'parquet'.
+            journal_path (str | None): Pfad eines Run-Journals. Ist es gesetzt, werden bereits
+                                       abgeschlossene Durchläufe beim erneuten Start übersprungen
+                                       und ihre Ergebnisse aus dem Journal übernommen. Nach einer
+                                       Änderung von Prompt, Token-Budget oder strukturiertem Modus
+                                       werden die Durchläufe erneut ausgeführt.
+            price_store_dir (str | None): Verzeichnis des lokalen Kursspeichers. None hält Kurse nur im Speicher.
+            price_fixture_dir (str | None): Liest Kurse aus lokalen CSV-Dateien statt über yfinance (offline).
+            text_extraction_backend (str | None): HTML-Parser für Artikeltexte ('selectolax', 'lxml'
+                                                  oder 'html.parser'). None wählt das schnellste installierte.
+            fixture_mode (str | None): 'record' zeichnet alle Antworten von Nachrichtenseiten, yfinance
+                                       und Gemini in fixture_dir auf, 'replay' spielt sie ohne Netzwerk ab.
+                                       Artikel-, Antwort- und Kurs-Cache sind dann abgeschaltet, damit
+                                       jede Antwort aufgezeichnet wird und nichts in die echten Caches gelangt.
+                                       Nicht mit replay_only kombinierbar.
+            fixture_dir (str): Verzeichnis der Aufzeichnungen (Unterordner 'http', 'prices', 'gemini').
+            fault_injector (FaultInjector | None): Künstliche Latenz und Fehler (z.B. 503/429) beim Abspielen.
+            profile_path (str | None): Ist der Pfad gesetzt, wird jeder Lauf mit cProfile profiliert
+                                       und das Profil aller Worker-Threads dort gespeichert.
+            structured_output (bool): Fordert die Prognosen als validiertes JSON an, statt Freitext
+                                      per regulärem Ausdruck auszuwerten. Ergänzt die Spalten
+                                      'KI_Stimmung_Score' und 'KI_Prognose_5_Tage_Prozent'.
+            news_index_path (str | None): Pfad eines NewsIndex, den ingest_news.py befüllt. Ist er
+                                          gesetzt, werden Nachrichten nur aus dem Index gelesen statt
+                                          live von den Nachrichtenseiten abgerufen.
+            news_token_budget (int): Maximale geschätzte Token-Anzahl aller Nachrichten eines Prompts.
+                                     Die relevantesten Artikel werden bis zu diesem Budget übernommen.
+        """
         print("Initialisiere Controller...")
-        self.news_providers: list[NewsProvider] = [
-            TagesschauAPI(),
-            SpiegelAPI(),
-            HandelsblattAPI()
-        ]
+        self.models = [model_name] if isinstance(model_name, str) else list(dict.fromkeys(model_name))
+        if not self.models:
+            raise ValueError("Es muss mindestens ein Modell angegeben werden.")
+        self.max_workers = max(1, max_workers)
+        self.profile_path = profile_path
+        if fixture_mode not in (None, 'record', 'replay'):
+            raise ValueError(f"Unbekannter fixture_mode '{fixture_mode}'. Erlaubt sind 'record' und 'replay'.")
+        if fixture_mode is not None:
+            if replay_only:
+                raise ValueError("replay_only lässt sich nicht mit fixture_mode kombinieren.")
+            # Ein Cache-Treffer erreicht die aufzeichnende Quelle nie und fehlt dann in den Fixtures
+            article_cache_path = response_cache_path = price_store_dir = None
+        self.article_cache = ArticleCache(article_cache_path) if article_cache_path else None
+        http_fixture_dir = os.path.join(fixture_dir, 'http')
+        price_recording_dir = os.path.join(fixture_dir, 'prices')
+        gemini_fixture_dir = os.path.join(fixture_dir, 'gemini')
+        if fixture_mode == 'replay':
+            print(f"Replay-Modus: Alle externen Quellen werden aus '{fixture_dir}' abgespielt.")
+            self.http_transport = ReplayTransport(http_fixture_dir, fault_injector)
+        elif fixture_mode == 'record':
+            print(f"Aufnahme-Modus: Alle externen Antworten werden in '{fixture_dir}' gespeichert.")
+            self.http_transport = RecordingTransport(http_fixture_dir, HttpTransport(pool_maxsize=http_pool_size))
+        else:
+            self.http_transport = HttpTransport(pool_maxsize=http_pool_size)
+        self.text_extractor = TextExtractor(text_extraction_backend)
+        print(f"HTML-Extraktion über '{self.text_extractor.backend}'.")
+        self.news_index = NewsIndex(news_index_path) if news_index_path else None
+        if self.news_index is not None:
+            print(f"Nachrichten werden aus dem Index '{news_index_path}' gelesen ({len(self.news_index)} Artikel).")
+            self.news_providers: list[NewsProvider | IndexedNewsProvider] = [IndexedNewsProvider(self.news_index)]
+        else:
+            self.news_providers = [
+                provider_class(article_cache=self.article_cache, transport=self.http_transport,
+                               text_extractor=self.text_extractor)
+                for provider_class in (TagesschauAPI, SpiegelAPI, HandelsblattAPI)
+            ]
 
-        self.finance = FinanceClient()
-        self.ai_client = AIClient(model=model_name)
+        if fixture_mode == 'replay':
+            price_source = FixturePriceSource(price_recording_dir)
+        elif fixture_mode == 'record':
+            price_source = RecordingPriceSource(price_recording_dir, YFinancePriceSource())
+        else:
+            price_source = FixturePriceSource(price_fixture_dir) if price_fixture_dir else None
+        self.finance = FinanceClient(PriceStore(source=price_source, store_dir=price_store_dir))
+        # Dieselbe Agenturmeldung erscheint oft bei mehreren Providern
+        self.duplicate_filter = NearDuplicateFilter()
+        self.response_cache = ResponseCache(response_cache_path) if response_cache_path else None
+        prompt_builder = PromptBuilder(news_token_budget=news_token_budget)
+        if fixture_mode == 'replay':
+            gemini_client = ReplayGenAIClient(gemini_fixture_dir, fault_injector)
+        elif fixture_mode == 'record':
+            gemini_client = RecordingGenAIClient(gemini_fixture_dir, create_genai_client())
+        elif not replay_only:
+            # Ein gemeinsamer Client für alle Modelle
+            gemini_client = create_genai_client()
+        else:
+            gemini_client = None
+        self.ai_clients = {
+            model: AIClient(model=model,
+                            requests_per_minute=self._requests_per_minute(gemini_requests_per_minute, model),
+                            response_cache=self.response_cache, replay_only=replay_only,
+                            prompt_builder=prompt_builder, client=gemini_client,
+                            structured_output=structured_output)
+            for model in self.models
+        }
+        # Der Client des ersten Modells erstellt die Prompts, die alle Modelle erhalten
+        self.ai_client = self.ai_clients[self.models[0]]
         columns = [
-            'Durchlauf_ID', 'Analyse_Datum', 'Unternehmen', 'Branche',
+            'Durchlauf_ID', 'Analyse_Datum', 'Unternehmen', 'Branche', 'Modell',
             'Nachrichten_Zeitraum_Tage', 'Anzahl_Nachrichten', 'Kurs_bei_Prognose',
             'Kurs_nach_7_Tagen', 'KI_Handlungsempfehlung', 'KI_Stimmungsanalyse',
-            'KI_Begruendung', 'KI_Prognose_Roh_Text', 'Gefundene_Nachrichten_Snippets'
+            'KI_Begruendung', 'KI_Prognose_Roh_Text', 'Gefundene_Nachrichten_Snippets',
+            'Anzahl_Duplikate_entfernt'
         ]
-        self.data_manager = DataManager(columns=columns)
+        if structured_output:
+            columns += STRUCTURED_RESULT_COLUMNS
+        self.run_journal = RunJournal(journal_path, self.ai_client.prompt_builder.fingerprint(structured_output)) \
+            if journal_path else None
+        self.data_manager = DataManager(columns=columns, flush_every=results_flush_every,
+                                        output_format=results_format)
         print("Controller erfolgreich initialisiert.")
 
+    @staticmethod
+    def _requests_per_minute(requests_per_minute: float | dict[str, float], model: str) -> float:
+        if isinstance(requests_per_minute, dict):
+            return requests_per_minute.get(model, DEFAULT_GEMINI_REQUESTS_PER_MINUTE)
+        return requests_per_minute
+
     def _parse_prediction(self, text: str) -> dict:
+        if self.ai_client.structured_output:
+            try:
+                return to_result_columns(parse_structured_prediction(text))
+            except ValueError:
+                # Hinweis- und Fehlertexte statt einer Prognose
+                pass
         recommendation = "Nicht gefunden"
         sentiment = "Nicht gefunden"
         reasoning = "Nicht gefunden"
@@ -49,69 +203,364 @@ class ExperimentController:
             'KI_Begruendung': reasoning,
         }
 
-    def run_experiment_for(self, companies_dict: dict, news_timeframes: list, end_date_str: str):
-        """Führt das Experiment für alle Unternehmen und Zeiträume durch."""
+    def run_experiment_for(self, companies_dict: dict, news_timeframes: list, end_date_str: str,
+                           batch_mode: bool = False, batch_backend: BatchBackend | None = None):
+        """
+        Führt das Experiment für alle Unternehmen und Zeiträume zum Enddatum end_date_str durch.
+        Entspricht run_backtest mit einem einzelnen Enddatum.
+        """
+        self.run_backtest(companies_dict, news_timeframes, [end_date_str],
+                          batch_mode=batch_mode, batch_backend=batch_backend)
+
+    def run_backtest(self, companies_dict: dict, news_timeframes: list, end_dates: list,
+                     batch_mode: bool = False, batch_backend: BatchBackend | None = None):
+        """
+        Führt das Experiment für alle Enddaten, Unternehmen und Zeiträume durch.
+
+        Die Durchläufe werden vorab durchnummeriert und anschließend von einem
+        Worker-Pool bearbeitet, sodass Nachrichten- und Kursabrufe mehrerer
+        Durchläufe und Enddaten gleichzeitig laufen. Die Ergebnisse werden unabhängig
+        von der Fertigstellungsreihenfolge in der Reihenfolge der Durchlauf-IDs gespeichert.
+
+        Jedes Enddatum gilt als simulierter Analysezeitpunkt: Nachrichten und Kurse
+        werden nur bis zu diesem Tag berücksichtigt. Nachrichten werden pro Unternehmen
+        nur einmal für den gesamten Zeitraum aller Enddaten abgerufen und für jeden
+        Durchlauf im Speicher gefiltert; Kurse werden vorab gesammelt geladen.
+        Bei mehreren Modellen erhält jedes Modell denselben Prompt; je Durchlauf und
+        Modell entsteht eine Ergebniszeile.
+
+        Args:
+            end_dates (list): Enddaten im Format 'YYYY-MM-DD', z.B. aus backtest.trading_days.
+            batch_mode (bool): Sammelt zuerst die Eingaben aller Durchläufe und reicht
+                               sämtliche Prompts als einen Batch-Job ein.
+            batch_backend (BatchBackend | None): Ausführende Batch-Schnittstelle, z.B. ein
+                               LocalBatchBackend für Offline-Tests. Standard ist die Gemini Batch API.
+
+        Laufzeiten und Zähler aller Stufen werden neben der Ergebnisdatei als
+        '<Ergebnisdatei>_metrics.json' gespeichert.
+        """
+        metrics.reset()
+        with profiled(self.profile_path):
+            with metrics.timer('run.total'):
+                self._run_backtest(companies_dict, news_timeframes, end_dates, batch_mode, batch_backend)
+        self._print_run_statistics()
+        self._write_metrics(end_dates)
+        print("\nAlle Durchläufe abgeschlossen.")
+
+    def _run_backtest(self, companies_dict: dict, news_timeframes: list, end_dates: list, batch_mode: bool,
+                      batch_backend: BatchBackend | None):
+        planned_runs = []
         run_id_counter = 1
-        for company, industry in companies_dict.items():
-            for timeframe in news_timeframes:
-                print(
-                    f"\n--- Starte Durchlauf {run_id_counter}: {company} ({industry}) mit {timeframe}-Tage-Nachrichten ---")
-
-                all_articles = []
-                for provider in self.news_providers:
-                    try:
-                        articles = provider.fetch_and_extract_articles(
-                            company_name=company,
-                            timeframe_days=timeframe
-                        )
-                        all_articles.extend(articles)
-                    except Exception as e:
-                        print(f"Fehler bei {provider.__class__.__name__}: {e}")
-
-                stock_history = self.finance.get_stock_history(
-                    company,
-                    period_days=60,
-                    end_date_str=end_date_str
-                )
-                if stock_history is None or stock_history.empty:
-                    print(f"-> Kritisch: Keine Aktiendaten für {company}. Überspringe Durchlauf.")
+        for end_date_str in end_dates:
+            for company, industry in companies_dict.items():
+                for timeframe in news_timeframes:
+                    planned_runs.append((run_id_counter, company, industry, timeframe, end_date_str))
                     run_id_counter += 1
+
+        # Ergebniszeilen nach (Durchlauf-ID, Modell); ein Durchlauf ist offen, solange ein Modell fehlt
+        results_by_key = {}
+        pending_models = {}
+        for run_id, company, _, timeframe, end_date_str in planned_runs:
+            for model in self.models:
+                journaled_result = self._journaled_result(end_date_str, company, timeframe, model)
+                if journaled_result is not None:
+                    results_by_key[(run_id, model)] = dict(journaled_result, Durchlauf_ID=run_id, Modell=model)
+                else:
+                    pending_models.setdefault(run_id, []).append(model)
+        pending_runs = [run for run in planned_runs if run[0] in pending_models]
+        metrics.increment('runs.planned', len(planned_runs) * len(self.models))
+        metrics.increment('runs.from_journal', len(results_by_key))
+        if self.run_journal is not None:
+            print(f"-> Run-Journal: {len(results_by_key)} Prognosen bereits abgeschlossen, "
+                  f"{sum(map(len, pending_models.values()))} offen.")
+
+        # Pro Unternehmen das früheste und späteste noch offene Enddatum
+        pending_date_ranges = {}
+        for _, company, _, _, end_date_str in pending_runs:
+            first_date, last_date = pending_date_ranges.get(company, (end_date_str, end_date_str))
+            pending_date_ranges[company] = (min(first_date, end_date_str), max(last_date, end_date_str))
+        if pending_date_ranges:
+            # Ein gesammelter Kursabruf für alle Unternehmen und Enddaten; die Durchläufe lesen danach aus dem Speicher
+            self.finance.preload(list(pending_date_ranges), period_days=60,
+                                 end_date_str=max(last for _, last in pending_date_ranges.values()),
+                                 start_date_str=min(first for first, _ in pending_date_ranges.values()))
+
+        # Auch bei einem Fehler schließen, damit z.B. eine Parquet-Datei ihren Footer erhält
+        try:
+            max_timeframe = max(news_timeframes)
+            run_stage = self._prepare_run if batch_mode else self._execute_run
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Die Nachrichtenabrufe werden zuerst eingereiht, damit wartende Durchläufe
+                # nie alle Worker blockieren, bevor der zugehörige Abruf gestartet wurde.
+                news_futures = {
+                    company: executor.submit(self._fetch_news_for_company, company, max_timeframe,
+                                             first_date, last_date)
+                    for company, (first_date, last_date) in pending_date_ranges.items()
+                }
+                futures = {
+                    run_id: executor.submit(run_stage, run_id, company, industry, timeframe, end_date_str,
+                                            news_futures[company], pending_models[run_id])
+                    for run_id, company, industry, timeframe, end_date_str in pending_runs
+                }
+                if batch_mode:
+                    prepared_runs = [future.result() for future in futures.values()]
+                else:
+                    for run_id, *_ in planned_runs:
+                        run_results = futures[run_id].result() if run_id in futures else {}
+                        for model in self.models:
+                            self._store_result(results_by_key.get((run_id, model), run_results.get(model)))
+
+            if batch_mode:
+                results_by_key.update(
+                    self._run_predictions_as_batch([run for run in prepared_runs if run is not None], batch_backend))
+                for run_id, *_ in planned_runs:
+                    for model in self.models:
+                        self._store_result(results_by_key.get((run_id, model)))
+        finally:
+            self.data_manager.close()
+
+    def _run_predictions_as_batch(self, prepared_runs: list[dict], batch_backend: BatchBackend | None) -> dict:
+        """Reicht die Prompts aller vorbereiteten Durchläufe je Modell als einen Batch-Job ein.
+
+        Die Batch-Jobs mehrerer Modelle laufen gleichzeitig.
+
+        Returns:
+            dict: Ergebniszeilen nach (Durchlauf-ID, Modell).
+        """
+        request_file_prefix = os.path.splitext(self.data_manager.full_path)[0]
+        with ThreadPoolExecutor(max_workers=len(self.models)) as model_executor:
+            futures = {}
+            for model in self.models:
+                prediction_requests = {
+                    run['run_id']: (run['company'], run['dated_articles'], run['stock_history'].tail(run['timeframe']))
+                    for run in prepared_runs if model in run['models']
+                }
+                if not prediction_requests:
                     continue
+                request_file = request_file_prefix + (
+                    "_batch_requests.jsonl" if len(self.models) == 1
+                    else f"_batch_requests_{model.replace('/', '_')}.jsonl")
+                print(f"\n--- Reiche {len(prediction_requests)} Prognosen für {model} als Batch-Job ein ---")
+                futures[model] = model_executor.submit(self.ai_clients[model].get_predictions_batch,
+                                                       prediction_requests, request_file, batch_backend)
+            predictions = {model: future.result() for model, future in futures.items()}
+        results = {}
+        for run in prepared_runs:
+            for model in run['models']:
+                prediction_text = predictions[model][run['run_id']]
+                result = self._build_result(run, prediction_text, model)
+                results[(run['run_id'], model)] = result
+                self._record_in_journal(run, result, prediction_text, model)
+                metrics.increment('runs.completed')
+        return results
 
-                #24.09.2025 - 1 Tag, um den 23.09.2025 zu simulieren und wissenschaftlich korrekt zu arbeiten
-                today_for_test = stock_history.index[-1]
-                target_date_7_days_prior = today_for_test - datetime.timedelta(days=7)
+    def _journaled_result(self, end_date_str: str, company: str, timeframe: int, model: str) -> dict | None:
+        if self.run_journal is None:
+            return None
+        return self.run_journal.completed_result(end_date_str, company, timeframe, model)
 
+    def _record_in_journal(self, prepared_run: dict, result: dict, prediction_text: str, model: str):
+        """Vermerkt eine Prognose als abgeschlossen, sofern die KI-Anfrage nicht fehlgeschlagen ist."""
+        if self.run_journal is None or AIClient.is_error_response(prediction_text):
+            return
+        self.run_journal.record_completed(
+            prepared_run['end_date_str'], prepared_run['company'], prepared_run['timeframe'], model, result
+        )
+
+    def _store_result(self, result: dict | None):
+        if result is None:
+            return
+        self.data_manager.add_result(result)
+        self.data_manager.save_results()
+
+    def _write_metrics(self, end_dates: list):
+        """Speichert Laufzeiten, Zähler und Cache-Statistiken als JSON neben der Ergebnisdatei."""
+        caches = {}
+        if self.article_cache is not None:
+            caches['article_cache'] = {'hits': self.article_cache.hits, 'misses': self.article_cache.misses}
+        if self.response_cache is not None:
+            caches['response_cache'] = {'hits': self.response_cache.hits, 'misses': self.response_cache.misses}
+        metrics_path = os.path.splitext(self.data_manager.full_path)[0] + "_metrics.json"
+        metrics.write_json(metrics_path, extra={
+            'results_file': self.data_manager.full_path,
+            'models': self.models,
+            'end_dates': [min(end_dates), max(end_dates)] if end_dates else [],
+            'max_workers': self.max_workers,
+            'caches': caches,
+            'search_stats': {provider.source_name: dict(provider.search_stats) for provider in self.news_providers
+                             if getattr(provider, 'search_stats', None) is not None},
+        })
+        metrics.print_summary()
+        print(f"Messwerte gespeichert in '{metrics_path}'.")
+
+    def _print_run_statistics(self):
+        for provider in self.news_providers:
+            search_stats = getattr(provider, 'search_stats', None)
+            if search_stats:
+                print(f"{provider.source_name}-Suche: {search_stats}")
+        if self.article_cache is not None:
+            print(f"Artikel-Cache: {self.article_cache.hits} Treffer, {self.article_cache.misses} Downloads.")
+        if self.response_cache is not None:
+            print(f"Antwort-Cache: {self.response_cache.hits} Treffer, {self.response_cache.misses} neue Anfragen.")
+
+    def _fetch_news_for_company(self, company: str, timeframe: int, first_end_date_str: str,
+                                last_end_date_str: str) -> list[dict]:
+        """
+        Ruft die datierten Artikel aller Provider ab, die für Enddaten zwischen
+        first_end_date_str und last_end_date_str im angegebenen Zeitraum liegen.
+        """
+        first_as_of = as_of_datetime(first_end_date_str)
+        last_as_of = as_of_datetime(last_end_date_str)
+        covered_days = timeframe + (last_as_of - first_as_of).days
+        dated_articles = []
+        with metrics.timer('run.fetch_news'):
+            for provider in self.news_providers:
                 try:
-                    current_price = stock_history['Close'].iloc[-1]
-
-                    price_in_7_days = stock_history.asof(target_date_7_days_prior)['Close']
-
-                except (IndexError, KeyError) as e:
-                    print(
-                        f"-> Warnung: Nicht genügend historische Daten für {company} für die 7-Tage-Auswertung. Fehler: {e}")
-                    current_price = stock_history['Close'].iloc[-1] if not stock_history.empty else 0
-                    price_in_7_days = None
-
-                prediction_text = self.ai_client.get_prediction(company, all_articles, stock_history.tail(timeframe))
-                parsed_prediction = self._parse_prediction(prediction_text)
-                result = {
-                    'Durchlauf_ID': run_id_counter,
-                    'Analyse_Datum': end_date_str,
-                    'Unternehmen': company,
-                    'Branche': industry,
-                    'Nachrichten_Zeitraum_Tage': timeframe,
-                    'Anzahl_Nachrichten': len(all_articles),
-                    'Kurs_bei_Prognose': current_price,
-                    'Kurs_nach_7_Tagen': price_in_7_days,
-                    'KI_Handlungsempfehlung': parsed_prediction['KI_Handlungsempfehlung'],
-                    'KI_Stimmungsanalyse': parsed_prediction['KI_Stimmungsanalyse'],
-                    'KI_Begruendung': parsed_prediction['KI_Begruendung'],
-                    'KI_Prognose_Roh_Text': prediction_text,
-                    'Gefundene_Nachrichten_Snippets': (" ".join(all_articles))[:500] + "..."
-                }
-                self.data_manager.add_result(result)
-                self.data_manager.save_results()
-                run_id_counter += 1
+                    articles = provider.fetch_dated_articles(
+                        company_name=company,
+                        timeframe_days=covered_days,
+                        as_of=last_as_of
+                    )
+                    dated_articles.extend(articles)
+                except Exception as e:
+                    metrics.increment('news.provider_errors')
+                    print(f"Fehler bei {provider.__class__.__name__}: {e}")
+        metrics.increment('news.articles_fetched', len(dated_articles))
+        return dated_articles
+
+    def _execute_run(self, run_id: int, company: str, industry: str, timeframe: int, end_date_str: str,
+                     news_future: Future, models: list[str]) -> dict:
+        """
+        Führt einen einzelnen Durchlauf (Unternehmen, Zeitraum) für die angegebenen Modelle aus
+        und gibt die Ergebniszeilen nach Modell zurück. Wird der Durchlauf übersprungen,
+        ist das Ergebnis leer.
+        """
+        prepared_run = self._prepare_run(run_id, company, industry, timeframe, end_date_str, news_future, models)
+        if prepared_run is None:
+            return {}
+        with metrics.timer('run.predict'):
+            predictions = self._predict(prepared_run, models)
+        results = {}
+        for model, prediction_text in predictions.items():
+            results[model] = self._build_result(prepared_run, prediction_text, model)
+            self._record_in_journal(prepared_run, results[model], prediction_text, model)
+            metrics.increment('runs.completed')
+        return results
+
+    def _predict(self, prepared_run: dict, models: list[str]) -> dict[str, str]:
+        """
+        Erstellt den Prompt eines Durchlaufs einmal und schickt ihn gleichzeitig an alle Modelle.
+        Jedes Modell wartet nur auf sein eigenes Rate-Limit.
+        """
+        company = prepared_run['company']
+        stock_history = prepared_run['stock_history'].tail(prepared_run['timeframe'])
+        if not prepared_run['dated_articles']:
+            # Ohne Nachrichten antwortet der AIClient mit einem Hinweis, ohne das Modell anzufragen
+            return {model: self.ai_clients[model].get_prediction(company, [], stock_history) for model in models}
+
+        print(f"-> Generiere Prompt für {company}...")
+        prompt = self.ai_client.build_prompt(company, prepared_run['dated_articles'], stock_history)
+        if len(models) == 1:
+            return {models[0]: self._predict_with_model(models[0], company, prompt)}
+        with ThreadPoolExecutor(max_workers=len(models)) as model_executor:
+            futures = {model: model_executor.submit(self._predict_with_model, model, company, prompt)
+                       for model in models}
+            return {model: future.result() for model, future in futures.items()}
+
+    def _predict_with_model(self, model: str, company: str, prompt: str) -> str:
+        with metrics.timer(f'run.predict.{model}'):
+            return self.ai_clients[model].get_prediction_for_prompt(company, prompt)
+
+    def _prepare_run(self, run_id: int, company: str, industry: str, timeframe: int, end_date_str: str,
+                     news_future: Future, models: list[str]) -> dict | None:
+        """
+        Sammelt Nachrichten und Kursdaten für einen Durchlauf, ohne die KI anzufragen.
+        Gibt None zurück, wenn der Durchlauf mangels Kursdaten übersprungen wird.
+        """
+        print(f"\n--- Starte Durchlauf {run_id}: {company} ({industry}) mit {timeframe}-Tage-Nachrichten ---")
+
+        with metrics.timer('run.wait_for_news'):
+            news = news_future.result()
+        with metrics.timer('run.prepare'):
+            prepared_run = self._prepare_run_inputs(run_id, company, industry, timeframe, end_date_str, news)
+        if prepared_run is None:
+            metrics.increment('runs.skipped', len(models))
+            return None
+        # Modelle, deren Prognose für diesen Durchlauf noch aussteht
+        prepared_run['models'] = models
+        return prepared_run
 
-        print("\nAlle Durchläufe abgeschlossen.")
\ No newline at end of file
+    def _prepare_run_inputs(self, run_id: int, company: str, industry: str, timeframe: int, end_date_str: str,
+                            news: list[dict]) -> dict | None:
+        """Filtert und bereinigt die Nachrichten des Durchlaufs und lädt die passenden Kursdaten."""
+        dated_articles = filter_articles_by_timeframe(news, timeframe, as_of_datetime(end_date_str))
+        with metrics.timer('run.deduplicate'):
+            dated_articles, duplicates_removed = self.duplicate_filter.deduplicate(dated_articles)
+        metrics.increment('news.duplicates_removed', duplicates_removed)
+        if duplicates_removed:
+            print(f"-> {duplicates_removed} doppelte Artikel für {company} entfernt.")
+        all_articles = [article['text'] for article in dated_articles]
+
+        stock_history = self.finance.get_stock_history(
+            company,
+            period_days=60,
+            end_date_str=end_date_str
+        )
+        if stock_history is None or stock_history.empty:
+            print(f"-> Kritisch: Keine Aktiendaten für {company}. Überspringe Durchlauf {run_id}.")
+            return None
+
+        #24.09.2025 - 1 Tag, um den 23.09.2025 zu simulieren und wissenschaftlich korrekt zu arbeiten
+        today_for_test = stock_history.index[-1]
+        target_date_7_days_prior = today_for_test - datetime.timedelta(days=7)
+
+        try:
+            current_price = stock_history['Close'].iloc[-1]
+
+            price_in_7_days = stock_history.asof(target_date_7_days_prior)['Close']
+
+        except (IndexError, KeyError) as e:
+            print(
+                f"-> Warnung: Nicht genügend historische Daten für {company} für die 7-Tage-Auswertung. Fehler: {e}")
+            current_price = stock_history['Close'].iloc[-1] if not stock_history.empty else 0
+            price_in_7_days = None
+
+        return {
+            'run_id': run_id,
+            'company': company,
+            'industry': industry,
+            'timeframe': timeframe,
+            'end_date_str': end_date_str,
+            'articles': all_articles,
+            'dated_articles': dated_articles,
+            'duplicates_removed': duplicates_removed,
+            'stock_history': stock_history,
+            'current_price': current_price,
+            'price_in_7_days': price_in_7_days
+        }
+
+    def _build_result(self, prepared_run: dict, prediction_text: str, model: str) -> dict:
+        """Setzt die Ergebniszeile eines Modells aus den vorbereiteten Daten und der KI-Antwort zusammen."""
+        parsed_prediction = self._parse_prediction(prediction_text)
+        all_articles = prepared_run['articles']
+        result = {
+            'Durchlauf_ID': prepared_run['run_id'],
+            'Analyse_Datum': prepared_run['end_date_str'],
+            'Unternehmen': prepared_run['company'],
+            'Branche': prepared_run['industry'],
+            'Modell': model,
+            'Nachrichten_Zeitraum_Tage': prepared_run['timeframe'],
+            'Anzahl_Nachrichten': len(all_articles),
+            'Kurs_bei_Prognose': prepared_run['current_price'],
+            'Kurs_nach_7_Tagen': prepared_run['price_in_7_days'],
+            'KI_Handlungsempfehlung': parsed_prediction['KI_Handlungsempfehlung'],
+            'KI_Stimmungsanalyse': parsed_prediction['KI_Stimmungsanalyse'],
+            'KI_Begruendung': parsed_prediction['KI_Begruendung'],
+            'KI_Prognose_Roh_Text': prediction_text,
+            'Gefundene_Nachrichten_Snippets': (" ".join(all_articles))[:500] + "...",
+            'Anzahl_Duplikate_entfernt': prepared_run['duplicates_removed']
+        }
+        # Nur im strukturierten Modus vorhanden
+        result.update({column: parsed_prediction[column] for column in STRUCTURED_RESULT_COLUMNS
+                       if column in parsed_prediction})
+        return result
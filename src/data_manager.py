@@ -1,51 +1,239 @@
 import pandas as pd
 import datetime
 import os
+import csv
+from .metrics import metrics
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Spaltentypen für typisierte Ausgabeformate (Parquet). Nicht aufgeführte Spalten werden als Text gespeichert.
+INTEGER_COLUMNS = ['Durchlauf_ID', 'Nachrichten_Zeitraum_Tage', 'Anzahl_Nachrichten', 'Anzahl_Duplikate_entfernt']
+FLOAT_COLUMNS = ['Kurs_bei_Prognose', 'Kurs_nach_7_Tagen', 'KI_Stimmung_Score', 'KI_Prognose_5_Tage_Prozent']
+# Wenige, sich wiederholende Werte -> Dictionary-Encoding
+CATEGORY_COLUMNS = ['Analyse_Datum', 'Unternehmen', 'Branche', 'Modell', 'KI_Handlungsempfehlung']
+# Lange Freitexte -> stärker komprimiert
+LARGE_TEXT_COLUMNS = ['KI_Stimmungsanalyse', 'KI_Begruendung', 'KI_Prognose_Roh_Text', 'Gefundene_Nachrichten_Snippets']
+
+
+def load_results(path: str, columns: list | None = None) -> pd.DataFrame:
+    """
+    Lädt eine Ergebnisdatei (CSV oder Parquet) als DataFrame.
+
+    Args:
+        path (str): Pfad zur Ergebnisdatei.
+        columns (list | None): Nur diese Spalten laden. Bei Parquet werden die übrigen
+                               Spalten gar nicht erst von der Platte gelesen.
+    """
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, sep=';', encoding='utf-8-sig', usecols=columns)
+
+
+class _CsvResultWriter:
+    """Hängt Ergebniszeilen an eine ';'-getrennte CSV-Datei an."""
+
+    def __init__(self, path: str, columns: list):
+        is_new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        # utf-8-sig schreibt das BOM nur am Dateianfang, nicht bei jedem Anhängen
+        self._file = open(path, 'a', encoding='utf-8-sig', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, delimiter=';', extrasaction='ignore')
+        if is_new_file:
+            self._writer.writeheader()
+
+    def write(self, rows: list[dict]):
+        self._writer.writerows(self._format_row(row) for row in rows)
+        # Im Puffer des Betriebssystems übersteht die Zeile einen Absturz des Prozesses
+        self._file.flush()
+
+    def sync(self):
+        """Sichert die Datei mit fsync auch gegen einen Absturz des Rechners."""
+        os.fsync(self._file.fileno())
+
+    @staticmethod
+    def _format_row(row: dict) -> dict:
+        """Schreibt fehlende Werte (None/NaN) wie pandas.to_csv als leere Felder."""
+        return {key: ('' if value is None or (isinstance(value, float) and value != value) else value)
+                for key, value in row.items()}
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetResultWriter:
+    """
+    Schreibt Ergebniszeilen als Row Groups in eine Parquet-Datei mit typisierten
+    Zahlenspalten, Dictionary-Encoding für Kategorien und zstd-komprimierten Freitexten.
+    Die Datei ist erst nach close() vollständig lesbar, da Parquet den Footer zuletzt schreibt.
+    """
+
+    def __init__(self, path: str, columns: list):
+        self.schema = pa.schema([pa.field(column, self._arrow_type(column)) for column in columns])
+        compression = {column: ('zstd' if column in LARGE_TEXT_COLUMNS else 'snappy') for column in columns}
+        self._writer = pq.ParquetWriter(
+            path, self.schema,
+            compression=compression,
+            use_dictionary=[column for column in columns if column in CATEGORY_COLUMNS]
+        )
+
+    @staticmethod
+    def _arrow_type(column: str):
+        if column in INTEGER_COLUMNS:
+            return pa.int64()
+        if column in FLOAT_COLUMNS:
+            return pa.float64()
+        if column in CATEGORY_COLUMNS:
+            return pa.dictionary(pa.int32(), pa.string())
+        if column in LARGE_TEXT_COLUMNS:
+            return pa.large_string()
+        return pa.string()
+
+    def write(self, rows: list[dict]):
+        columns = {}
+        for field in self.schema:
+            values = [self._normalize(row.get(field.name)) for row in rows]
+            if pa.types.is_string(field.type) or pa.types.is_large_string(field.type) or \
+                    pa.types.is_dictionary(field.type):
+                values = [None if value is None else str(value) for value in values]
+            columns[field.name] = pa.array(values, type=field.type)
+        self._writer.write_table(pa.table(columns, schema=self.schema))
+
+    def sync(self):
+        # Row Groups werden beim Schreiben abgelegt; lesbar ist die Datei ohnehin erst nach close()
+        pass
+
+    @staticmethod
+    def _normalize(value):
+        if value is None or (isinstance(value, float) and value != value):
+            return None
+        # numpy-Skalare (z.B. aus pandas) in Python-Werte umwandeln
+        return value.item() if hasattr(value, 'item') else value
+
+    def close(self):
+        self._writer.close()
+
 
 class DataManager:
     """
     Verwaltet die Sammlung und Speicherung der Experiment-Ergebnisse.
     Speichert die Daten in einem Format, das für die Analyse und Visualisierung
     in einer wissenschaftlichen Arbeit optimiert ist.
+
+    Bei CSV wird jede neue Zeile sofort an die Ergebnisdatei angehängt; nur das
+    fsync erfolgt gesammelt nach 'flush_every' Zeilen. Bei Parquet werden jeweils
+    'flush_every' Zeilen gepuffert und als Row Group geschrieben, da einzelne Zeilen
+    winzige Row Groups erzeugen würden. Geschriebene Zeilen werden nicht im Speicher
+    gehalten; results_df liest sie bei Bedarf aus der Datei.
+
+    Als Ausgabeformat stehen CSV (';'-getrennt) und Parquet zur Verfügung.
     """
-    def __init__(self, columns: list, output_dir: str = 'results'):
+    def __init__(self, columns: list, output_dir: str = 'results', flush_every: int = 1,
+                 output_format: str = 'csv'):
         """
         Initialisiert den DataManager mit den vordefinierten Spalten.
 
         Args:
             columns (list): Eine Liste der Spaltennamen für den DataFrame.
             output_dir (str): Das Verzeichnis, in dem die Ergebnis-Dateien gespeichert werden.
+            flush_every (int): Anzahl neuer Zeilen, nach der die Datei mit fsync gesichert
+                               (CSV) bzw. als Row Group geschrieben wird (Parquet).
+            output_format (str): 'csv' oder 'parquet'. Parquet benötigt pyarrow.
         """
-        self.results_df = pd.DataFrame(columns=columns)
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unbekanntes Ausgabeformat '{output_format}'. Erlaubt sind 'csv' und 'parquet'.")
+        if output_format == 'parquet' and pa is None:
+            raise ImportError("Für das Parquet-Format wird das Paket 'pyarrow' benötigt.")
+        self.output_format = output_format
+        self.columns = list(columns)
+        self.row_count = 0
+        self.flush_every = max(1, flush_every)
+        self._pending_rows: list[dict] = []
+        self._synced_rows = 0
+        self._writer = None
         self.output_dir = output_dir
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         base_filename = "experiment_results"
-        filename = f"{base_filename}_{timestamp}.csv"
+        filename = f"{base_filename}_{timestamp}.{output_format}"
         self.full_path = os.path.join(self.output_dir, filename)
         print(f"DataManager initialisiert. Ergebnisse werden in '{self.output_dir}' gespeichert.")
 
+    @property
+    def results_df(self) -> pd.DataFrame:
+        """
+        Liest alle bisher geschriebenen Ergebnisse aus der Ergebnisdatei.
+        Eine Parquet-Datei ist erst nach close() lesbar.
+        """
+        if self.output_format == 'parquet' and (self._writer is not None or self._pending_rows):
+            raise RuntimeError("Die Parquet-Ergebnisdatei ist erst nach close() lesbar.")
+        if not os.path.exists(self.full_path):
+            return pd.DataFrame(columns=self.columns)
+        return load_results(self.full_path)
+
+    def _columns_for(self, rows: list[dict]) -> list:
+        """Vordefinierte Spalten, ergänzt um zusätzliche Schlüssel aus den ersten Ergebniszeilen."""
+        columns = list(self.columns)
+        for row in rows:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        return columns
+
     def add_result(self, result_data: dict):
         """
-        Fügt eine neue Zeile mit den Ergebnisdaten zum DataFrame hinzu.
-        Stellt sicher, dass nur vordefinierte Spalten hinzugefügt werden.
+        Fügt eine neue Zeile mit den Ergebnisdaten hinzu. Bei CSV wird sie sofort angehängt.
         """
-        new_row = pd.DataFrame([result_data])
-        self.results_df = pd.concat([self.results_df, new_row], ignore_index=True)
-        print(f"Ergebnis für Durchlauf '{result_data.get('Durchlauf_ID', 'N/A')}' zum DataFrame hinzugefügt.")
+        row = dict(result_data)
+        if self.output_format == 'parquet':
+            self._pending_rows.append(row)
+        else:
+            self._write_rows([row])
+        self.row_count += 1
+        print(f"Ergebnis für Durchlauf '{result_data.get('Durchlauf_ID', 'N/A')}' hinzugefügt.")
 
     def save_results(self):
         """
-        Speichert den gesammelten DataFrame in einer CSV-Datei mit Zeitstempel.
+        Sichert die Ergebnisdatei mit Zeitstempel, sobald seit der letzten Sicherung
+        'flush_every' neue Zeilen hinzugekommen sind.
         Ein Zeitstempel verhindert, dass Ergebnisse früherer Läufe überschrieben werden.
         """
-        if self.results_df.empty:
+        if not self.row_count:
             print("Keine Ergebnisse zum Speichern vorhanden.")
             return
+        if self.row_count - self._synced_rows < self.flush_every:
+            return
+        self._sync()
 
+    def close(self):
+        """Schreibt verbleibende Zeilen und schließt die Ergebnisdatei, auch wenn das Schreiben fehlschlägt."""
         try:
-            self.results_df.to_csv(self.full_path, index=False, encoding='utf-8-sig', sep=";")
-            print(f"Fortschritt gespeichert: {len(self.results_df)} Ergebnisse in '{self.full_path}' gesichert.")
-        except Exception as e:
-            print(f"Ein Fehler ist beim Speichern der CSV-Datei aufgetreten: {e}")
\ No newline at end of file
+            if self._pending_rows or self._synced_rows < self.row_count:
+                self._sync()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _sync(self):
+        # Ein fehlgeschlagener Block wird nicht erneut versucht; der Fehler wird weitergereicht
+        rows, self._pending_rows = self._pending_rows, []
+        if rows:
+            self._write_rows(rows)
+        if self._writer is not None:
+            with metrics.timer('results.write'):
+                self._writer.sync()
+        self._synced_rows = self.row_count
+        print(f"Fortschritt gespeichert: {self.row_count} Ergebnisse in '{self.full_path}' gesichert.")
+
+    def _write_rows(self, rows: list[dict]):
+        if self._writer is None:
+            writer_class = _ParquetResultWriter if self.output_format == 'parquet' else _CsvResultWriter
+            self._writer = writer_class(self.full_path, self._columns_for(rows))
+        with metrics.timer('results.write'):
+            self._writer.write(rows)
+        metrics.increment('results.rows_written', len(rows))
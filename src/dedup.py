@@ -0,0 +1,101 @@
+import re
+import zlib
+import numpy as np
+
+
+class NearDuplicateFilter:
+    """
+    Erkennt nahezu identische Artikel (z.B. dieselbe dpa-Meldung bei mehreren
+    Providern) per MinHash über Wort-Shingles.
+
+    Jeder Artikel erhält eine MinHash-Signatur, die Signaturen werden in Bänder
+    zerlegt (Locality Sensitive Hashing). Nur Artikel, die in mindestens einem
+    Band übereinstimmen, werden verglichen; der Aufwand wächst daher etwa linear
+    mit der Anzahl der Artikel statt quadratisch.
+    """
+
+    def __init__(self, threshold: float = 0.8, shingle_size: int = 5, num_bands: int = 16, rows_per_band: int = 4,
+                 seed: int = 42):
+        """
+        Args:
+            threshold (float): Geschätzte Jaccard-Ähnlichkeit, ab der zwei Artikel als Duplikat gelten.
+            shingle_size (int): Anzahl aufeinanderfolgender Wörter pro Shingle.
+            num_bands (int): Anzahl der LSH-Bänder.
+            rows_per_band (int): Signaturwerte pro Band. num_bands * rows_per_band ergibt die Signaturlänge.
+            seed (int): Startwert für die Hash-Funktionen, damit Ergebnisse reproduzierbar sind.
+        """
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        num_hashes = num_bands * rows_per_band
+        rng = np.random.default_rng(seed)
+        # Multiply-Shift-Hashing: ungerade 64-Bit-Multiplikatoren, Überlauf ist beabsichtigt
+        self._multipliers = rng.integers(1, 2 ** 63, size=(num_hashes, 1), dtype=np.uint64) | np.uint64(1)
+        self._offsets = rng.integers(0, 2 ** 63, size=(num_hashes, 1), dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        words = re.findall(r'\w+', text.lower())
+        if len(words) < self.shingle_size:
+            shingles = {" ".join(words)}
+        else:
+            shingles = {" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+        return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                           dtype=np.uint64, count=len(shingles))
+
+    def signature(self, text: str) -> np.ndarray:
+        """Berechnet die MinHash-Signatur eines Textes."""
+        shingle_hashes = self._shingle_hashes(text)
+        with np.errstate(over='ignore'):
+            hashed = (self._multipliers * shingle_hashes + self._offsets) >> np.uint64(32)
+        return hashed.min(axis=1)
+
+    def deduplicate(self, articles: list, text_key: str = 'text') -> tuple[list, int]:
+        """
+        Entfernt nahezu identische Artikel. Von jeder Gruppe bleibt der längste Text
+        erhalten; die Reihenfolge der verbleibenden Artikel bleibt unverändert.
+
+        Args:
+            articles (list): Artikel-Dicts (Text unter text_key) oder reine Texte.
+
+        Returns:
+            tuple: (verbleibende Artikel, Anzahl entfernter Duplikate)
+        """
+        if len(articles) < 2:
+            return list(articles), 0
+        texts = [article[text_key] if isinstance(article, dict) else article for article in articles]
+        signatures = [self.signature(text) for text in texts]
+
+        parents = list(range(len(articles)))
+
+        def find(index):
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        checked_pairs = set()
+        for band in range(self.num_bands):
+            band_slice = slice(band * self.rows_per_band, (band + 1) * self.rows_per_band)
+            buckets = {}
+            for index, signature in enumerate(signatures):
+                buckets.setdefault(signature[band_slice].tobytes(), []).append(index)
+            for members in buckets.values():
+                for position, first in enumerate(members):
+                    for other in members[position + 1:]:
+                        # Bereits zusammengeführte oder verglichene Paare überspringen
+                        if find(first) == find(other) or (first, other) in checked_pairs:
+                            continue
+                        checked_pairs.add((first, other))
+                        similarity = np.mean(signatures[first] == signatures[other])
+                        if similarity >= self.threshold:
+                            parents[find(other)] = find(first)
+
+        # Pro Gruppe den längsten Text behalten
+        keep = {}
+        for index in range(len(articles)):
+            root = find(index)
+            if root not in keep or len(texts[index]) > len(texts[keep[root]]):
+                keep[root] = index
+        kept_indices = sorted(keep.values())
+        return [articles[index] for index in kept_indices], len(articles) - len(kept_indices)
@@ -0,0 +1,177 @@
+import sys
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from .data_manager import load_results
+from .finance_provider import FinanceClient
+
+# Für die Auswertung benötigte Spalten; Freitexte werden gar nicht erst geladen
+EVALUATION_COLUMNS = ['Durchlauf_ID', 'Analyse_Datum', 'Unternehmen', 'Branche',
+                      'Nachrichten_Zeitraum_Tage', 'KI_Handlungsempfehlung']
+RECOMMENDATION_DIRECTIONS = {'KAUFEN': 1.0, 'VERKAUFEN': -1.0}
+# Größter Abstand zwischen Zieldatum und letztem verfügbaren Schlusskurs davor
+MAX_EXIT_GAP_DAYS = 5
+
+
+def load_result_files(paths: list[str]) -> pd.DataFrame:
+    """Lädt mehrere Ergebnisdateien (CSV oder Parquet) und hängt sie aneinander."""
+    frames = []
+    for path in paths:
+        frame = load_results(path)
+        columns = [column for column in EVALUATION_COLUMNS + ['Modell'] if column in frame.columns]
+        frames.append(frame[columns].assign(Quelldatei=path))
+    return pd.concat(frames, ignore_index=True)
+
+
+def parse_analysis_dates(values: pd.Series) -> pd.Series:
+    """
+    Wandelt die Spalte 'Analyse_Datum' in Zeitpunkte um. Der Controller schreibt ISO-Daten
+    ('2025-09-23'), ältere Ergebnisdateien enthalten deutsche Daten ('23.09.2025').
+    Nicht lesbare Werte werden zu NaT.
+    """
+    text = values.astype(str).str.strip()
+    iso_dates = pd.to_datetime(text, format='%Y-%m-%d', errors='coerce')
+    return iso_dates.fillna(pd.to_datetime(text, format='%d.%m.%Y', errors='coerce'))
+
+
+def _price_table(finance_client: FinanceClient, tickers: list[str], start: datetime, end: datetime) -> pd.DataFrame:
+    """Baut eine lange Kurstabelle (Ticker, Date, Close) aus dem Kursspeicher."""
+    finance_client.price_store.ensure(tickers, start, end)
+    frames = []
+    for ticker in tickers:
+        history = finance_client.price_store.get_history(ticker, start, end)
+        if history is not None and not history.empty:
+            frames.append(pd.DataFrame({'Ticker': ticker, 'Date': history.index, 'Close': history['Close'].values}))
+    if not frames:
+        return pd.DataFrame({'Ticker': pd.Series(dtype=object), 'Date': pd.Series(dtype='datetime64[ns]'),
+                             'Close': pd.Series(dtype=float)})
+    return pd.concat(frames, ignore_index=True).sort_values('Date', kind='stable')
+
+
+def attach_prices(results: pd.DataFrame, finance_client: FinanceClient, horizon_days: int = 7) -> pd.DataFrame:
+    """
+    Ergänzt die Ergebnisse um Einstiegs- und Ausstiegskurs aus dem Kursspeicher.
+
+    Der Einstiegskurs ist der letzte Schlusskurs vor dem Analysedatum (wie im
+    Prompt), der Ausstiegskurs der letzte Schlusskurs bis einschließlich
+    Analysedatum + horizon_days. Beide werden per merge_asof für alle Zeilen
+    gleichzeitig zugeordnet. Liegt der Ausstieg noch in der Zukunft, bleibt er leer.
+    """
+    evaluated = results.copy()
+    evaluated['_Zeile'] = np.arange(len(evaluated))
+    ticker_map = {name.lower(): ticker for name, ticker in finance_client.ticker_map.items()}
+    evaluated['Ticker'] = evaluated['Unternehmen'].astype(str).str.lower().map(ticker_map)
+    evaluated['_Analyse'] = parse_analysis_dates(evaluated['Analyse_Datum'])
+    evaluated['_Ziel'] = evaluated['_Analyse'] + pd.Timedelta(days=horizon_days)
+
+    known = evaluated.dropna(subset=['Ticker', '_Analyse'])
+    tickers = sorted(known['Ticker'].unique())
+    if known.empty:
+        evaluated['Kurs_Einstieg'] = np.nan
+        evaluated['Kurs_Ausstieg'] = np.nan
+        return evaluated.drop(columns=['_Zeile', '_Analyse', '_Ziel'])
+
+    # Etwas Vorlauf, damit auch nach Wochenenden und Feiertagen ein Einstiegskurs gefunden wird
+    prices = _price_table(finance_client, tickers,
+                          known['_Analyse'].min().to_pydatetime() - timedelta(days=10),
+                          known['_Ziel'].max().to_pydatetime() + timedelta(days=1))
+    prices = prices.astype({'Date': 'datetime64[ns]'})
+
+    known = known.astype({'_Analyse': 'datetime64[ns]', '_Ziel': 'datetime64[ns]'})
+    entry = pd.merge_asof(
+        known[['_Zeile', 'Ticker', '_Analyse']].sort_values('_Analyse', kind='stable'),
+        prices.rename(columns={'Close': 'Kurs_Einstieg', 'Date': '_Einstieg_Datum'}),
+        left_on='_Analyse', right_on='_Einstieg_Datum', by='Ticker',
+        direction='backward', allow_exact_matches=False
+    )
+    exit_ = pd.merge_asof(
+        known[['_Zeile', 'Ticker', '_Ziel', '_Analyse']].sort_values('_Ziel', kind='stable'),
+        prices.rename(columns={'Close': 'Kurs_Ausstieg', 'Date': '_Ausstieg_Datum'}),
+        left_on='_Ziel', right_on='_Ausstieg_Datum', by='Ticker', direction='backward'
+    )
+    # Der Ausstieg muss nach der Analyse und nahe am Zieldatum liegen (Wochenenden, Feiertage)
+    # und darf nicht in der Zukunft liegen
+    today = pd.Timestamp(datetime.now().date())
+    exit_valid = (exit_['_Ausstieg_Datum'] >= exit_['_Analyse']) & \
+                 (exit_['_Ausstieg_Datum'] > exit_['_Ziel'] - pd.Timedelta(days=MAX_EXIT_GAP_DAYS)) & \
+                 (exit_['_Ziel'] < today)
+    exit_['Kurs_Ausstieg'] = exit_['Kurs_Ausstieg'].where(exit_valid)
+
+    evaluated = evaluated.merge(entry[['_Zeile', 'Kurs_Einstieg']], on='_Zeile', how='left')
+    evaluated = evaluated.merge(exit_[['_Zeile', 'Kurs_Ausstieg']], on='_Zeile', how='left')
+    return evaluated.sort_values('_Zeile').drop(columns=['_Zeile', '_Analyse', '_Ziel']).reset_index(drop=True)
+
+
+def score_predictions(evaluated: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bewertet die Empfehlungen spaltenweise ohne Schleifen über Zeilen.
+
+    Ergänzt 'Rendite_Aktie' (Kursänderung), 'Rendite_Strategie' (Rendite bei
+    Befolgen der Empfehlung, VERKAUFEN als Leerverkauf) und 'Treffer' (Richtung
+    korrekt). Zeilen ohne Empfehlung oder ohne Ausstiegskurs bleiben leer.
+    """
+    scored = evaluated.copy()
+    direction = scored['KI_Handlungsempfehlung'].astype(str).map(RECOMMENDATION_DIRECTIONS).to_numpy(dtype=float)
+    entry_price = scored['Kurs_Einstieg'].to_numpy(dtype=float)
+    entry_price = np.where(entry_price > 0, entry_price, np.nan)
+    stock_return = scored['Kurs_Ausstieg'].to_numpy(dtype=float) / entry_price - 1
+    scored['Rendite_Aktie'] = stock_return
+    scored['Rendite_Strategie'] = direction * stock_return
+    hit = np.sign(stock_return) == direction
+    scored['Treffer'] = np.where(np.isnan(direction) | np.isnan(stock_return), np.nan, hit.astype(float))
+    return scored
+
+
+def summarize(scored: pd.DataFrame, by: list[str] | str | None = None) -> pd.DataFrame:
+    """Fasst Trefferquote und Renditen gesamt oder gruppiert nach den Spalten in 'by' zusammen."""
+    aggregations = {
+        'Anzahl': ('Treffer', 'size'),
+        'Bewertet': ('Treffer', 'count'),
+        'Trefferquote': ('Treffer', 'mean'),
+        'Mittlere_Rendite_Aktie': ('Rendite_Aktie', 'mean'),
+        'Mittlere_Rendite_Strategie': ('Rendite_Strategie', 'mean'),
+        'Summe_Rendite_Strategie': ('Rendite_Strategie', 'sum'),
+    }
+    if not by:
+        return scored.assign(_Gesamt='Gesamt').groupby('_Gesamt').agg(**aggregations).rename_axis(None)
+    return scored.groupby(by, observed=True, dropna=False).agg(**aggregations)
+
+
+def evaluate(results: pd.DataFrame | list[str], finance_client: FinanceClient | None = None,
+             horizon_days: int = 7) -> dict[str, pd.DataFrame]:
+    """
+    Bewertet Ergebnisse gegen die Kurse aus dem Kursspeicher.
+
+    Args:
+        results (pd.DataFrame | list[str]): Ergebnisse oder Pfade zu Ergebnisdateien.
+        finance_client (FinanceClient | None): Quelle für Ticker und Kurse.
+        horizon_days (int): Haltedauer in Kalendertagen nach dem Analysedatum.
+
+    Returns:
+        dict[str, pd.DataFrame]: Bewertete Zeilen ('zeilen') und Zusammenfassungen
+            gesamt, je Empfehlung, Branche, Nachrichtenzeitraum und (falls vorhanden) Modell.
+    """
+    if not isinstance(results, pd.DataFrame):
+        results = load_result_files(list(results))
+    finance_client = finance_client if finance_client is not None else FinanceClient()
+    scored = score_predictions(attach_prices(results, finance_client, horizon_days))
+    summaries = {
+        'zeilen': scored,
+        'gesamt': summarize(scored),
+        'nach_Empfehlung': summarize(scored, 'KI_Handlungsempfehlung'),
+        'nach_Branche': summarize(scored, 'Branche'),
+        'nach_Zeitraum': summarize(scored, 'Nachrichten_Zeitraum_Tage'),
+    }
+    if 'Modell' in scored.columns:
+        summaries['nach_Modell'] = summarize(scored, 'Modell')
+    return summaries
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Aufruf: python -m src.evaluation <Ergebnisdatei> [<Ergebnisdatei> ...]")
+        sys.exit(1)
+    for name, table in evaluate(sys.argv[1:]).items():
+        if name != 'zeilen':
+            print(f"\n--- {name} ---")
+            print(table.to_string())
@@ -1,10 +1,16 @@
-import yfinance as yf
-from datetime import datetime, timedelta
+from .price_store import PriceStore, date_range_for
+from .metrics import metrics
 
 class FinanceClient:
-    """Ruft Finanzdaten über die yfinance-Bibliothek ab."""
+    """Ruft Finanzdaten über einen lokalen Kursspeicher ab, der fehlende Kurse über yfinance nachlädt."""
 
-    def __init__(self):
+    def __init__(self, price_store: PriceStore | None = None):
+        """
+        Args:
+            price_store (PriceStore | None): Kursspeicher, aus dem Anfragen bedient werden.
+                                             Ohne Angabe wird ein Speicher unter 'cache/prices' angelegt.
+        """
+        self.price_store = price_store if price_store is not None else PriceStore()
         self.ticker_map = {
             'volkswagen': 'VOW3.DE',
             'siemens': 'SIE.DE',
@@ -22,6 +28,27 @@ class FinanceClient:
         """Findet das passende Ticker-Symbol für einen Unternehmensnamen."""
         return self.ticker_map.get(company_name.lower())
 
+    def preload(self, company_names: list, period_days: int = 60, end_date_str: str = None,
+                start_date_str: str = None):
+        """
+        Lädt die Kurse aller angegebenen Unternehmen mit einem gesammelten Aufruf in den Kursspeicher,
+        damit spätere Aufrufe von get_stock_history ohne Netzwerkzugriff auskommen.
+
+        Args:
+            company_names (list): Die Namen der Unternehmen.
+            period_days (int): Zeitraum in Tagen vor dem frühesten Enddatum.
+            end_date_str (str): Spätestes Enddatum im Format 'YYYY-MM-DD'. Wenn None, wird heute verwendet.
+            start_date_str (str): Frühestes Enddatum, falls mehrere Enddaten abgedeckt werden sollen.
+        """
+        tickers = [ticker for ticker in map(self._get_ticker_for_company, company_names) if ticker]
+        if not tickers:
+            return
+        start_date, end_date = date_range_for(period_days, end_date_str)
+        if start_date_str:
+            start_date = min(start_date, date_range_for(period_days, start_date_str)[0])
+        with metrics.timer('finance.preload'):
+            self.price_store.ensure(tickers, start_date, end_date)
+
     def get_stock_history(self, company_name: str, period_days: int = 60, end_date_str: str = None):
         """
         Ruft die Aktienkurshistorie für ein Unternehmen über einen bestimmten Zeitraum ab.
@@ -39,19 +66,14 @@ class FinanceClient:
             print(f"-> Fehler: Kein Ticker-Symbol für '{company_name}' gefunden.")
             return None
 
-        if end_date_str:
-            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-        else:
-            end_date = datetime.now()
-
-        start_date = end_date - timedelta(days=period_days)
+        start_date, end_date = date_range_for(period_days, end_date_str)
         print(
             f"Rufe Aktienhistorie für '{company_name}' (Ticker: {ticker_symbol}) ab: {start_date.strftime('%Y-%m-%d')} bis {end_date.strftime('%Y-%m-%d')}...")
         try:
-            stock = yf.Ticker(ticker_symbol)
-            history = stock.history(start=start_date, end=end_date)
+            with metrics.timer('finance.get_stock_history'):
+                history = self.price_store.get_history(ticker_symbol, start_date, end_date)
 
-            if history.empty:
+            if history is None or history.empty:
                 print(f"-> Warnung: Keine Daten für Ticker '{ticker_symbol}' gefunden.")
                 return None
 
@@ -60,4 +82,4 @@ class FinanceClient:
 
         except Exception as e:
             print(f"-> Ein Fehler ist aufgetreten: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,79 @@
+import threading
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .metrics import metrics
+
+
+class HttpTransport:
+    """
+    Gemeinsame HTTP-Schicht für alle Nachrichten-Provider.
+
+    Pro Host wird eine eigene requests.Session mit Keep-Alive und begrenztem
+    Connection-Pool gehalten, sodass wiederholte Anfragen an denselben Server
+    die TCP-/TLS-Verbindung wiederverwenden. Vorübergehende Fehler (429, 5xx)
+    werden mit exponentiellem Backoff wiederholt; jede Anfrage hat ein Timeout.
+    """
+
+    def __init__(self, pool_maxsize: int = 8, timeout: float | tuple = (5, 30), max_retries: int = 3,
+                 backoff_factor: float = 0.5, status_forcelist: tuple = (429, 500, 502, 503, 504)):
+        """
+        Args:
+            pool_maxsize (int): Maximale Anzahl gleichzeitiger Verbindungen pro Host.
+            timeout (float | tuple): Standard-Timeout in Sekunden, ggf. als (Verbindung, Lesen).
+            max_retries (int): Maximale Anzahl an Wiederholungen pro Anfrage.
+            backoff_factor (float): Basis für den exponentiellen Backoff zwischen Wiederholungen.
+            status_forcelist (tuple): HTTP-Statuscodes, bei denen wiederholt wird.
+        """
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _session_for(self, url: str) -> requests.Session:
+        """Gibt die Session für den Host der URL zurück und legt sie bei Bedarf an."""
+        parsed = urllib.parse.urlsplit(url)
+        host_key = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = requests.Session()
+                # pool_block begrenzt die gleichzeitigen Verbindungen pro Host auf pool_maxsize
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize,
+                                      max_retries=self.retry, pool_block=True)
+                session.mount(host_key, adapter)
+                self._sessions[host_key] = session
+            return session
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None,
+            timeout: float | tuple | None = None) -> requests.Response:
+        """Sendet eine GET-Anfrage über die gepoolte Session des Hosts."""
+        session = self._session_for(url)
+        with metrics.timer('http.request'):
+            response = session.get(url, params=params, headers=headers,
+                                   timeout=timeout if timeout is not None else self.timeout)
+        metrics.increment('http.requests')
+        metrics.increment('http.bytes', len(response.content))
+        # urllib3 hält die Wiederholungen dieser Anfrage im Retry-Objekt der Rohantwort fest
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', None)
+        if retries:
+            metrics.increment('http.retries', len(retries))
+        if response.status_code >= 400:
+            metrics.increment(f"http.status_{response.status_code}")
+        return response
+
+    def close(self):
+        """Schließt alle offenen Sessions und deren Verbindungen."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,135 @@
+import os
+import io
+import json
+import time
+import sys
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Leichtgewichtige, threadsichere Sammlung von Zeitmessungen und Zählern.
+
+    Zeitmessungen werden pro Name als Anzahl, Gesamt- und Höchstdauer geführt,
+    Zähler als einfache Summen (z.B. Anfragen, Bytes, Wartesekunden). Alle
+    Komponenten schreiben in die gemeinsame Instanz 'metrics' dieses Moduls.
+    """
+
+    def __init__(self):
+        self._timers: dict[str, dict] = {}
+        self._counters: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, name: str):
+        """Misst die Dauer des with-Blocks unter dem angegebenen Namen."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float):
+        with self._lock:
+            timer = self._timers.setdefault(name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            timer['count'] += 1
+            timer['total_seconds'] += seconds
+            timer['max_seconds'] = max(timer['max_seconds'], seconds)
+
+    def increment(self, name: str, amount: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """Gibt alle Messwerte als JSON-fähiges Dict zurück, Zeitmessungen nach Gesamtdauer sortiert."""
+        with self._lock:
+            timers = {
+                name: {
+                    'count': timer['count'],
+                    'total_seconds': round(timer['total_seconds'], 4),
+                    'mean_seconds': round(timer['total_seconds'] / timer['count'], 4),
+                    'max_seconds': round(timer['max_seconds'], 4),
+                }
+                for name, timer in sorted(self._timers.items(), key=lambda item: -item[1]['total_seconds'])
+            }
+            counters = {name: round(value, 4) if isinstance(value, float) else value
+                        for name, value in sorted(self._counters.items())}
+        return {'timers': timers, 'counters': counters}
+
+    def write_json(self, path: str, extra: dict | None = None):
+        """Schreibt die Messwerte (und optionale Zusatzangaben) als JSON-Datei."""
+        summary = dict(extra or {})
+        summary.update(self.snapshot())
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, 'w', encoding='utf-8') as summary_file:
+            json.dump(summary, summary_file, ensure_ascii=False, indent=2)
+
+    def print_summary(self, top: int = 10):
+        """Gibt die zeitintensivsten Abschnitte und alle Zähler aus."""
+        snapshot = self.snapshot()
+        print("\n--- Laufzeit nach Abschnitten ---")
+        for name, timer in list(snapshot['timers'].items())[:top]:
+            print(f"{name:<40} {timer['total_seconds']:>10.2f} s  ({timer['count']}x, max {timer['max_seconds']:.2f} s)")
+        print("--- Zähler ---")
+        for name, value in snapshot['counters'].items():
+            print(f"{name:<40} {value:>12}")
+
+
+# Gemeinsame Instanz für alle Komponenten
+metrics = Metrics()
+
+
+@contextmanager
+def profiled(output_path: str | None, top: int = 25):
+    """
+    Optionaler cProfile-Hook: Ist output_path gesetzt, wird der with-Block profiliert,
+    die Rohdaten werden in output_path (für snakeviz/pstats) geschrieben und die
+    teuersten Funktionen nach kumulierter Zeit ausgegeben. Ohne Pfad passiert nichts.
+
+    Erfasst werden auch alle Threads, die innerhalb des Blocks starten (z.B. die Worker
+    des Controllers); ihre Profile werden mit dem des aufrufenden Threads zusammengeführt.
+    """
+    if not output_path:
+        yield
+        return
+    thread_profilers = []
+    thread_profilers_lock = threading.Lock()
+
+    def start_thread_profiler(frame, event, arg):
+        # Wird beim ersten Ereignis eines neuen Threads aufgerufen; enable() ersetzt diesen Hook
+        thread_profiler = cProfile.Profile()
+        with thread_profilers_lock:
+            thread_profilers.append(thread_profiler)
+        thread_profiler.enable()
+
+    # Ab Python 3.12 misst cProfile über sys.monitoring bereits alle Threads
+    per_thread = sys.version_info < (3, 12)
+    profiler = cProfile.Profile()
+    if per_thread:
+        threading.setprofile(start_thread_profiler)
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        if per_thread:
+            threading.setprofile(None)
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        with thread_profilers_lock:
+            for thread_profiler in thread_profilers:
+                stats.add(thread_profiler)
+        stats.dump_stats(output_path)
+        stats.sort_stats('cumulative').print_stats(top)
+        print(f"\n--- Profil gespeichert in '{output_path}' ({len(thread_profilers) + 1} Threads) ---")
+        print(report.getvalue())
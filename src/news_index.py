@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from .news_provider import timeframe_start
+from .metrics import metrics
+
+# Obergrenze an Platzhaltern pro IN-Liste, unterhalb des SQLite-Limits
+_MAX_SQL_VARIABLES = 500
+
+
+def _to_iso(value: datetime) -> str:
+    """Einheitliche UTC-Darstellung, damit Zeitpunkte als Text sortier- und vergleichbar sind."""
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+    return value.astimezone(timezone.utc).isoformat()
+
+
+def _chunks(values: list, size: int = _MAX_SQL_VARIABLES):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class NewsIndex:
+    """
+    Lokaler Volltext-Index aller eingesammelten Nachrichtenartikel auf Basis von SQLite FTS5.
+
+    Jeder Artikel wird einmal pro (Quelle, Artikel-URL bzw. -Pfad) mit Veröffentlichungsdatum
+    und Volltext gespeichert und mit allen Unternehmen verknüpft, in deren Suche er auftauchte.
+    Zusätzlich wird pro Quelle und Unternehmen vermerkt, welcher Zeitraum bereits eingesammelt
+    wurde. Anders als der ArticleCache verfällt nichts, damit Backtests reproduzierbar bleiben.
+    """
+
+    def __init__(self, db_path: str = 'cache/news_index.sqlite'):
+        """
+        Args:
+            db_path (str): Pfad zur SQLite-Datei. Das Verzeichnis wird bei Bedarf angelegt.
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                published TEXT NOT NULL,
+                text TEXT NOT NULL,
+                ingested_at REAL NOT NULL,
+                UNIQUE (source, identifier)
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published);
+            CREATE TABLE IF NOT EXISTS article_companies (
+                company TEXT NOT NULL COLLATE NOCASE,
+                article_id INTEGER NOT NULL REFERENCES articles (id),
+                PRIMARY KEY (company, article_id)
+            );
+            CREATE TABLE IF NOT EXISTS coverage (
+                source TEXT NOT NULL,
+                company TEXT NOT NULL COLLATE NOCASE,
+                covered_from TEXT NOT NULL,
+                covered_until TEXT NOT NULL,
+                PRIMARY KEY (source, company)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                text, content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            );
+        """)
+        self._connection.commit()
+
+    def known_identifiers(self, source: str, identifiers: list[str]) -> set[str]:
+        """Gibt zurück, welche der Artikel einer Quelle bereits im Index liegen."""
+        known = set()
+        with self._lock:
+            for chunk in _chunks(list(identifiers)):
+                rows = self._connection.execute(
+                    f"SELECT identifier FROM articles WHERE source = ? AND identifier IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    (source, *chunk)
+                ).fetchall()
+                known.update(identifier for identifier, in rows)
+        return known
+
+    def tag_company(self, source: str, identifiers: list[str], company: str):
+        """Verknüpft bereits gespeicherte Artikel zusätzlich mit einem Unternehmen."""
+        with self._lock:
+            for chunk in _chunks(list(identifiers)):
+                self._connection.execute(
+                    f"INSERT OR IGNORE INTO article_companies (company, article_id) "
+                    f"SELECT ?, id FROM articles WHERE source = ? AND identifier IN ({', '.join('?' * len(chunk))})",
+                    (company, source, *chunk)
+                )
+            self._connection.commit()
+
+    def add_articles(self, company: str, articles: list[dict]) -> int:
+        """
+        Speichert Artikel (Dicts mit 'source', 'identifier', 'date' und 'text') für ein
+        Unternehmen. Bereits vorhandene Artikel werden nur mit dem Unternehmen verknüpft.
+
+        Returns:
+            int: Anzahl der neu aufgenommenen Artikel.
+        """
+        now = time.time()
+        added = 0
+        with self._lock:
+            for article in articles:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO articles (source, identifier, published, text, ingested_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (article['source'], article['identifier'], _to_iso(article['date']), article['text'], now)
+                )
+                if cursor.rowcount:
+                    added += 1
+                    self._connection.execute("INSERT INTO articles_fts (rowid, text) VALUES (?, ?)",
+                                             (cursor.lastrowid, article['text']))
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO article_companies (company, article_id) "
+                    "SELECT ?, id FROM articles WHERE source = ? AND identifier = ?",
+                    (company, article['source'], article['identifier'])
+                )
+            self._connection.commit()
+        return added
+
+    def record_coverage(self, source: str, company: str, covered_from: datetime, covered_until: datetime):
+        """Vermerkt, dass die Artikel einer Quelle für ein Unternehmen in diesem Zeitraum eingesammelt sind."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO coverage (source, company, covered_from, covered_until) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (source, company) DO UPDATE SET "
+                "covered_from = MIN(covered_from, excluded.covered_from), "
+                "covered_until = MAX(covered_until, excluded.covered_until)",
+                (source, company, _to_iso(covered_from), _to_iso(covered_until))
+            )
+            self._connection.commit()
+
+    def coverage(self, company: str, source: str | None = None) -> tuple[datetime, datetime] | None:
+        """
+        Gibt den Zeitraum zurück, der für ein Unternehmen eingesammelt ist. Ohne Angabe
+        einer Quelle ist das der Zeitraum, den alle eingesammelten Quellen abdecken.
+        None, wenn für das Unternehmen noch nichts eingesammelt wurde.
+        """
+        query = "SELECT MAX(covered_from), MIN(covered_until) FROM coverage WHERE company = ?"
+        parameters = (company,)
+        if source is not None:
+            query += " AND source = ?"
+            parameters += (source,)
+        with self._lock:
+            covered_from, covered_until = self._connection.execute(query, parameters).fetchone()
+        if covered_from is None:
+            return None
+        return datetime.fromisoformat(covered_from), datetime.fromisoformat(covered_until)
+
+    def articles_for(self, company: str, start: datetime, end: datetime, match: str | None = None) -> list[dict]:
+        """
+        Gibt die Artikel eines Unternehmens mit start <= Veröffentlichung < end zurück, neueste zuerst.
+
+        Args:
+            match (str | None): Optionale FTS5-Suchanfrage, z.B. 'Quartalszahlen OR Ausblick'.
+
+        Returns:
+            list[dict]: Dicts mit den Schlüsseln 'source', 'identifier', 'date' und 'text'.
+        """
+        query = ("SELECT a.source, a.identifier, a.published, a.text FROM articles a "
+                 "JOIN article_companies c ON c.article_id = a.id "
+                 "WHERE c.company = ? AND a.published >= ? AND a.published < ?")
+        parameters = (company, _to_iso(start), _to_iso(end))
+        if match is not None:
+            query += " AND a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)"
+            parameters += (match,)
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY a.published DESC", parameters).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    def search(self, match: str, limit: int = 20) -> list[dict]:
+        """Volltextsuche über alle Artikel, sortiert nach Relevanz (BM25)."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT a.source, a.identifier, a.published, a.text FROM articles_fts "
+                "JOIN articles a ON a.id = articles_fts.rowid "
+                "WHERE articles_fts MATCH ? ORDER BY articles_fts.rank LIMIT ?",
+                (match, limit)
+            ).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    @staticmethod
+    def _to_article(row: tuple) -> dict:
+        source, identifier, published, text = row
+        return {'source': source, 'identifier': identifier, 'date': datetime.fromisoformat(published), 'text': text}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class IndexedNewsProvider:
+    """
+    Liefert Artikel aus einem NewsIndex statt über das Netzwerk. Bietet dieselbe
+    Schnittstelle wie NewsProvider.fetch_dated_articles und kann im ExperimentController
+    an die Stelle der Live-Provider treten. Die Artikel behalten ihre ursprüngliche Quelle.
+    """
+    source_name = "Index"
+    search_stats = None
+
+    def __init__(self, news_index: NewsIndex):
+        self.news_index = news_index
+
+    def fetch_dated_articles(self, company_name: str, timeframe_days: int,
+                             as_of: datetime | None = None) -> list[dict]:
+        """Gibt die eingesammelten Artikel des Zeitrahmens vor 'as_of' (Standard: jetzt) zurück."""
+        start = timeframe_start(timeframe_days, as_of)
+        end = as_of if as_of is not None else datetime.now(timezone.utc)
+        covered = self.news_index.coverage(company_name)
+        if covered is None:
+            print(f"-> Warnung: Für '{company_name}' wurden noch keine Nachrichten eingesammelt.")
+        elif start < covered[0] or (as_of is not None and end > covered[1]):
+            print(f"-> Warnung: Der Index deckt '{company_name}' nur von {covered[0]:%Y-%m-%d %H:%M} "
+                  f"bis {covered[1]:%Y-%m-%d %H:%M} ab; Artikel außerhalb fehlen.")
+        with metrics.timer('news.index_query'):
+            articles = self.news_index.articles_for(company_name, start, end)
+        print(f"-> {len(articles)} Artikel für '{company_name}' aus dem Nachrichten-Index geladen.")
+        return articles
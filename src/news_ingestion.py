@@ -0,0 +1,114 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from .news_index import NewsIndex
+from .news_provider import NewsProvider
+from .metrics import metrics
+
+
+class NewsIngestor:
+    """
+    Sammelt fortlaufend neue Artikel aller Unternehmen in einen NewsIndex.
+
+    Jede Abfragerunde sucht pro Provider und Unternehmen nur im Zeitraum seit der
+    letzten erfolgreichen Abfrage (plus einer Überlappung) und lädt ausschließlich
+    Artikel herunter, die noch nicht im Index liegen. Bereits bekannte Artikel werden
+    nur mit dem Unternehmen verknüpft. Die Provider laufen parallel, die Unternehmen
+    eines Providers nacheinander, damit dessen Höflichkeitspause erhalten bleibt.
+    """
+
+    def __init__(self, news_index: NewsIndex, providers: list[NewsProvider], companies: list[str],
+                 poll_interval_minutes: float = 60, backfill_days: int = 14, overlap_hours: float = 24):
+        """
+        Args:
+            news_index (NewsIndex): Ziel der eingesammelten Artikel.
+            providers (list[NewsProvider]): Abzufragende Provider, z.B. Tagesschau, Spiegel und Handelsblatt.
+            companies (list[str]): Unternehmen, nach denen gesucht wird.
+            poll_interval_minutes (float): Abstand zwischen zwei Abfragerunden.
+            backfill_days (int): Zeitraum, der bei der ersten Abfrage eines Unternehmens eingesammelt wird.
+            overlap_hours (float): Zusätzlicher Zeitraum vor der letzten Abfrage, damit verspätet
+                                   indexierte Artikel der Suchdienste nicht verloren gehen.
+        """
+        self.news_index = news_index
+        self.providers = providers
+        self.companies = list(companies)
+        self.poll_interval_seconds = poll_interval_minutes * 60
+        self.backfill_days = backfill_days
+        self.overlap = timedelta(hours=overlap_hours)
+
+    def poll_once(self) -> dict:
+        """
+        Führt eine Abfragerunde über alle Provider und Unternehmen aus.
+
+        Returns:
+            dict: Anzahl neuer und bereits bekannter Artikel sowie fehlgeschlagener Abfragen.
+        """
+        now = datetime.now(timezone.utc)
+        with ThreadPoolExecutor(max_workers=max(1, len(self.providers))) as executor:
+            provider_stats = list(executor.map(lambda provider: self._poll_provider(provider, now), self.providers))
+        stats = {key: sum(stats[key] for stats in provider_stats) for key in ('new', 'known', 'errors')}
+        print(f"-> Abfragerunde abgeschlossen: {stats['new']} neue Artikel, {stats['known']} bereits bekannt, "
+              f"{stats['errors']} Fehler. Index enthält {len(self.news_index)} Artikel.")
+        return stats
+
+    def run(self, max_polls: int | None = None):
+        """
+        Fragt im Abstand von poll_interval_minutes ab, bis max_polls Runden erreicht
+        sind (None = unbegrenzt) oder der Prozess mit Strg+C beendet wird.
+        """
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                print(f"\n--- Abfragerunde {polls + 1} ({datetime.now():%Y-%m-%d %H:%M}) ---")
+                self.poll_once()
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(self.poll_interval_seconds)
+        except KeyboardInterrupt:
+            print("\nEinsammeln der Nachrichten beendet.")
+
+    def _poll_provider(self, provider: NewsProvider, now: datetime) -> dict:
+        stats = {'new': 0, 'known': 0, 'errors': 0}
+        for company in self.companies:
+            try:
+                new_count, known_count, search_complete = self._poll(provider, company, now)
+                stats['new'] += new_count
+                stats['known'] += known_count
+                if not search_complete:
+                    stats['errors'] += 1
+                    metrics.increment('ingest.errors')
+            except Exception as e:
+                stats['errors'] += 1
+                metrics.increment('ingest.errors')
+                print(f"Fehler bei {provider.__class__.__name__} für '{company}': {e}")
+        return stats
+
+    def _poll(self, provider: NewsProvider, company: str, now: datetime) -> tuple[int, int, bool]:
+        """
+        Sammelt die neuen Artikel eines Providers für ein Unternehmen ein. Der durchsuchte
+        Zeitraum wird nur vermerkt, wenn die Suche ohne Fehler abgeschlossen wurde.
+        """
+        covered = self.news_index.coverage(company, provider.source_name)
+        window_start = covered[1] - self.overlap if covered else now - timedelta(days=self.backfill_days)
+        # Die Provider suchen in ganzen Tagen
+        timeframe_days = max(1, math.ceil((now - window_start) / timedelta(days=1)))
+
+        with metrics.timer(f"ingest.poll.{provider.source_name}"):
+            found_articles, search_complete = provider.search_articles(company, timeframe_days)
+            known = self.news_index.known_identifiers(
+                provider.source_name, [article['identifier'] for article in found_articles])
+            self.news_index.tag_company(provider.source_name, list(known), company)
+            new_articles = provider.download_articles(
+                [article for article in found_articles if article['identifier'] not in known])
+            added = self.news_index.add_articles(company, new_articles)
+        metrics.increment('ingest.articles_new', added)
+        metrics.increment('ingest.articles_known', len(known))
+        print(f"-> {provider.source_name} / {company}: {added} neue, {len(known)} bekannte Artikel.")
+        if search_complete:
+            self.news_index.record_coverage(provider.source_name, company, now - timedelta(days=timeframe_days), now)
+        else:
+            # Der Zeitraum bleibt offen und wird in der nächsten Runde erneut durchsucht
+            print(f"-> Suche bei {provider.source_name} für '{company}' unvollständig; Zeitraum nicht als "
+                  f"eingesammelt vermerkt.")
+        return added, len(known), search_complete
@@ -1,102 +1,304 @@
 import requests
-from bs4 import BeautifulSoup
 import urllib.parse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
+from .article_cache import ArticleCache
+from .http_transport import HttpTransport
+from .text_extraction import TextExtractor
+from .metrics import metrics
 
 class NewsProvider(ABC):
     """
     Abstrakte Basisklasse, die eine einheitliche Schnittstelle für alle
     Nachrichten-Provider vorschreibt.
+
+    Unterklassen liefern nur die Suche (_get_article_identifiers) und die
+    Volltext-Extraktion (_extract_text_from_identifier); Zeitfilterung und
+    Zusammenführung übernimmt die Basisklasse.
     """
-    @abstractmethod
-    def fetch_and_extract_articles(self, company_name: str, timeframe_days: int) -> list[str]:
+    source_name = "News"
+    num_pages_to_fetch = 1
+    # Maximale Anzahl paralleler Artikel-Downloads und Mindestabstand zwischen zwei Downloads (Sekunden)
+    max_concurrent_downloads = 4
+    politeness_delay = 0.2
+
+    def __init__(self, article_cache: ArticleCache | None = None, transport: HttpTransport | None = None,
+                 text_extractor: TextExtractor | None = None):
+        """
+        Args:
+            article_cache (ArticleCache | None): Optionaler Cache, der vor jedem
+                Artikel-Download geprüft wird.
+            transport (HttpTransport | None): Gemeinsame HTTP-Schicht mit Connection-Pooling.
+                Ohne Angabe erhält der Provider eine eigene Instanz.
+            text_extractor (TextExtractor | None): Wandelt HTML in Text um. Ohne Angabe
+                wird das schnellste installierte Backend verwendet.
+        """
+        self.article_cache = article_cache
+        self.transport = transport if transport is not None else HttpTransport()
+        self.text_extractor = text_extractor if text_extractor is not None else TextExtractor()
+        self._politeness_lock = threading.Lock()
+        self._next_download_time = 0.0
+        self.search_stats = {'requests': 0, 'requests_saved': 0}
+        self._stats_lock = threading.Lock()
+
+    def fetch_and_extract_articles(self, company_name: str, timeframe_days: int,
+                                   as_of: datetime | None = None) -> list[str]:
         """Sucht nach Nachrichten und gibt eine Liste der Volltexte zurück,
            gefiltert nach dem angegebenen Zeitrahmen."""
+        return [article['text'] for article in self.fetch_dated_articles(company_name, timeframe_days, as_of)]
+
+    def fetch_dated_articles(self, company_name: str, timeframe_days: int,
+                             as_of: datetime | None = None) -> list[dict]:
+        """
+        Sucht nach Nachrichten und gibt die Volltexte zusammen mit ihrem
+        Veröffentlichungsdatum zurück. Das Ergebnis kann anschließend mit
+        filter_articles_by_timeframe für kürzere Zeiträume gefiltert werden,
+        ohne erneut Anfragen zu senden.
+
+        Args:
+            as_of (datetime | None): Simulierter Analysezeitpunkt. Der Zeitrahmen endet
+                                     dort; spätere Artikel werden verworfen. Standard ist jetzt.
+
+        Returns:
+            list[dict]: Dicts mit den Schlüsseln 'source', 'identifier', 'date' und 'text'.
+        """
+        print(f"Starte Prozess für {self.source_name} für '{company_name}'...")
+        filtered_articles, _ = self.search_articles(company_name, timeframe_days, as_of)
+        dated_articles = self.download_articles(filtered_articles)
+        print(f"-> Prozess für {self.source_name} abgeschlossen. {len(dated_articles)} Artikeltexte extrahiert.")
+        return dated_articles
+
+    def search_articles(self, company_name: str, timeframe_days: int,
+                        as_of: datetime | None = None) -> tuple[list[dict], bool]:
+        """
+        Sucht Artikel im Zeitrahmen, ohne ihre Volltexte zu laden.
+
+        Returns:
+            tuple: (Dicts mit 'identifier' und 'date' in der Reihenfolge der Suchergebnisse,
+                    False wenn eine Suchanfrage fehlgeschlagen ist und Treffer fehlen können)
+        """
+        cutoff = timeframe_start(timeframe_days, as_of)
+        with metrics.timer(f"news.search.{self.source_name}"):
+            articles_with_dates, search_complete = self._get_article_identifiers(
+                company_name, num_pages_to_fetch=self.num_pages_to_fetch, cutoff=cutoff)
+        if not search_complete:
+            metrics.increment(f"news.search_errors.{self.source_name}")
+        filtered_articles = filter_articles_by_timeframe(articles_with_dates, timeframe_days, as_of)
+        print(f"-> {len(filtered_articles)} {self.source_name}-Artikel im {timeframe_days}-Tage-Zeitraum gefunden.")
+        return filtered_articles, search_complete
+
+    def download_articles(self, found_articles: list[dict]) -> list[dict]:
+        """
+        Lädt die Volltexte der Suchergebnisse aus search_articles. Artikel ohne
+        extrahierbaren Text werden ausgelassen.
+
+        Returns:
+            list[dict]: Dicts mit den Schlüsseln 'source', 'identifier', 'date' und 'text'.
+        """
+        # executor.map liefert die Texte in der Reihenfolge der Suchergebnisse
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_downloads) as executor:
+            texts = list(executor.map(
+                lambda article: self._get_article_text(article['identifier'], article['date']),
+                found_articles
+            ))
+
+        dated_articles = []
+        for article, text in zip(found_articles, texts):
+            if text:
+                dated_articles.append({
+                    'source': self.source_name,
+                    'identifier': article['identifier'],
+                    'date': article['date'],
+                    'text': text
+                })
+        return dated_articles
+
+    def _get_article_text(self, identifier: str, article_date: datetime) -> str | None:
+        """Liefert den Volltext aus dem Artikel-Cache oder lädt ihn herunter und legt ihn dort ab."""
+        if self.article_cache is not None:
+            cached_text = self.article_cache.get(self.source_name, identifier)
+            if cached_text is not None:
+                metrics.increment(f"news.cache_hits.{self.source_name}")
+                return cached_text
+        self._wait_for_politeness_slot()
+        with metrics.timer(f"news.extract.{self.source_name}"):
+            text = self._extract_text_from_identifier(identifier)
+        metrics.increment(f"news.articles_downloaded.{self.source_name}")
+        if text and self.article_cache is not None:
+            self.article_cache.put(self.source_name, identifier, text, article_date)
+        return text
+
+    def _wait_for_politeness_slot(self):
+        """Hält den Mindestabstand zwischen zwei Artikel-Downloads dieses Providers ein."""
+        with self._politeness_lock:
+            now = time.monotonic()
+            wait_seconds = self._next_download_time - now
+            self._next_download_time = max(now, self._next_download_time) + self.politeness_delay
+        if wait_seconds > 0:
+            metrics.increment('news.politeness_sleep_seconds', wait_seconds)
+            time.sleep(wait_seconds)
+
+    def _record_search_requests(self, requests_made: int, max_requests: int):
+        """Zählt gesendete und gegenüber dem vollständigen Durchblättern eingesparte Suchanfragen."""
+        with self._stats_lock:
+            self.search_stats['requests'] += requests_made
+            self.search_stats['requests_saved'] += max_requests - requests_made
+        metrics.increment(f"news.search_requests.{self.source_name}", requests_made)
+
+    @abstractmethod
+    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int,
+                                 cutoff: datetime) -> tuple[list[dict], bool]:
+        """
+        Sucht Artikel und gibt Dicts mit 'identifier' und 'date' (datetime mit Zeitzone) zurück,
+        zusammen mit False, falls eine Suchanfrage fehlgeschlagen ist.
+        Artikel vor 'cutoff' werden später verworfen; Provider dürfen die Suche daher früher beenden.
+        """
         pass
 
-def is_within_timeframe(article_date: datetime, timeframe_days: int) -> bool:
-    start_date = datetime.now(timezone.utc) - timedelta(days=timeframe_days)
-    if article_date.tzinfo is None:
-        article_date = article_date.replace(tzinfo=timezone.utc)
+    @abstractmethod
+    def _extract_text_from_identifier(self, identifier: str) -> str | None:
+        """Lädt einen Artikel und gibt dessen bereinigten Volltext zurück."""
+        pass
+
+def as_of_datetime(end_date_str: str | None) -> datetime | None:
+    """Wandelt ein Enddatum 'YYYY-MM-DD' in den Analysezeitpunkt (Mitternacht UTC) um."""
+    if not end_date_str:
+        return None
+    return datetime.strptime(end_date_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def timeframe_start(timeframe_days: int, as_of: datetime | None = None) -> datetime:
+    """Gibt den frühesten Zeitpunkt (UTC) zurück, der vor 'as_of' (Standard: jetzt) noch im Zeitrahmen liegt."""
+    reference = _as_utc(as_of) if as_of is not None else datetime.now(timezone.utc)
+    return reference - timedelta(days=timeframe_days)
+
+def is_within_timeframe(article_date: datetime, timeframe_days: int, as_of: datetime | None = None) -> bool:
+    start_date = timeframe_start(timeframe_days, as_of)
+    article_date = _as_utc(article_date)
+    # Artikel nach dem simulierten Analysezeitpunkt waren damals noch nicht bekannt
+    if as_of is not None and article_date >= _as_utc(as_of):
+        return False
     return article_date >= start_date
 
+def filter_articles_by_timeframe(articles: list[dict], timeframe_days: int,
+                                 as_of: datetime | None = None) -> list[dict]:
+    """Behält nur Artikel, deren 'date' im Zeitrahmen vor 'as_of' (Standard: jetzt) liegt."""
+    return [article for article in articles if is_within_timeframe(article['date'], timeframe_days, as_of)]
+
 class TagesschauAPI(NewsProvider):
     """Holt Nachrichten über die offizielle Tagesschau Suche-API."""
-
-    def __init__(self):
+    source_name = "Tagesschau"
+    num_pages_to_fetch = 3
+    max_concurrent_downloads = 6
+    politeness_delay = 0.1
+    max_concurrent_searches = 4
+    page_size = 30
+
+    def __init__(self, article_cache: ArticleCache | None = None, transport: HttpTransport | None = None,
+                 text_extractor: TextExtractor | None = None):
+        super().__init__(article_cache, transport, text_extractor)
         self.base_url = "https://www.tagesschau.de/api2u/search/"
         self.search_keywords = [
             "Aktie", "Bilanz", "Quartalszahlen", "Geschäftszahlen",
             "Gewinnwarnung", "Ausblick", "Prognose", "Vorstand", "Übernahme"
         ]
+        self.search_stats['keyword_searches_skipped'] = 0
 
-    def fetch_and_extract_articles(self, company_name: str, timeframe_days: int) -> list[str]:
-        print(f"Starte Prozess für Tagesschau für '{company_name}'...")
-        articles_with_dates = self._get_article_identifiers(company_name, num_pages_to_fetch=3)
-
-        filtered_articles = []
-        for article in articles_with_dates:
-            try:
-                article_date = datetime.fromisoformat(article['date'])
-                if is_within_timeframe(article_date, timeframe_days):
-                    filtered_articles.append(article)
-            except (ValueError, TypeError):
-                continue
-
-        print(f"-> {len(filtered_articles)} Tagesschau-Artikel im {timeframe_days}-Tage-Zeitraum gefunden.")
-
-        all_full_texts = [self._extract_text_from_identifier(article['url']) for article in filtered_articles]
-        successful_texts = [text for text in all_full_texts if text]
-        print(f"-> Prozess für Tagesschau abgeschlossen. {len(successful_texts)} Artikeltexte extrahiert.")
-        return successful_texts
-
-    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int) -> list[dict]:
+    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int,
+                                 cutoff: datetime) -> tuple[list[dict], bool]:
         """
         Interne Logik: Führt mehrere präzise Suchen mit Keywords aus,
         um relevante Artikel-URLs und deren Daten zu finden.
+
+        Die Suchergebnisse sind nach Datum sortiert. Jede Suche blättert daher nur
+        so lange, bis eine Seite den Zeitrahmen verlässt. Hat die einfache Suche
+        nach dem Unternehmensnamen den Zeitrahmen vollständig abgedeckt, sind alle
+        Keyword-Suchen Teilmengen davon und werden übersprungen. Andernfalls
+        laufen die Keyword-Suchen parallel.
         """
-        all_articles = {}
-
-        search_terms = [f'"{company_name}"']
-        search_terms.extend([f'"{company_name}" "{keyword}"' for keyword in self.search_keywords])
-
-        for term in search_terms:
-            for page_num in range(1, num_pages_to_fetch + 1):
-                params = {'searchText': term, 'resultPage': page_num, 'pageSize': 30}
-                try:
-                    response = requests.get(self.base_url, params=params)
-                    response.raise_for_status()
-                    data = response.json()
-                    results = data.get('searchResults', [])
-                    if not results:
-                        break
-                    for article in results:
-                        if 'details' in article and 'date' in article:
-                            all_articles[article['details']] = {'url': article['details'], 'date': article['date']}
-                except Exception as e:
-                    print(f"-> Fehler bei Tagesschau-API-Anfrage für '{term}': {e}")
-                    break
+        base_term = f'"{company_name}"'
+        keyword_terms = [f'"{company_name}" "{keyword}"' for keyword in self.search_keywords]
+        max_requests = (1 + len(keyword_terms)) * num_pages_to_fetch
+
+        all_articles, requests_made, base_complete, search_failed = \
+            self._search_term(base_term, num_pages_to_fetch, cutoff)
+
+        if base_complete:
+            skipped_searches = len(keyword_terms)
+        else:
+            skipped_searches = 0
+            with ThreadPoolExecutor(max_workers=self.max_concurrent_searches) as executor:
+                keyword_results = list(executor.map(
+                    lambda term: self._search_term(term, num_pages_to_fetch, cutoff), keyword_terms))
+            for articles, term_requests, _, term_failed in keyword_results:
+                requests_made += term_requests
+                search_failed = search_failed or term_failed
+                for identifier, article in articles.items():
+                    all_articles.setdefault(identifier, article)
+
+        self._record_search_requests(requests_made, max_requests)
+        with self._stats_lock:
+            self.search_stats['keyword_searches_skipped'] += skipped_searches
+
+        print(f"-> {len(all_articles)} einzigartige, relevante Tagesschau-Artikel gefunden "
+              f"({requests_made} Suchanfragen, {max_requests - requests_made} eingespart).")
+        return list(all_articles.values()), not search_failed
+
+    def _search_term(self, term: str, num_pages_to_fetch: int, cutoff: datetime) -> tuple[dict, int, bool, bool]:
+        """
+        Blättert durch die Ergebnisse eines Suchbegriffs, bis der Zeitrahmen verlassen wird.
 
-        print(f"-> {len(all_articles)} einzigartige, relevante Tagesschau-Artikel gefunden.")
-        return list(all_articles.values())
+        Returns:
+            tuple: (Artikel nach URL, Anzahl gesendeter Anfragen, True wenn alle Treffer
+                    im Zeitrahmen erfasst wurden, True wenn eine Anfrage fehlgeschlagen ist)
+        """
+        articles = {}
+        requests_made = 0
+        for page_num in range(1, num_pages_to_fetch + 1):
+            params = {'searchText': term, 'resultPage': page_num, 'pageSize': self.page_size}
+            try:
+                requests_made += 1
+                response = self.transport.get(self.base_url, params=params)
+                response.raise_for_status()
+                data = response.json()
+                results = data.get('searchResults', [])
+                if not results:
+                    return articles, requests_made, True, False
+                oldest_date = None
+                for article in results:
+                    if 'details' in article and 'date' in article:
+                        try:
+                            article_date = datetime.fromisoformat(article['date'])
+                        except (ValueError, TypeError):
+                            continue
+                        if article_date.tzinfo is None:
+                            article_date = article_date.replace(tzinfo=timezone.utc)
+                        articles[article['details']] = {'identifier': article['details'], 'date': article_date}
+                        oldest_date = article_date if oldest_date is None else min(oldest_date, article_date)
+                if len(results) < self.page_size or (oldest_date is not None and oldest_date < cutoff):
+                    return articles, requests_made, True, False
+            except Exception as e:
+                print(f"-> Fehler bei Tagesschau-API-Anfrage für '{term}': {e}")
+                return articles, requests_made, False, True
+        return articles, requests_made, False, False
 
     def _extract_text_from_identifier(self, article_json_url: str) -> str | None:
         """
         Interne Logik: Ruft die JSON-Datei eines Artikels ab und extrahiert den Volltext.
         """
         try:
-            response = requests.get(article_json_url)
+            response = self.transport.get(article_json_url)
             response.raise_for_status()
             article_data = response.json()
             content_list = article_data.get('content', [])
-            text_parts = []
-            for block in content_list:
-                if block.get('type') == 'text':
-                    html_text = block.get('value', '')
-                    clean_text = BeautifulSoup(html_text, "html.parser").get_text(strip=True)
-                    text_parts.append(clean_text)
-            return "\n\n".join(text_parts)
+            html_blocks = [block.get('value', '') for block in content_list if block.get('type') == 'text']
+            # Alle Textblöcke eines Artikels werden in einem Durchgang geparst
+            return "\n\n".join(self.text_extractor.fragments_to_text(html_blocks))
         except (requests.exceptions.RequestException, ValueError) as e:
             print(f"-> Fehler beim Abrufen/Verarbeiten des Artikel-JSON von {article_json_url}: {e}")
             return None
@@ -104,8 +306,14 @@ class TagesschauAPI(NewsProvider):
 
 class SpiegelAPI(NewsProvider):
     """Holt Nachrichten über die interne Such-API von Spiegel Online und extrahiert den Volltext."""
-
-    def __init__(self):
+    source_name = "Spiegel Online"
+    num_pages_to_fetch = 5
+    max_concurrent_downloads = 3
+    politeness_delay = 0.3
+
+    def __init__(self, article_cache: ArticleCache | None = None, transport: HttpTransport | None = None,
+                 text_extractor: TextExtractor | None = None):
+        super().__init__(article_cache, transport, text_extractor)
         self.base_url = "https://www.spiegel.de/services/sitesearch/search?segments=spon&q={suchbegriff}&page={page_num}&page_size=10"
         self.article_text_selector = 'div[data-area="text"] p'
         self.headers = {
@@ -113,56 +321,55 @@ class SpiegelAPI(NewsProvider):
             'Accept': 'application/json'
         }
 
-    def fetch_and_extract_articles(self, company_name: str, timeframe_days: int) -> list[str]:
-        print(f"Starte Prozess für Spiegel Online für '{company_name}'...")
-        articles_with_dates = self._get_article_identifiers(company_name, num_pages_to_fetch=5)
-
-        filtered_articles = []
-        for article in articles_with_dates:
-            article_date = datetime.fromtimestamp(article['date'], tz=timezone.utc)
-            if is_within_timeframe(article_date, timeframe_days):
-                filtered_articles.append(article)
-
-        print(f"-> {len(filtered_articles)} Spiegel-Artikel im {timeframe_days}-Tage-Zeitraum gefunden.")
-
-        all_full_texts = [self._extract_text_from_identifier(article['url']) for article in filtered_articles]
-        successful_texts = [text for text in all_full_texts if text]
-        print(f"-> Prozess für Spiegel Online abgeschlossen. {len(successful_texts)} Artikeltexte extrahiert.")
-        return successful_texts
-
-    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int) -> list[dict]:
+    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int,
+                                 cutoff: datetime) -> tuple[list[dict], bool]:
+        """
+        Blättert durch die nach Datum sortierten Suchergebnisse und bricht ab,
+        sobald die folgenden Seiten nur noch Artikel vor 'cutoff' enthalten können.
+        """
         all_articles = []
+        pages_fetched = 0
+        search_failed = False
         for page_num in range(1, num_pages_to_fetch + 1):
             search_url = self.base_url.format(suchbegriff=urllib.parse.quote(company_name), page_num=page_num)
             try:
-                response = requests.get(search_url, headers=self.headers)
+                pages_fetched += 1
+                response = self.transport.get(search_url, headers=self.headers)
                 response.raise_for_status()
                 data = response.json()
                 results = data.get('results', [])
                 if not results:
                     break
+                page_dates = []
                 for article in results:
+                    if 'publish_date' not in article:
+                        continue
+                    article_date = datetime.fromtimestamp(article['publish_date'], tz=timezone.utc)
+                    page_dates.append(article_date)
                     is_free_article = article.get('access_level') == 'free'
-                    if is_free_article and 'url' in article and 'publish_date' in article:
-                        all_articles.append({'url': article['url'], 'date': article['publish_date']})
+                    if is_free_article and 'url' in article:
+                        all_articles.append({'identifier': article['url'], 'date': article_date})
+                # Ergebnisse sind nach Datum sortiert: reicht diese Seite bereits vor 'cutoff',
+                # enthalten alle folgenden Seiten nur noch ältere Artikel.
+                if page_dates and min(page_dates) < cutoff:
+                    break
             except Exception as e:
                 print(f"-> Fehler bei Spiegel-API-Anfrage (Seite {page_num}): {e}")
+                search_failed = True
                 break
-        print(f"-> {len(all_articles)} Spiegel-Artikel von {num_pages_to_fetch} Seiten abgerufen.")
-        return all_articles
+        self._record_search_requests(pages_fetched, num_pages_to_fetch)
+        print(f"-> {len(all_articles)} Spiegel-Artikel von {pages_fetched} Seiten abgerufen.")
+        return all_articles, not search_failed
 
     def _extract_text_from_identifier(self, article_url: str) -> str | None:
         """
         Interne Logik: Extrahiert den sauberen Volltext von einer gegebenen Artikel-URL.
         """
         try:
-            response = requests.get(article_url, headers=self.headers)
+            response = self.transport.get(article_url, headers=self.headers)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            text_paragraphs = soup.select(self.article_text_selector)
-            full_text = "\n\n".join([p.get_text(strip=True) for p in text_paragraphs])
-            return full_text
+            text_paragraphs = self.text_extractor.select_text(response.text, self.article_text_selector)
+            return "\n\n".join(text_paragraphs)
         except requests.exceptions.RequestException as e:
             print(f"-> Fehler beim Scrapen der URL {article_url}: {e}")
             return None
@@ -170,53 +377,60 @@ class SpiegelAPI(NewsProvider):
 
 class HandelsblattAPI(NewsProvider):
     """Holt Nachrichten über die interne Such-API von Handelsblatt und extrahiert den Volltext."""
-
-    def __init__(self):
+    source_name = "Handelsblatt"
+    num_pages_to_fetch = 5
+    max_concurrent_downloads = 3
+    politeness_delay = 0.3
+
+    def __init__(self, article_cache: ArticleCache | None = None, transport: HttpTransport | None = None,
+                 text_extractor: TextExtractor | None = None):
+        super().__init__(article_cache, transport, text_extractor)
         self.search_api_url = "https://content.www.handelsblatt.com/api/search/site/"
         self.content_api_url = "https://content.www.handelsblatt.com/api/content/eager/"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
 
-    def fetch_and_extract_articles(self, company_name: str, timeframe_days: int) -> list[str]:
-        print(f"Starte Prozess für Handelsblatt für '{company_name}'...")
-        articles_with_dates = self._get_article_identifiers(company_name, num_pages_to_fetch=5)
-
-        filtered_articles = []
-        for article in articles_with_dates:
-            article_date = datetime.fromisoformat(article['date'].replace('Z', '+00:00'))
-            if is_within_timeframe(article_date, timeframe_days):
-                filtered_articles.append(article)
-
-        print(f"-> {len(filtered_articles)} Handelsblatt-Artikel im {timeframe_days}-Tage-Zeitraum gefunden.")
-
-        all_full_texts = [self._extract_text_from_identifier(article['path']) for article in filtered_articles]
-        successful_texts = [text for text in all_full_texts if text]
-        print(f"-> Prozess für Handelsblatt abgeschlossen. {len(successful_texts)} Artikeltexte extrahiert.")
-        return successful_texts
-
-    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int) -> list[dict]:
+    def _get_article_identifiers(self, company_name: str, num_pages_to_fetch: int,
+                                 cutoff: datetime) -> tuple[list[dict], bool]:
+        """
+        Blättert durch die nach Datum sortierten Suchergebnisse und bricht ab,
+        sobald die folgenden Seiten nur noch Artikel vor 'cutoff' enthalten können.
+        """
         all_articles = []
+        pages_fetched = 0
+        search_failed = False
         for page_num in range(1, num_pages_to_fetch + 1):
             params = {'searchTerm': company_name, 'page': page_num}
             try:
-                response = requests.get(self.search_api_url, params=params, headers=self.headers)
+                pages_fetched += 1
+                response = self.transport.get(self.search_api_url, params=params, headers=self.headers)
                 response.raise_for_status()
                 data = response.json()
                 teasers = data.get('teasers', [])
                 if not teasers:
                     break
+                page_dates = []
                 for article in teasers:
+                    if 'dates' not in article or 'published' not in article['dates']:
+                        continue
+                    article_date = datetime.fromisoformat(article['dates']['published'].replace('Z', '+00:00'))
+                    page_dates.append(article_date)
                     is_free_article = article.get('contentAccessCategory') == 'NONE'
 
-                    if is_free_article and 'url' in article and 'href' in article[
-                        'url'] and 'dates' in article and 'published' in article['dates']:
-                        all_articles.append({'path': article['url']['href'], 'date': article['dates']['published']})
+                    if is_free_article and 'url' in article and 'href' in article['url']:
+                        all_articles.append({'identifier': article['url']['href'], 'date': article_date})
+                # Ergebnisse sind nach Datum sortiert: reicht diese Seite bereits vor 'cutoff',
+                # enthalten alle folgenden Seiten nur noch ältere Artikel.
+                if page_dates and min(page_dates) < cutoff:
+                    break
             except Exception as e:
                 print(f"-> Fehler bei Handelsblatt-API (Seite {page_num}): {e}")
+                search_failed = True
                 break
-        print(f"-> {len(all_articles)} Handelsblatt-Artikel von {num_pages_to_fetch} Seiten abgerufen.")
-        return all_articles
+        self._record_search_requests(pages_fetched, num_pages_to_fetch)
+        print(f"-> {len(all_articles)} Handelsblatt-Artikel von {pages_fetched} Seiten abgerufen.")
+        return all_articles, not search_failed
 
 
     def _extract_text_from_identifier(self, article_path: str) -> str | None:
@@ -226,7 +440,7 @@ class HandelsblattAPI(NewsProvider):
         """
         params = {'url': article_path}
         try:
-            response = requests.get(self.content_api_url, params=params, headers=self.headers)
+            response = self.transport.get(self.content_api_url, params=params, headers=self.headers)
             response.raise_for_status()
             data = response.json()
             text_parts = []
@@ -238,11 +452,9 @@ class HandelsblattAPI(NewsProvider):
                 text_parts.append(header['leadText'])
 
             elements = data.get('elements', [])
-            for element in elements:
-                if element.get('type') == 'paragraphStorylineElement':
-                    paragraph_text = element.get('data', {}).get('text', '')
-                    clean_text = BeautifulSoup(paragraph_text, "html.parser").get_text(strip=True)
-                    text_parts.append(clean_text)
+            paragraphs_html = [element.get('data', {}).get('text', '') for element in elements
+                               if element.get('type') == 'paragraphStorylineElement']
+            text_parts.extend(self.text_extractor.fragments_to_text(paragraphs_html))
 
             return "\n\n".join(text_parts)
         except (requests.exceptions.RequestException, ValueError) as e:
@@ -0,0 +1,255 @@
+import os
+import json
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import pandas as pd
+import yfinance as yf
+from .metrics import metrics
+
+try:
+    import pyarrow  # noqa: F401  (nur für die Parquet-Unterstützung von pandas)
+    _STORE_SUFFIX = '.parquet'
+except ImportError:
+    _STORE_SUFFIX = '.csv'
+
+
+class PriceSource(ABC):
+    """Abstrakte Datenquelle für Tageskurse (OHLCV) mehrerer Ticker."""
+
+    @abstractmethod
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, pd.DataFrame]:
+        """
+        Lädt die Kurse aller Ticker im Zeitraum [start, end) und gibt sie nach Ticker zurück.
+        Fehlt ein Ticker im Ergebnis, ist der Download fehlgeschlagen; ein leerer DataFrame
+        bedeutet, dass es im Zeitraum keine Kurse gibt (z.B. nur Feiertage).
+        """
+        pass
+
+
+class YFinancePriceSource(PriceSource):
+    """Lädt Kurse über yfinance mit einem einzigen Aufruf für alle Ticker."""
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, pd.DataFrame]:
+        print(f"Lade Kurse für {len(tickers)} Ticker gesammelt über yfinance: "
+              f"{start.strftime('%Y-%m-%d')} bis {end.strftime('%Y-%m-%d')}...")
+        data = yf.download(tickers, start=start, end=end, group_by='ticker', auto_adjust=True,
+                           actions=True, progress=False, threads=True)
+        histories = {}
+        if data.empty:
+            # yfinance meldet Netzwerkfehler nicht; ohne jede Zeile gilt der Download als fehlgeschlagen
+            return histories
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                history = data[ticker]
+            else:
+                history = data
+            histories[ticker] = history.dropna(how='all')
+        return histories
+
+
+class FixturePriceSource(PriceSource):
+    """
+    Offline-Datenquelle, die Kurse aus lokalen CSV-Dateien ('<Ticker>.csv' mit
+    Datumsspalte 'Date') liest, etwa für Tests ohne Netzwerk.
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = fixture_dir
+
+    def download(self, tickers: list[str], start: datetime, end: datetime) -> dict[str, pd.DataFrame]:
+        histories = {}
+        for ticker in tickers:
+            path = os.path.join(self.fixture_dir, f"{ticker}.csv")
+            if not os.path.exists(path):
+                continue
+            history = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+            histories[ticker] = history.loc[(history.index >= start) & (history.index < end)]
+        return histories
+
+
+class PriceStore:
+    """
+    Lokaler Kursspeicher mit einer Datei pro Ticker (Parquet, ohne pyarrow CSV).
+
+    Für jeden Ticker wird der bereits abgedeckte Zeitraum vermerkt. Anfragen
+    laden nur die noch fehlenden Tage nach, und zwar für alle betroffenen Ticker
+    in einem gemeinsamen Aufruf der Datenquelle. Danach werden Kurse aus dem
+    Arbeitsspeicher bedient.
+    """
+
+    def __init__(self, source: PriceSource | None = None, store_dir: str = 'cache/prices'):
+        """
+        Args:
+            source (PriceSource | None): Datenquelle für fehlende Kurse. Standard ist yfinance.
+            store_dir (str): Verzeichnis der Kursdateien. None hält die Kurse nur im Speicher.
+        """
+        self.source = source if source is not None else YFinancePriceSource()
+        self.store_dir = store_dir
+        if store_dir and not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+        self._histories: dict[str, pd.DataFrame] = {}
+        self._coverage: dict[str, tuple[datetime, datetime]] = {}
+        self._lock = threading.Lock()
+        # Ticker, deren Kurse gerade außerhalb der Sperre geladen werden
+        self._downloads_in_progress: dict[str, threading.Event] = {}
+        self._load_coverage()
+
+    def _coverage_path(self) -> str:
+        return os.path.join(self.store_dir, 'coverage.json')
+
+    def _history_path(self, ticker: str) -> str:
+        return os.path.join(self.store_dir, f"{ticker}{_STORE_SUFFIX}")
+
+    def _load_coverage(self):
+        if not self.store_dir or not os.path.exists(self._coverage_path()):
+            return
+        with open(self._coverage_path(), 'r', encoding='utf-8') as coverage_file:
+            for ticker, (start, end) in json.load(coverage_file).items():
+                if os.path.exists(self._history_path(ticker)):
+                    self._coverage[ticker] = (datetime.fromisoformat(start), datetime.fromisoformat(end))
+
+    def _save(self, tickers: list[str]):
+        if not self.store_dir:
+            return
+        for ticker in tickers:
+            history = self._histories[ticker]
+            if _STORE_SUFFIX == '.parquet':
+                history.to_parquet(self._history_path(ticker))
+            else:
+                history.to_csv(self._history_path(ticker))
+        coverage = {ticker: (start.isoformat(), end.isoformat()) for ticker, (start, end) in self._coverage.items()}
+        with open(self._coverage_path(), 'w', encoding='utf-8') as coverage_file:
+            json.dump(coverage, coverage_file, indent=2)
+
+    def _history(self, ticker: str) -> pd.DataFrame | None:
+        """Gibt die Kurshistorie aus dem Speicher zurück und lädt sie bei Bedarf von der Platte."""
+        if ticker not in self._histories and ticker in self._coverage:
+            if not self.store_dir or not os.path.exists(self._history_path(ticker)):
+                return None
+            path = self._history_path(ticker)
+            if _STORE_SUFFIX == '.parquet':
+                self._histories[ticker] = pd.read_parquet(path)
+            else:
+                self._histories[ticker] = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+        return self._histories.get(ticker)
+
+    def ensure(self, tickers: list[str], start: datetime, end: datetime):
+        """
+        Stellt sicher, dass für alle Ticker Kurse im Zeitraum [start, end) vorliegen.
+        Fehlende Abschnitte werden pro Abschnitt mit einem einzigen Aufruf für alle Ticker nachgeladen.
+        Der Download läuft ohne die Sperre des Speichers; nur Aufrufe für dieselben Ticker warten darauf.
+        """
+        while True:
+            with self._lock:
+                running_downloads = [self._downloads_in_progress[ticker] for ticker in tickers
+                                     if ticker in self._downloads_in_progress]
+                if not running_downloads:
+                    missing_ranges: dict[tuple[datetime, datetime], list[str]] = {}
+                    for ticker in tickers:
+                        for range_start, range_end in self._missing_ranges(ticker, start, end):
+                            if pd.bdate_range(range_start, range_end, inclusive='left').empty:
+                                # Nur Wochenenden: hier gibt es nie Kurse
+                                self._extend_coverage(ticker, range_start, range_end)
+                                continue
+                            missing_ranges.setdefault((range_start, range_end), []).append(ticker)
+                    if not missing_ranges:
+                        return
+                    finished = threading.Event()
+                    downloading_tickers = {ticker for range_tickers in missing_ranges.values()
+                                           for ticker in range_tickers}
+                    for ticker in downloading_tickers:
+                        self._downloads_in_progress[ticker] = finished
+                    break
+            for running_download in running_downloads:
+                running_download.wait()
+
+        try:
+            downloads = []
+            for (range_start, range_end), range_tickers in missing_ranges.items():
+                with metrics.timer('prices.download'):
+                    downloaded = self.source.download(range_tickers, range_start, range_end)
+                metrics.increment('prices.downloaded_tickers', len(range_tickers))
+                downloads.append((range_start, range_end, range_tickers, downloaded))
+
+            with self._lock:
+                updated_tickers = set()
+                for range_start, range_end, range_tickers, downloaded in downloads:
+                    for ticker in range_tickers:
+                        new_rows = downloaded.get(ticker)
+                        # Ohne Ergebnis (Fehler der Quelle) gilt der Abschnitt nicht als abgedeckt
+                        # und wird beim nächsten Aufruf erneut angefragt
+                        if new_rows is None:
+                            continue
+                        self._extend_coverage(ticker, range_start, range_end)
+                        # Ein erfolgreicher Download ohne Zeilen (z.B. nur Feiertage) ist abgedeckt
+                        if not new_rows.empty:
+                            self._merge(ticker, self._normalize(new_rows))
+                            updated_tickers.add(ticker)
+                self._save(sorted(updated_tickers))
+        finally:
+            with self._lock:
+                for ticker in downloading_tickers:
+                    del self._downloads_in_progress[ticker]
+            finished.set()
+
+    def _missing_ranges(self, ticker: str, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        if ticker not in self._coverage:
+            return [(start, end)]
+        covered_start, covered_end = self._coverage[ticker]
+        missing = []
+        # Lücken zwischen Anfrage und abgedecktem Zeitraum werden mitgeladen, damit dieser zusammenhängend bleibt
+        if start < covered_start:
+            missing.append((start, covered_start))
+        if end > covered_end:
+            missing.append((covered_end, end))
+        return missing
+
+    def _extend_coverage(self, ticker: str, start: datetime, end: datetime):
+        # Der laufende Handelstag ist noch nicht abgeschlossen und gilt daher nie als abgedeckt
+        end = min(end, datetime.combine(datetime.now().date(), datetime.min.time()))
+        if ticker in self._coverage:
+            covered_start, covered_end = self._coverage[ticker]
+            self._coverage[ticker] = (min(start, covered_start), max(end, covered_end))
+        else:
+            self._coverage[ticker] = (start, end)
+
+    @staticmethod
+    def _normalize(history: pd.DataFrame) -> pd.DataFrame:
+        """Vereinheitlicht den Index auf zeitzonenfreie Handelstage."""
+        history = history.copy()
+        index = pd.DatetimeIndex(history.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        history.index = index.normalize()
+        history.index.name = 'Date'
+        return history
+
+    def _merge(self, ticker: str, new_rows: pd.DataFrame):
+        existing = self._history(ticker)
+        if existing is None or existing.empty:
+            merged = new_rows
+        else:
+            merged = pd.concat([existing, new_rows])
+            merged = merged[~merged.index.duplicated(keep='last')]
+        self._histories[ticker] = merged.sort_index()
+
+    def get_history(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame | None:
+        """Gibt die Kurse im Zeitraum [start, end) zurück und lädt fehlende Tage bei Bedarf nach."""
+        self.ensure([ticker], start, end)
+        with self._lock:
+            history = self._history(ticker)
+            if history is None:
+                return None
+            return history.loc[(history.index >= start) & (history.index < end)].copy()
+
+
+def date_range_for(period_days: int, end_date_str: str | None) -> tuple[datetime, datetime]:
+    """Berechnet [start, end) für einen Zeitraum von period_days Tagen bis end_date_str (bzw. heute)."""
+    if end_date_str:
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+    else:
+        end_date = datetime.combine(datetime.now().date(), datetime.min.time())
+    return end_date - timedelta(days=period_days), end_date
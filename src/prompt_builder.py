@@ -0,0 +1,210 @@
+import hashlib
+import json
+import math
+import re
+from datetime import datetime, timezone
+import pandas as pd
+from .structured_output import response_instructions
+
+# Grobe Faustregel für deutsche und englische Texte
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Grobe Schätzung der Token-Anzahl (ca. 4 Zeichen pro Token)."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+class PromptBuilder:
+    """
+    Stellt den Prompt für eine Aktienprognose zusammen.
+
+    Statt alle Artikel aneinanderzuhängen und hart abzuschneiden, werden die
+    Artikel nach Relevanz für das Unternehmen sortiert (Nennungsdichte,
+    Aktualität, Finanz-Schlüsselwörter) und in ein Token-Budget gepackt. Die
+    Kurshistorie wird als kompakte Tabelle mit den benötigten Spalten ausgegeben.
+    """
+    relevance_keywords = [
+        "aktie", "kurs", "bilanz", "quartal", "umsatz", "gewinn", "verlust", "prognose",
+        "ausblick", "dividende", "vorstand", "übernahme", "gewinnwarnung", "analyst"
+    ]
+    # Gewichte der Relevanzmerkmale und Halbwertszeit der Aktualität in Tagen
+    mention_weight = 0.5
+    recency_weight = 0.3
+    keyword_weight = 0.2
+    recency_half_life_days = 3.0
+    # Ein gekürzter Artikel lohnt sich erst ab dieser Restgröße
+    min_truncated_tokens = 150
+
+    def __init__(self, news_token_budget: int = 6000, history_columns: tuple = ('Close', 'Volume')):
+        """
+        Args:
+            news_token_budget (int): Maximale geschätzte Token-Anzahl für alle Nachrichten zusammen.
+            history_columns (tuple): Spalten der Kurshistorie, die in den Prompt übernommen werden.
+        """
+        self.news_token_budget = news_token_budget
+        self.history_columns = history_columns
+
+    @staticmethod
+    def _as_article(article) -> dict:
+        """Akzeptiert reine Texte und datierte Artikel-Dicts ('text', optional 'date' und 'source')."""
+        if isinstance(article, dict):
+            return article
+        return {'text': article}
+
+    def score_article(self, company_name: str, article: dict, reference_date: datetime | None) -> float:
+        """Bewertet die Relevanz eines Artikels für das Unternehmen zwischen 0 und 1."""
+        text = article['text'].lower()
+        mentions = text.count(company_name.lower())
+        mentions_per_1000_chars = mentions / max(1.0, len(text) / 1000)
+        mention_score = min(1.0, mentions_per_1000_chars / 3)
+
+        keyword_hits = sum(1 for keyword in self.relevance_keywords if keyword in text)
+        keyword_score = min(1.0, keyword_hits / 4)
+
+        article_date = article.get('date')
+        if article_date is not None and reference_date is not None:
+            age_days = max(0.0, (reference_date - article_date).total_seconds() / 86400)
+            recency_score = math.pow(0.5, age_days / self.recency_half_life_days)
+        else:
+            recency_score = 0.5
+
+        return (self.mention_weight * mention_score + self.recency_weight * recency_score
+                + self.keyword_weight * keyword_score)
+
+    def rank_articles(self, company_name: str, news_articles: list) -> list[dict]:
+        """Sortiert die Artikel absteigend nach Relevanz; bei Gleichstand bleibt die Reihenfolge erhalten."""
+        articles = [self._as_article(article) for article in news_articles]
+        dates = [self._as_utc(article['date']) for article in articles if article.get('date') is not None]
+        # Aktualität relativ zum neuesten Artikel, damit historische Durchläufe gleich bewertet werden
+        reference_date = max(dates) if dates else None
+        scored = []
+        for article in articles:
+            if article.get('date') is not None:
+                article = dict(article, date=self._as_utc(article['date']))
+            scored.append((self.score_article(company_name, article, reference_date), article))
+        return [article for _, article in sorted(scored, key=lambda item: item[0], reverse=True)]
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+    def pack_articles(self, company_name: str, news_articles: list) -> tuple[list[str], int]:
+        """
+        Packt die relevantesten Artikel in das Token-Budget.
+
+        Passt ein Artikel nicht mehr vollständig hinein, wird er an einer Wortgrenze
+        gekürzt, sofern noch mindestens min_truncated_tokens frei sind.
+
+        Returns:
+            tuple: (formatierte Artikel, Anzahl ausgelassener oder gekürzter Artikel)
+        """
+        packed = []
+        remaining_tokens = self.news_token_budget
+        dropped = 0
+        for article in self.rank_articles(company_name, news_articles):
+            text = self._format_article(article)
+            tokens = estimate_tokens(text)
+            if tokens <= remaining_tokens:
+                packed.append(text)
+                remaining_tokens -= tokens
+                continue
+            dropped += 1
+            if remaining_tokens >= self.min_truncated_tokens:
+                cut = text[:remaining_tokens * CHARS_PER_TOKEN]
+                cut = cut[:cut.rfind(' ')] if ' ' in cut else cut
+                packed.append(cut + " [...]")
+                remaining_tokens = 0
+        return packed, dropped
+
+    @staticmethod
+    def _format_article(article: dict) -> str:
+        header = []
+        if article.get('source'):
+            header.append(article['source'])
+        if article.get('date') is not None:
+            header.append(article['date'].strftime('%Y-%m-%d'))
+        text = re.sub(r'\s+', ' ', article['text']).strip()
+        return f"[{', '.join(header)}] {text}" if header else text
+
+    def format_price_history(self, stock_history: pd.DataFrame) -> str:
+        """Gibt die Kurshistorie als kompakte ';'-getrennte Tabelle mit Datum und den gewählten Spalten aus."""
+        columns = [column for column in self.history_columns if column in stock_history.columns]
+        compact = stock_history[columns].copy()
+        if 'Volume' in compact.columns:
+            compact['Volume'] = compact['Volume'].round().astype('Int64')
+        compact = compact.round(2)
+        compact.index = pd.DatetimeIndex(compact.index).strftime('%Y-%m-%d')
+        compact.index.name = 'Date'
+        return compact.to_csv(sep=';').strip()
+
+    def fingerprint(self, structured: bool = False) -> str:
+        """
+        Kurze Kennung der Prompt-Vorlage und aller Einstellungen, die den Prompt verändern.
+
+        Die Vorlage wird über einen Beispiel-Prompt erfasst, damit auch geänderte
+        Formulierungen eine neue Kennung ergeben.
+        """
+        probe_article = {'source': 'Beispiel', 'date': datetime(2025, 1, 2, tzinfo=timezone.utc),
+                         'text': "Die Beispiel AG hebt den Ausblick an."}
+        probe_history = pd.DataFrame({'Close': [100.0], 'Volume': [1000]},
+                                     index=pd.DatetimeIndex(['2025-01-02'], name='Date'))
+        payload = json.dumps({
+            'prompt': self.build('Beispiel AG', [probe_article], probe_history, structured=structured),
+            'news_token_budget': self.news_token_budget,
+            'history_columns': list(self.history_columns),
+            'relevance_keywords': self.relevance_keywords,
+            'weights': [self.mention_weight, self.recency_weight, self.keyword_weight,
+                        self.recency_half_life_days, self.min_truncated_tokens],
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def build(self, company_name: str, news_articles: list, stock_history: pd.DataFrame,
+              structured: bool = False) -> str:
+        """
+        Erstellt den detaillierten Text-Prompt für die Gemini API.
+
+        Args:
+            structured (bool): Fordert die Analyse als JSON-Objekt nach dem Schema aus
+                               structured_output an statt als Freitext.
+        """
+        packed_articles, dropped = self.pack_articles(company_name, news_articles)
+        if dropped:
+            print(f"-> {dropped} von {len(news_articles)} Nachrichten für {company_name} "
+                  f"wurden gekürzt oder ausgelassen, um das Token-Budget einzuhalten.")
+        formatted_news = "\n\n---\n\n".join(packed_articles)
+        history_string = self.format_price_history(stock_history)
+        days_in_history = len(stock_history)
+        closing_instruction = response_instructions() if structured else \
+            "**Bitte gib deine vollständige Analyse jetzt aus.**"
+
+        prompt = f"""
+        **Analyse-Auftrag: Aktienkursprognose**
+
+        **Unternehmen:** {company_name}
+
+        **Analyse-Grundlage:**
+        Du erhältst im Folgenden aktuelle Nachrichtenartikel und die Aktienkursentwicklung der letzten {days_in_history} Handelstage für das oben genannte Unternehmen. Deine Aufgabe ist es, diese Informationen als Finanzexperte zu analysieren.
+
+        **Aufgaben:**
+        1.  **Stimmungsanalyse:** Analysiere die Tonalität und den Inhalt der Nachrichten. Sind sie überwiegend positiv, negativ oder neutral? Gibt es wichtige Ankündigungen (z.B. Quartalszahlen, neue Produkte, Rechtsstreitigkeiten)?
+        2.  **Kursanalyse:** Bewerte den bisherigen Kursverlauf. Gibt es einen klaren Trend?
+        3.  **Prognose:** Erstelle basierend auf deiner Analyse eine Prognose für den Aktienkurs für die **nächsten 5 Handelstage**.
+        4.  **Handlungsempfehlung:** Gib eine klare und prägnante Handlungsempfehlung ab. Entscheide dich zwingend für eine der beiden Optionen: **KAUFEN oder VERKAUFEN**.
+        5.  **Begründung:** Fasse die wichtigsten Gründe für deine Empfehlung in 2-3 Sätzen zusammen.
+
+        **Hier sind die Daten:**
+
+        **1. Aktuelle Nachrichtenartikel (nach Relevanz sortiert):**
+        ---
+        {formatted_news}
+        ---
+
+        **2. Aktienkursverlauf der letzten {days_in_history} Handelstage:**
+        ---
+        {history_string}
+        ---
+
+        {closing_instruction}
+        """
+        return prompt
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucketRateLimiter:
+    """
+    Rate Limiter nach dem Token-Bucket-Verfahren für Anfragen pro Minute (RPM)
+    und optional Tokens pro Minute (TPM).
+
+    Jeder Aufruf reserviert sofort seinen Anteil am Kontingent und erhält die
+    Wartezeit bis zu dem Zeitpunkt, an dem das Kontingent wieder ausreicht.
+    Dadurch werden wartende Aufrufer in Ankunftsreihenfolge bedient und das
+    Kontingent wird voll ausgeschöpft, statt nach jeder Anfrage pauschal zu warten.
+    Die synchrone und die asynchrone Variante teilen sich denselben Zustand.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float | None = None):
+        """
+        Args:
+            requests_per_minute (float): Erlaubte Anfragen pro Minute.
+            tokens_per_minute (float | None): Erlaubte Tokens pro Minute. None = unbegrenzt.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute) if tokens_per_minute else 0.0
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._available_requests = min(
+            float(self.requests_per_minute),
+            self._available_requests + elapsed * self.requests_per_minute / 60
+        )
+        if self.tokens_per_minute:
+            self._available_tokens = min(
+                float(self.tokens_per_minute),
+                self._available_tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    def _reserve(self, tokens: int) -> float:
+        """Zieht eine Anfrage und 'tokens' vom Kontingent ab und gibt die nötige Wartezeit zurück."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._available_requests -= 1
+            wait_seconds = max(0.0, -self._available_requests * 60 / self.requests_per_minute)
+            if self.tokens_per_minute:
+                self._available_tokens -= min(tokens, self.tokens_per_minute)
+                wait_seconds = max(wait_seconds, -self._available_tokens * 60 / self.tokens_per_minute)
+            return wait_seconds
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Blockiert, bis die Anfrage gesendet werden darf, und gibt die Wartezeit zurück."""
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Asynchrone Variante von acquire, die die Event-Loop nicht blockiert."""
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
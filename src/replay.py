@@ -0,0 +1,293 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import tempfile
+import requests
+import pandas as pd
+from .http_transport import HttpTransport
+from .price_store import PriceSource, PriceStore
+from .response_cache import ResponseCache
+from .metrics import metrics
+
+
+class FixtureStore:
+    """Legt aufgezeichnete Antworten als eine JSON-Datei pro Schlüssel in einem Verzeichnis ab."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> dict | None:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as fixture_file:
+            return json.load(fixture_file)
+
+    def save(self, key: str, entry: dict):
+        # Erst in eine temporäre Datei schreiben, damit parallele Leser nie eine halbe Datei sehen
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as fixture_file:
+            json.dump(entry, fixture_file, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self._path(key))
+
+
+class FaultInjector:
+    """
+    Künstliche Latenz und Fehler für die Wiedergabe.
+
+    Ob eine Anfrage fehlschlägt, hängt nur vom Schlüssel und der Anzahl bisheriger
+    Aufrufe mit diesem Schlüssel ab, nicht von der Reihenfolge paralleler Threads.
+    Läufe mit gleichem seed sind daher reproduzierbar.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, latency_jitter_seconds: float = 0.0, error_rate: float = 0.0,
+                 error_status_codes: tuple = (503, 429), seed: int = 0):
+        """
+        Args:
+            latency_seconds (float): Feste Wartezeit vor jeder Antwort.
+            latency_jitter_seconds (float): Zusätzliche, gleichverteilte Wartezeit zwischen 0 und diesem Wert.
+            error_rate (float): Anteil der Anfragen (0 bis 1), die mit einem Fehler beantwortet werden.
+            error_status_codes (tuple): Statuscodes, aus denen eingefügte Fehler gewählt werden.
+            seed (int): Startwert für Latenz und Fehlerauswahl.
+        """
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.error_rate = error_rate
+        self.error_status_codes = tuple(error_status_codes)
+        self.seed = seed
+        self.injected_errors = 0
+        self._call_counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next_call(self, key: str) -> tuple[float, int | None]:
+        """Gibt (Latenz in Sekunden, Fehlerstatus oder None) für den nächsten Aufruf mit diesem Schlüssel zurück."""
+        with self._lock:
+            call_number = self._call_counts.get(key, 0)
+            self._call_counts[key] = call_number + 1
+        rng = random.Random(f"{self.seed}:{key}:{call_number}")
+        latency = self.latency_seconds + rng.uniform(0, self.latency_jitter_seconds)
+        if self.error_status_codes and rng.random() < self.error_rate:
+            with self._lock:
+                self.injected_errors += 1
+            return latency, rng.choice(self.error_status_codes)
+        return latency, None
+
+
+def _request_key(url: str, params: dict | None) -> str:
+    return FixtureStore.make_key('GET', url, sorted((params or {}).items()))
+
+
+class RecordingTransport:
+    """Leitet Anfragen an eine echte HttpTransport weiter und zeichnet jede Antwort auf."""
+
+    def __init__(self, fixture_dir: str, transport: HttpTransport | None = None):
+        self.store = FixtureStore(fixture_dir)
+        self.transport = transport if transport is not None else HttpTransport()
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None,
+            timeout: float | tuple | None = None) -> requests.Response:
+        response = self.transport.get(url, params=params, headers=headers, timeout=timeout)
+        self.store.save(_request_key(url, params), {
+            'url': url,
+            'params': params,
+            'status_code': response.status_code,
+            'content_type': response.headers.get('Content-Type', ''),
+            'body': response.text,
+        })
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport:
+    """
+    Beantwortet Anfragen aus aufgezeichneten Antworten, ohne Netzwerkzugriff.
+    Anfragen ohne Aufzeichnung schlagen wie ein Verbindungsfehler fehl.
+
+    Eingefügte Fehler werden wie bei HttpTransport bis zu max_retries-mal
+    wiederholt; erst danach erhält der Aufrufer die Antwort mit dem Fehlerstatus.
+    """
+
+    def __init__(self, fixture_dir: str, fault_injector: FaultInjector | None = None, max_retries: int = 3):
+        self.store = FixtureStore(fixture_dir)
+        self.fault_injector = fault_injector if fault_injector is not None else FaultInjector()
+        self.max_retries = max_retries
+        self.replayed_requests = 0
+        self.missing_requests = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_response(url: str, status_code: int, body: str, content_type: str) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = status_code
+        response.headers['Content-Type'] = content_type
+        response.encoding = 'utf-8'
+        response._content = body.encode('utf-8')
+        return response
+
+    def get(self, url: str, params: dict | None = None, headers: dict | None = None,
+            timeout: float | tuple | None = None) -> requests.Response:
+        key = _request_key(url, params)
+        for attempt in range(self.max_retries + 1):
+            latency, error_status = self.fault_injector.next_call(key)
+            if latency > 0:
+                time.sleep(latency)
+            if attempt > 0:
+                metrics.increment('http.retries')
+            if error_status is None:
+                break
+        metrics.increment('http.requests')
+        if error_status is not None:
+            return self._build_response(url, error_status, '', 'text/plain')
+        entry = self.store.load(key)
+        if entry is None:
+            with self._lock:
+                self.missing_requests += 1
+            raise requests.exceptions.ConnectionError(f"Keine Aufzeichnung für {url} (params={params}).")
+        with self._lock:
+            self.replayed_requests += 1
+        metrics.increment('http.bytes', len(entry['body'].encode('utf-8')))
+        return self._build_response(url, entry['status_code'], entry['body'], entry['content_type'])
+
+    def close(self):
+        pass
+
+
+class RecordingPriceSource(PriceSource):
+    """
+    Lädt Kurse über eine andere Datenquelle und speichert sie als '<Ticker>.csv'
+    im Format von FixturePriceSource, bestehende Dateien werden ergänzt.
+    """
+
+    def __init__(self, fixture_dir: str, source: PriceSource):
+        self.fixture_dir = fixture_dir
+        self.source = source
+        self._lock = threading.Lock()
+        if not os.path.exists(fixture_dir):
+            os.makedirs(fixture_dir)
+
+    def download(self, tickers, start, end) -> dict[str, pd.DataFrame]:
+        histories = self.source.download(tickers, start, end)
+        with self._lock:
+            for ticker, history in histories.items():
+                path = os.path.join(self.fixture_dir, f"{ticker}.csv")
+                history = PriceStore._normalize(history)
+                if os.path.exists(path):
+                    existing = pd.read_csv(path, index_col='Date', parse_dates=['Date'])
+                    history = pd.concat([existing, history])
+                    history = history[~history.index.duplicated(keep='last')]
+                history.sort_index().to_csv(path)
+        return histories
+
+
+class _RecordedResponse:
+    """Minimaler Ersatz für die Antwort von generate_content; der AIClient liest nur .text."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class InjectedApiError(Exception):
+    """Künstlicher API-Fehler im Format der Gemini-Fehlermeldungen, z.B. '503 UNAVAILABLE'."""
+
+
+_API_ERROR_STATUS = {503: 'UNAVAILABLE', 429: 'RESOURCE_EXHAUSTED', 500: 'INTERNAL'}
+
+
+def _generation_key(model: str, contents, config) -> str:
+    return ResponseCache.make_key(model, str(contents), config)
+
+
+class _ReplayModels:
+    def __init__(self, owner, asynchronous: bool):
+        self._owner = owner
+        self._asynchronous = asynchronous
+
+    def generate_content(self, model: str, contents, config=None):
+        if self._asynchronous:
+            return self._owner._generate_async(model, contents, config)
+        return self._owner._generate(model, contents, config)
+
+
+class _AsyncNamespace:
+    def __init__(self, models):
+        self.models = models
+
+
+class RecordingGenAIClient:
+    """Umhüllt einen genai.Client und zeichnet die Antworten von generate_content auf."""
+
+    def __init__(self, fixture_dir: str, client):
+        self.store = FixtureStore(fixture_dir)
+        self.client = client
+        self.models = _ReplayModels(self, asynchronous=False)
+        self.aio = _AsyncNamespace(_ReplayModels(self, asynchronous=True))
+        # Batch-Jobs und Datei-Uploads laufen unverändert über den echten Client
+        self.files = client.files
+        self.batches = client.batches
+
+    def _save(self, model: str, contents, config, text: str):
+        self.store.save(_generation_key(model, contents, config), {'model': model, 'text': text})
+
+    def _generate(self, model: str, contents, config):
+        response = self.client.models.generate_content(model=model, contents=contents, config=config)
+        self._save(model, contents, config, response.text)
+        return response
+
+    async def _generate_async(self, model: str, contents, config):
+        response = await self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+        self._save(model, contents, config, response.text)
+        return response
+
+
+class ReplayGenAIClient:
+    """
+    Ersatz für genai.Client, der generate_content aus Aufzeichnungen beantwortet.
+    Eingefügte Fehler werden als 503/429-Fehler geworfen, die der AIClient wie
+    echte Überlastungen mit Backoff wiederholt.
+    """
+
+    def __init__(self, fixture_dir: str, fault_injector: FaultInjector | None = None):
+        self.store = FixtureStore(fixture_dir)
+        self.fault_injector = fault_injector if fault_injector is not None else FaultInjector()
+        self.models = _ReplayModels(self, asynchronous=False)
+        self.aio = _AsyncNamespace(_ReplayModels(self, asynchronous=True))
+
+    def _lookup(self, key: str, model: str, error_status: int | None):
+        if error_status is not None:
+            raise InjectedApiError(f"{error_status} {_API_ERROR_STATUS.get(error_status, 'UNAVAILABLE')}. "
+                                   f"Künstlich eingefügter Fehler.")
+        entry = self.store.load(key)
+        if entry is None:
+            raise LookupError(f"Keine aufgezeichnete Antwort für Modell '{model}' und diesen Prompt.")
+        return _RecordedResponse(entry['text'])
+
+    def _generate(self, model: str, contents, config):
+        key = _generation_key(model, contents, config)
+        latency, error_status = self.fault_injector.next_call(key)
+        if latency > 0:
+            time.sleep(latency)
+        return self._lookup(key, model, error_status)
+
+    async def _generate_async(self, model: str, contents, config):
+        key = _generation_key(model, contents, config)
+        latency, error_status = self.fault_injector.next_call(key)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return self._lookup(key, model, error_status)
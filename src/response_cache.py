@@ -0,0 +1,71 @@
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    Persistenter Zwischenspeicher für Antworten des Sprachmodells auf Basis von SQLite.
+
+    Der Schlüssel ist ein SHA-256-Hash über Modell, Prompt-Text und
+    Generierungseinstellungen. Identische Anfragen, etwa nach einem Absturz
+    oder bei einer erneuten Auswertung, werden so ohne API-Aufruf beantwortet.
+    """
+
+    def __init__(self, db_path: str = 'cache/responses.sqlite'):
+        """
+        Args:
+            db_path (str): Pfad zur SQLite-Datei. Das Verzeichnis wird bei Bedarf angelegt.
+        """
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model: str, prompt: str, generation_settings: dict | None = None) -> str:
+        """Bildet den Cache-Schlüssel aus Modell, Prompt und Generierungseinstellungen."""
+        payload = json.dumps(
+            {'model': model, 'prompt': prompt, 'settings': generation_settings or {}},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Gibt die gespeicherte Antwort zurück oder None."""
+        with self._lock:
+            row = self._connection.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        """Speichert eine Modellantwort."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at) VALUES (?, ?, ?, ?)",
+                (key, model, response, time.time())
+            )
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
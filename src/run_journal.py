@@ -0,0 +1,93 @@
+import os
+import json
+import threading
+import datetime
+
+
+class RunJournal:
+    """
+    Dauerhaftes Protokoll abgeschlossener Durchläufe als JSONL-Datei.
+
+    Jeder erfolgreich abgeschlossene Durchlauf wird sofort mit seiner Ergebniszeile
+    angehängt und per fsync gesichert. Ein Durchlauf ist über
+    (Enddatum, Unternehmen, Zeitraum, Modell, Konfiguration) eindeutig bestimmt, sodass ein
+    abgebrochenes Experiment beim Neustart nur die noch offenen Durchläufe ausführt.
+    Einträge einer anderen Konfiguration (z.B. nach einer Änderung des Prompts) werden
+    nicht übernommen.
+    """
+
+    def __init__(self, path: str = 'results/run_journal.jsonl', config_fingerprint: str = ''):
+        """
+        Args:
+            path (str): Pfad zur Journal-Datei. Existiert sie bereits, wird sie eingelesen.
+            config_fingerprint (str): Kennung der Prompt- und Modell-Einstellungen,
+                                      z.B. aus PromptBuilder.fingerprint.
+        """
+        self.config_fingerprint = config_fingerprint
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._lock = threading.Lock()
+        self._completed: dict[tuple, dict] = {}
+        self._other_config_entries = 0
+        if os.path.exists(path):
+            self._load()
+        print(f"Run-Journal '{path}' geladen: {len(self._completed)} abgeschlossene Durchläufe"
+              + (f", {self._other_config_entries} aus einer anderen Konfiguration ignoriert."
+                 if self._other_config_entries else "."))
+
+    @staticmethod
+    def make_key(end_date: str, company: str, timeframe: int, model: str, config_fingerprint: str = '') -> tuple:
+        return str(end_date), company, int(timeframe), model, config_fingerprint
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Eine beim Abbruch nur teilweise geschriebene letzte Zeile wird ignoriert
+                    continue
+                key = self.make_key(*entry['key'])
+                if key[-1] != self.config_fingerprint:
+                    self._other_config_entries += 1
+                    continue
+                self._completed[key] = entry['result']
+        # Eine abgebrochene letzte Zeile abschließen, damit neue Einträge in einer eigenen Zeile beginnen
+        with open(self.path, 'rb+') as journal_file:
+            journal_file.seek(0, os.SEEK_END)
+            if journal_file.tell() > 0:
+                journal_file.seek(-1, os.SEEK_END)
+                if journal_file.read(1) != b"\n":
+                    journal_file.write(b"\n")
+
+    def completed_result(self, end_date: str, company: str, timeframe: int, model: str) -> dict | None:
+        """Gibt die gespeicherte Ergebniszeile zurück, falls der Durchlauf bereits abgeschlossen ist."""
+        with self._lock:
+            return self._completed.get(self.make_key(end_date, company, timeframe, model, self.config_fingerprint))
+
+    def record_completed(self, end_date: str, company: str, timeframe: int, model: str, result: dict):
+        """Hängt einen abgeschlossenen Durchlauf an das Journal an und sichert die Datei."""
+        key = self.make_key(end_date, company, timeframe, model, self.config_fingerprint)
+        entry = {
+            'key': list(key),
+            'completed_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'result': result
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=self._to_json_value)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as journal_file:
+                journal_file.write(line + "\n")
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            self._completed[key] = json.loads(line)['result']
+
+    @staticmethod
+    def _to_json_value(value):
+        # numpy-Skalare (z.B. Kurse aus pandas) in Python-Werte umwandeln
+        if hasattr(value, 'item'):
+            return value.item()
+        return str(value)
@@ -0,0 +1,88 @@
+import re
+import json
+from typing import Literal
+from pydantic import BaseModel, Field, ValidationError
+
+# Ergebnisspalten, die nur im strukturierten Modus befüllt werden
+STRUCTURED_RESULT_COLUMNS = ['KI_Stimmung_Score', 'KI_Prognose_5_Tage_Prozent']
+
+
+class StockPrediction(BaseModel):
+    """Antwortschema der KI-Prognose im strukturierten Modus."""
+    handlungsempfehlung: Literal['KAUFEN', 'VERKAUFEN'] = Field(
+        description="Klare Handlungsempfehlung für die nächsten 5 Handelstage.")
+    stimmung: Literal['positiv', 'neutral', 'negativ'] = Field(
+        description="Überwiegende Tonalität der Nachrichten.")
+    stimmung_score: float = Field(ge=-1.0, le=1.0,
+                                  description="Stimmung von -1 (sehr negativ) bis 1 (sehr positiv).")
+    prognose_5_tage_prozent: float = Field(ge=-100.0, le=1000.0,
+                                           description="Erwartete Kursänderung in Prozent nach 5 Handelstagen.")
+    begruendung: str = Field(min_length=1, description="Die wichtigsten Gründe in 2-3 Sätzen.")
+
+
+def generation_config() -> dict:
+    """
+    Generierungseinstellungen für eine JSON-Antwort nach StockPrediction.
+    Als reines Dict auch in Batch-Anfragedateien und Cache-Schlüsseln verwendbar.
+    """
+    return {
+        'response_mime_type': 'application/json',
+        'response_json_schema': StockPrediction.model_json_schema(),
+    }
+
+
+def response_instructions() -> str:
+    """Anweisung an das Modell, die Analyse als JSON nach dem Schema auszugeben."""
+    fields = "\n".join(f"        - {name}: {field.description}"
+                       for name, field in StockPrediction.model_fields.items())
+    return ("**Antworte ausschließlich mit einem JSON-Objekt mit genau diesen Feldern:**\n" + fields)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Entfernt einen umschließenden Markdown-Codeblock (```json ... ```), falls vorhanden."""
+    match = re.fullmatch(r'\s*```(?:json)?\s*([\s\S]*?)\s*```\s*', text)
+    return match.group(1) if match else text
+
+
+def parse_prediction(text: str) -> StockPrediction:
+    """
+    Liest und validiert eine strukturierte Antwort.
+
+    Raises:
+        ValueError: Wenn der Text kein gültiges JSON nach StockPrediction ist
+                    (pydantic.ValidationError ist eine Unterklasse von ValueError).
+    """
+    return StockPrediction.model_validate_json(_strip_code_fence(text))
+
+
+def validation_error_message(error: ValueError) -> str:
+    """Kurze Fehlerbeschreibung für den Reparatur-Prompt."""
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, item['loc'])) or 'Antwort'}: {item['msg']}"
+                         for item in error.errors(include_url=False))
+    return str(error)
+
+
+def repair_prompt(malformed_response: str, error: ValueError) -> str:
+    """
+    Kurzer Prompt, der nur die fehlerhafte Antwort und den Validierungsfehler enthält,
+    nicht die Nachrichten. Die Reparatur kostet daher nur einen Bruchteil der ursprünglichen Anfrage.
+    """
+    return (
+        "Die folgende Antwort entspricht nicht dem geforderten JSON-Schema.\n"
+        f"Fehler: {validation_error_message(error)}\n\n"
+        f"Antwort:\n{malformed_response}\n\n"
+        "Gib dieselbe Analyse als gültiges JSON nach diesem Schema zurück, ohne weiteren Text:\n"
+        f"{json.dumps(StockPrediction.model_json_schema(), ensure_ascii=False)}"
+    )
+
+
+def to_result_columns(prediction: StockPrediction) -> dict:
+    """Überführt eine validierte Antwort in die Spalten der Ergebnisdatei."""
+    return {
+        'KI_Handlungsempfehlung': prediction.handlungsempfehlung,
+        'KI_Stimmungsanalyse': prediction.stimmung,
+        'KI_Begruendung': prediction.begruendung,
+        'KI_Stimmung_Score': prediction.stimmung_score,
+        'KI_Prognose_5_Tage_Prozent': prediction.prognose_5_tage_prozent,
+    }
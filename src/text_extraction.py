@@ -0,0 +1,198 @@
+import re
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from .metrics import metrics
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+# Trennzeichen zwischen HTML-Fragmenten, die gemeinsam geparst werden; bleibt in allen Parsern als Text erhalten
+_FRAGMENT_SEPARATOR = "␞"
+# Block-Elemente trennen Wörter auch ohne Leerraum im Quelltext; Inline-Elemente wie <a> oder <strong> nicht
+_BLOCK_TAGS = frozenset([
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure', 'footer',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section',
+    'table', 'td', 'th', 'tr', 'ul'
+])
+_BLOCK_TAG = re.compile(r'<(?=/?(?:' + '|'.join(sorted(_BLOCK_TAGS, reverse=True)) + r')\b)', re.IGNORECASE)
+# Reihenfolge der automatischen Auswahl: schnellstes installiertes Backend zuerst
+BACKEND_PREFERENCE = ['selectolax', 'lxml', 'html.parser']
+# Einfache Selektoren wie 'div[data-area="text"] p' oder 'article .RichText p'
+_SIMPLE_SELECTOR_PART = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?:\.(?P<cls>[\w-]+))?(?:#(?P<id>[\w-]+))?'
+    r'(?:\[(?P<attr>[\w-]+)(?:=["\']?(?P<value>[^"\'\]]*)["\']?)?\])?$'
+)
+
+
+def available_backends() -> list[str]:
+    """Gibt die installierten Backends in der Reihenfolge BACKEND_PREFERENCE zurück."""
+    installed = {'selectolax': HTMLParser is not None, 'lxml': lxml is not None, 'html.parser': True}
+    return [backend for backend in BACKEND_PREFERENCE if installed[backend]]
+
+
+def _normalize_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _separate_blocks(html: str) -> str:
+    """
+    Setzt ein Leerzeichen vor jedes öffnende und schließende Block-Tag. Die Textknoten
+    können danach ohne Trennzeichen verbunden werden, sodass '<a>Siemens</a>-Aktie'
+    zusammenhängend bleibt, Absätze und Zeilenumbrüche aber getrennt werden.
+    """
+    return _BLOCK_TAG.sub(' <', html)
+
+
+def _lxml_text(node) -> str:
+    """Wie "".join(node.itertext()), aber mit einem Leerzeichen um jedes Block-Element innerhalb des Knotens."""
+    parts = []
+    for event, element in lxml.etree.iterwalk(node, events=('start', 'end')):
+        # Kommentare und Verarbeitungsanweisungen haben keinen Tag-Namen; nur ihr Folgetext zählt
+        is_element = isinstance(element.tag, str)
+        is_block = is_element and element.tag.lower() in _BLOCK_TAGS
+        if event == 'start':
+            if is_block:
+                parts.append(' ')
+            if is_element and element.text:
+                parts.append(element.text)
+        else:
+            if is_block:
+                parts.append(' ')
+            if element is not node and element.tail:
+                parts.append(element.tail)
+    return "".join(parts)
+
+
+def _soup_text(node: Tag) -> str:
+    """Wie node.get_text(''), aber mit einem Leerzeichen um jedes Block-Element innerhalb des Knotens."""
+    parts = []
+    for child in node.children:
+        if isinstance(child, Tag):
+            if child.name in _BLOCK_TAGS:
+                parts.extend((' ', _soup_text(child), ' '))
+            else:
+                parts.append(_soup_text(child))
+        elif type(child) in (NavigableString, CData):
+            parts.append(str(child))
+    return "".join(parts)
+
+
+def _css_to_xpath(css_selector: str) -> str | None:
+    """
+    Übersetzt einfache CSS-Selektoren (Tag, Klasse, ID, ein Attribut, Nachfahren)
+    in XPath, falls cssselect nicht installiert ist. Gibt None für andere Selektoren zurück.
+    """
+    steps = []
+    for part in css_selector.split():
+        match = _SIMPLE_SELECTOR_PART.match(part)
+        if not match:
+            return None
+        conditions = []
+        if match.group('cls'):
+            conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {match.group('cls')} ')")
+        if match.group('id'):
+            conditions.append(f"@id='{match.group('id')}'")
+        if match.group('attr'):
+            value = match.group('value')
+            conditions.append(f"@{match.group('attr')}" if value is None else f"@{match.group('attr')}='{value}'")
+        step = match.group('tag') or '*'
+        if conditions:
+            step += "[" + " and ".join(conditions) + "]"
+        steps.append(step)
+    return "//" + "//".join(steps) if steps else None
+
+
+class TextExtractor:
+    """
+    Wandelt HTML in bereinigten Text um.
+
+    Unterstützte Backends sind 'selectolax', 'lxml' und 'html.parser' (reines
+    Python über BeautifulSoup). Ohne Angabe wird das schnellste installierte
+    Backend gewählt. Mehrere Fragmente eines Artikels werden in einem einzigen
+    Durchgang geparst statt einzeln. Alle Backends liefern denselben Text:
+    Textknoten werden ohne Trennzeichen verbunden, nur Block-Elemente (Absätze,
+    Zeilenumbrüche, Listen ...) und Fragmente werden durch Leerraum getrennt, der
+    anschließend zusammengefasst wird.
+    """
+
+    def __init__(self, backend: str | None = None):
+        """
+        Args:
+            backend (str | None): 'selectolax', 'lxml' oder 'html.parser'. None wählt automatisch.
+        """
+        installed = available_backends()
+        if backend is None:
+            backend = installed[0]
+        elif backend not in BACKEND_PREFERENCE:
+            raise ValueError(f"Unbekanntes Backend '{backend}'. Erlaubt sind: {', '.join(BACKEND_PREFERENCE)}.")
+        elif backend not in installed:
+            raise ImportError(f"Das Backend '{backend}' ist nicht installiert.")
+        self.backend = backend
+        self._xpath_cache: dict[str, str | None] = {}
+
+    def fragments_to_text(self, html_fragments: list[str]) -> list[str]:
+        """
+        Gibt den Text jedes HTML-Fragments zurück (z.B. Absätze aus einer JSON-API).
+        Alle Fragmente werden dafür gemeinsam geparst.
+        """
+        if not html_fragments:
+            return []
+        combined_html = _separate_blocks(_FRAGMENT_SEPARATOR.join(html_fragments))
+        if not combined_html.replace(_FRAGMENT_SEPARATOR, '').strip():
+            return ['' for _ in html_fragments]
+        with metrics.timer('html.extract'):
+            return self._fragments_to_text(combined_html)
+
+    def _fragments_to_text(self, combined_html: str) -> list[str]:
+        if self.backend == 'selectolax':
+            text = HTMLParser(combined_html).text(separator='')
+        elif self.backend == 'lxml':
+            text = "".join(lxml.html.document_fromstring(combined_html).itertext())
+        else:
+            text = BeautifulSoup(combined_html, 'html.parser').get_text('')
+        return [_normalize_whitespace(part) for part in text.split(_FRAGMENT_SEPARATOR)]
+
+    def select_text(self, html: str, css_selector: str) -> list[str]:
+        """
+        Gibt den Text aller Elemente einer Seite zurück, die auf den CSS-Selektor passen.
+        Block-Elemente werden nur innerhalb der ausgewählten Knoten getrennt, nicht auf der ganzen Seite.
+        """
+        with metrics.timer('html.extract'):
+            return self._select_text(html, css_selector)
+
+    def _select_text(self, html: str, css_selector: str) -> list[str]:
+        if self.backend == 'selectolax':
+            # Die ausgewählten Knoten sind klein; sie erneut zu parsen ist billiger als die ganze Seite zu ersetzen
+            return [_normalize_whitespace(HTMLParser(_separate_blocks(node.html)).text(separator=''))
+                    for node in HTMLParser(html).css(css_selector)]
+        if self.backend == 'lxml':
+            try:
+                nodes = self._lxml_select(lxml.html.document_fromstring(html), css_selector)
+            except (ValueError, lxml.etree.LxmlError):
+                # z.B. leere Seiten oder eine XML-Kodierungsangabe im Text; BeautifulSoup ist hier nachsichtiger
+                nodes = None
+            if nodes is not None:
+                return [_normalize_whitespace(_lxml_text(node)) for node in nodes]
+        soup = BeautifulSoup(html, 'lxml' if self.backend == 'lxml' else 'html.parser')
+        return [_normalize_whitespace(_soup_text(node)) for node in soup.select(css_selector)]
+
+    def _lxml_select(self, root, css_selector: str):
+        """Wählt Elemente per cssselect oder übersetztem XPath; None, wenn der Selektor nicht unterstützt wird."""
+        if CSSSelector is not None:
+            return CSSSelector(css_selector)(root)
+        if css_selector not in self._xpath_cache:
+            self._xpath_cache[css_selector] = _css_to_xpath(css_selector)
+        xpath = self._xpath_cache[css_selector]
+        return root.xpath(xpath) if xpath else None
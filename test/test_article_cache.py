@@ -0,0 +1,45 @@
+# test/test_article_cache.py
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.article_cache import ArticleCache
+
+
+def run_article_cache_test():
+    """Prüft Speichern, Ablauf (TTL) und größenbasierte Verdrängung des ArticleCache."""
+    print("--- Teste ArticleCache ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ArticleCache(os.path.join(tmp_dir, 'articles.sqlite'), ttl_days=1)
+        cache.put("Tagesschau", "https://example.org/a.json", "Volltext A", datetime(2025, 9, 22, tzinfo=timezone.utc))
+        text = cache.get("Tagesschau", "https://example.org/a.json")
+        print(f"-> Treffer: {'ERFOLG' if text == 'Volltext A' else 'FEHLER'}")
+        print(f"-> Anderer Provider ist getrennt: {'ERFOLG' if cache.get('Spiegel Online', 'https://example.org/a.json') is None else 'FEHLER'}")
+        changes_before = cache._connection.total_changes
+        cache.get("Tagesschau", "https://example.org/a.json")
+        print(f"-> Treffer ohne Schreibzugriff: {'ERFOLG' if cache._connection.total_changes == changes_before else 'FEHLER'}")
+        cache.put("Tagesschau", "https://example.org/a.json", "Längerer Volltext A")
+        cache.put("Tagesschau", "https://example.org/b.json", "Volltext B")
+        stored_size = cache._connection.execute("SELECT SUM(size) FROM articles").fetchone()[0]
+        print(f"-> Mitgeführte Größe nach Ersetzen: {'ERFOLG' if cache.size_bytes == stored_size else 'FEHLER'} "
+              f"({cache.size_bytes} Bytes)")
+        cache.close()
+
+        expired_cache = ArticleCache(os.path.join(tmp_dir, 'articles.sqlite'), ttl_days=0)
+        print(f"-> Abgelaufener Eintrag: {'ERFOLG' if expired_cache.get('Tagesschau', 'https://example.org/a.json') is None else 'FEHLER'}")
+        expired_cache.close()
+
+        small_cache = ArticleCache(os.path.join(tmp_dir, 'small.sqlite'), max_size_mb=0.001)
+        for i in range(5):
+            small_cache.put("Handelsblatt", f"/artikel/{i}", "x" * 400)
+        remaining = [i for i in range(5) if small_cache.get("Handelsblatt", f"/artikel/{i}") is not None]
+        print(f"-> Nach Verdrängung verbleibend: {remaining} {'ERFOLG' if remaining == [3, 4] else 'FEHLER'}")
+        small_cache.close()
+    print("--- ArticleCache Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_article_cache_test()
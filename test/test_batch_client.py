@@ -0,0 +1,42 @@
+# test/test_batch_client.py
+import sys
+import os
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.batch_client import LocalBatchBackend, write_batch_request_file, parse_batch_result_lines
+
+
+def run_batch_client_test():
+    """Prüft die JSONL-Anfragedatei, das lokale Batch-Backend und das Einlesen von Batch-Ergebnissen."""
+    print("--- Teste Batch-Client ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        request_file = os.path.join(tmp_dir, 'batch_requests.jsonl')
+        write_batch_request_file(request_file, {1: "Prompt für Siemens", 2: "Prompt für SAP"})
+
+        backend = LocalBatchBackend(lambda prompt: f"Antwort auf: {prompt}")
+        job_id = backend.submit(request_file, model="gemini-2.5-pro")
+        results = backend.wait_for_results(job_id)
+        expected = {'1': "Antwort auf: Prompt für Siemens", '2': "Antwort auf: Prompt für SAP"}
+        print(f"-> Lokales Backend: {'ERFOLG' if results == expected else 'FEHLER'} {results}")
+
+        # Wie beim Vergleich mehrerer Modelle: viele Batches werden gleichzeitig eingereicht
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            job_ids = list(executor.map(lambda _: backend.submit(request_file, model="gemini-2.5-pro"), range(64)))
+        print(f"-> Eindeutige Job-IDs bei gleichzeitigem Einreichen: "
+              f"{'ERFOLG' if len(set(job_ids)) == len(job_ids) else 'FEHLER'}")
+
+    result_lines = [
+        json.dumps({'key': '1', 'response': {'candidates': [{'content': {'parts': [{'text': 'KAUFEN'}]}}]}}),
+        json.dumps({'key': '2', 'error': {'code': 500, 'message': 'Interner Fehler'}})
+    ]
+    parsed = parse_batch_result_lines(result_lines)
+    print(f"-> Ergebniszeilen: {'ERFOLG' if parsed == {'1': 'KAUFEN'} else 'FEHLER'} {parsed}")
+    print("--- Batch-Client Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_batch_client_test()
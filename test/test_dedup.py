@@ -0,0 +1,29 @@
+# test/test_dedup.py
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.dedup import NearDuplicateFilter
+
+
+def run_dedup_test():
+    """Prüft, dass leicht abgewandelte Agenturmeldungen zusammengefasst und andere Artikel behalten werden."""
+    print("--- Teste NearDuplicateFilter ---\n")
+    agency_story = ("Der Technologiekonzern Siemens hat im dritten Quartal mehr umgesetzt als erwartet. "
+                    "Der Auftragseingang stieg deutlich, vor allem im Geschäft mit der Automatisierung. "
+                    "Vorstandschef Roland Busch bestätigte den Ausblick für das laufende Geschäftsjahr. ") * 3
+    articles = [
+        {'source': 'Tagesschau', 'text': agency_story},
+        {'source': 'Spiegel', 'text': "München (dpa) - " + agency_story + " Die Aktie legte leicht zu."},
+        {'source': 'Handelsblatt', 'text': "Die Allianz übernimmt einen Vermögensverwalter in den USA. "
+                                           "Der Kaufpreis liegt Insidern zufolge im Milliardenbereich. " * 3},
+    ]
+    kept, duplicates_removed = NearDuplicateFilter().deduplicate(articles)
+    print(f"-> Duplikate entfernt: {duplicates_removed}")
+    print(f"-> Längere Fassung behalten: {'ERFOLG' if [a['source'] for a in kept] == ['Spiegel', 'Handelsblatt'] else 'FEHLER'}")
+    print("--- NearDuplicateFilter Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_dedup_test()
@@ -0,0 +1,54 @@
+# test/test_evaluation.py
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.evaluation import evaluate, parse_analysis_dates
+from src.finance_provider import FinanceClient
+from src.price_store import PriceStore, FixturePriceSource
+
+
+def run_evaluation_test():
+    """Bewertet Beispielergebnisse gegen lokale Kurse mit steigendem (Siemens) und fallendem (SAP) Verlauf."""
+    print("--- Teste Auswertung ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trading_days = pd.bdate_range('2025-08-01', '2025-10-10', name='Date')
+        pd.DataFrame({'Close': 100.0 + np.arange(len(trading_days))}, index=trading_days).to_csv(
+            os.path.join(tmp_dir, 'SIE.DE.csv'))
+        pd.DataFrame({'Close': 200.0 - np.arange(len(trading_days))}, index=trading_days).to_csv(
+            os.path.join(tmp_dir, 'SAP.DE.csv'))
+        finance_client = FinanceClient(PriceStore(FixturePriceSource(tmp_dir), store_dir=None))
+
+        results = pd.DataFrame({
+            'Durchlauf_ID': [1, 2, 3, 4],
+            'Analyse_Datum': ['2025-09-15', '2025-09-15', '2025-09-16', '2025-09-16'],
+            'Unternehmen': ['Siemens', 'SAP', 'SAP', 'Siemens'],
+            'Branche': ['Industrie', 'Software', 'Software', 'Industrie'],
+            'Nachrichten_Zeitraum_Tage': [2, 2, 7, 7],
+            'KI_Handlungsempfehlung': ['KAUFEN', 'KAUFEN', 'VERKAUFEN', 'Nicht gefunden'],
+        })
+        evaluation = evaluate(results, finance_client)
+        rows = evaluation['zeilen']
+        print(rows[['Durchlauf_ID', 'Unternehmen', 'Kurs_Einstieg', 'Kurs_Ausstieg', 'Rendite_Strategie', 'Treffer']])
+        print(f"\n-> Treffer korrekt: {'ERFOLG' if rows['Treffer'].tolist()[:3] == [1.0, 0.0, 1.0] else 'FEHLER'}")
+        print(f"-> Ohne Empfehlung unbewertet: {'ERFOLG' if pd.isna(rows['Treffer'].iloc[3]) else 'FEHLER'}")
+        print(f"-> Trefferquote gesamt: {evaluation['gesamt']['Trefferquote'].iloc[0]:.2f}")
+        print(evaluation['nach_Branche'])
+
+        # Format der vorhandenen Ergebnisdateien, z.B. results/REAL_experiment_results_*.csv
+        german_results = results.assign(Analyse_Datum=['15.09.2025', '15.09.2025', '16.09.2025', '16.09.2025'])
+        german_rows = evaluate(german_results, finance_client)['zeilen']
+        same_rows = german_rows['Treffer'].equals(rows['Treffer'])
+        parsed = parse_analysis_dates(pd.Series(['01.10.2025', '2025-10-01']))
+        day_first = (parsed == pd.Timestamp('2025-10-01')).all()
+        print(f"-> Deutsches Datumsformat ohne Vertauschung von Tag und Monat: "
+              f"{'ERFOLG' if same_rows and day_first else 'FEHLER'} {parsed.dt.strftime('%Y-%m-%d').tolist()}")
+    print("--- Auswertung Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_evaluation_test()
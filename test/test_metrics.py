@@ -0,0 +1,61 @@
+# test/test_metrics.py
+import sys
+import os
+import json
+import time
+import pstats
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.metrics import Metrics, profiled
+
+
+def _worker_hot_path(value):
+    return sum(range(10000 + value))
+
+
+def run_metrics_test():
+    """Prüft Zeitmessungen, Zähler aus mehreren Threads und die JSON-Zusammenfassung."""
+    print("--- Teste Metrics ---\n")
+    metrics = Metrics()
+
+    for _ in range(3):
+        with metrics.timer('stufe.schlafen'):
+            time.sleep(0.01)
+    timer = metrics.snapshot()['timers']['stufe.schlafen']
+    timer_ok = timer['count'] == 3 and timer['total_seconds'] >= 0.03 and timer['max_seconds'] >= 0.01
+    print(f"-> Zeitmessung: {'ERFOLG' if timer_ok else 'FEHLER'} ({timer})")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: metrics.increment('anfragen'), range(1000)))
+    metrics.increment('bytes', 2048)
+    counters = metrics.snapshot()['counters']
+    print(f"-> Zähler threadsicher: {'ERFOLG' if counters['anfragen'] == 1000 else 'FEHLER'} ({counters})")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'lauf_metrics.json')
+        metrics.write_json(path, extra={'model': 'gemini-test'})
+        with open(path, encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+        json_ok = summary['model'] == 'gemini-test' and summary['counters']['bytes'] == 2048 \
+            and 'stufe.schlafen' in summary['timers']
+        print(f"-> JSON-Zusammenfassung: {'ERFOLG' if json_ok else 'FEHLER'}")
+
+        profile_path = os.path.join(tmp_dir, 'lauf.prof')
+        with profiled(profile_path, top=3):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(_worker_hot_path, range(4)))
+        profiled_functions = {function for _, _, function in pstats.Stats(profile_path).stats}
+        print(f"-> Profil mit Worker-Threads geschrieben: "
+              f"{'ERFOLG' if '_worker_hot_path' in profiled_functions else 'FEHLER'}")
+
+    metrics.reset()
+    snapshot = metrics.snapshot()
+    print(f"-> Zurücksetzen: {'ERFOLG' if not snapshot['timers'] and not snapshot['counters'] else 'FEHLER'}")
+    print("--- Metrics Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_metrics_test()
@@ -0,0 +1,131 @@
+# test/test_multi_model.py
+import sys
+import os
+import tempfile
+import threading
+import datetime
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.controller import ExperimentController
+from src.finance_provider import FinanceClient
+
+COMPANIES = {'Siemens': 'Industrie', 'SAP': 'Software'}
+TIMEFRAMES = [2, 7]
+END_DATE = '2025-09-23'
+
+
+class _CountingNewsProvider:
+    """Liefert feste Artikel und zählt die Abrufe."""
+    source_name = 'Test'
+    search_stats = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_dated_articles(self, company_name, timeframe_days, as_of):
+        self.calls += 1
+        return [{'source': self.source_name, 'identifier': f"{company_name}-{index}",
+                 'date': as_of - datetime.timedelta(hours=12 * index),
+                 'text': f"{company_name} meldet Neuigkeiten Nummer {index}. " * 20}
+                for index in range(6)]
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Models:
+    def __init__(self, model, barrier):
+        self.model = model
+        self.barrier = barrier
+        self.prompts = []
+
+    def generate_content(self, model, contents, config=None):
+        # Kommt nur weiter, wenn das andere Modell gleichzeitig angefragt wird
+        self.barrier.wait()
+        self.prompts.append(contents)
+        return _Response(f"Handlungsempfehlung: KAUFEN ({self.model})")
+
+
+class _GenAIClient:
+    def __init__(self, model, barrier):
+        self.models = _Models(model, barrier)
+
+
+def _write_prices(price_dir):
+    os.makedirs(price_dir, exist_ok=True)
+    dates = pd.bdate_range('2025-07-01', '2025-10-31', name='Date')
+    close = np.linspace(100, 110, len(dates))
+    for company in COMPANIES:
+        ticker = FinanceClient().ticker_map[company.lower()]
+        pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1_000_000},
+                     index=dates).to_csv(os.path.join(price_dir, f"{ticker}.csv"))
+
+
+def _controller(tmp_dir, models, barrier):
+    controller = ExperimentController(models, max_workers=1, article_cache_path=None, response_cache_path=None,
+                                      price_store_dir=None, journal_path=os.path.join(tmp_dir, 'journal.jsonl'),
+                                      gemini_requests_per_minute={'gemini-pro': 100, 'gemini-flash': 1000},
+                                      fixture_mode='replay', fixture_dir=tmp_dir)
+    controller.news_providers = [_CountingNewsProvider()]
+    for model, ai_client in controller.ai_clients.items():
+        ai_client.client = _GenAIClient(model, barrier)
+    return controller
+
+
+def run_multi_model_test():
+    """Prüft, dass mehrere Modelle dieselben Eingaben gleichzeitig erhalten und getrennt gespeichert werden."""
+    print("--- Teste Vergleich mehrerer Modelle ---\n")
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            _write_prices(os.path.join(tmp_dir, 'prices'))
+            controller = _controller(tmp_dir, ['gemini-pro', 'gemini-flash'], threading.Barrier(2, timeout=10))
+            controller.run_experiment_for(COMPANIES, TIMEFRAMES, END_DATE)
+
+            news_calls = controller.news_providers[0].calls
+            print(f"-> Nachrichten einmal je Unternehmen abgerufen: "
+                  f"{'ERFOLG' if news_calls == len(COMPANIES) else 'FEHLER'} ({news_calls} Abrufe)")
+            pro_prompts = controller.ai_clients['gemini-pro'].client.models.prompts
+            flash_prompts = controller.ai_clients['gemini-flash'].client.models.prompts
+            same_prompts = sorted(pro_prompts) == sorted(flash_prompts) and \
+                len(pro_prompts) == len(COMPANIES) * len(TIMEFRAMES)
+            print(f"-> Beide Modelle gleichzeitig mit denselben Prompts angefragt: "
+                  f"{'ERFOLG' if same_prompts else 'FEHLER'}")
+            limits = {model: ai_client.rate_limiter.requests_per_minute
+                      for model, ai_client in controller.ai_clients.items()}
+            print(f"-> Eigenes Rate-Limit je Modell: "
+                  f"{'ERFOLG' if limits == {'gemini-pro': 100, 'gemini-flash': 1000} else 'FEHLER'} {limits}")
+
+            results = controller.data_manager.results_df
+            rows_per_model = results.groupby('Modell', observed=True).size().to_dict()
+            answers_match = all(f"({model})" in text
+                                for model, text in zip(results['Modell'], results['KI_Prognose_Roh_Text']))
+            print(f"-> Eine Ergebniszeile je Durchlauf und Modell: "
+                  f"{'ERFOLG' if rows_per_model == {'gemini-flash': 4, 'gemini-pro': 4} and answers_match else 'FEHLER'}"
+                  f" {rows_per_model}")
+
+            # Ein weiteres Modell fragt nach einem Neustart nur dieses Modell an. Eigenes Arbeitsverzeichnis,
+            # da eine Ergebnisdatei mit demselben Zeitstempel sonst fortgeschrieben würde.
+            os.makedirs(os.path.join(tmp_dir, 'neustart'))
+            os.chdir(os.path.join(tmp_dir, 'neustart'))
+            extended =_controller(tmp_dir, ['gemini-pro', 'gemini-flash', 'gemini-lite'],
+                                   threading.Barrier(1, timeout=10))
+            extended.run_experiment_for(COMPANIES, TIMEFRAMES, END_DATE)
+            requested = {model: len(ai_client.client.models.prompts)
+                         for model, ai_client in extended.ai_clients.items()}
+            journal_ok = requested == {'gemini-pro': 0, 'gemini-flash': 0, 'gemini-lite': 4} and \
+                len(extended.data_manager.results_df) == 12
+            print(f"-> Neues Modell ergänzt, übrige aus dem Journal: {'ERFOLG' if journal_ok else 'FEHLER'} {requested}")
+        finally:
+            os.chdir(previous_dir)
+    print("--- Test Vergleich mehrerer Modelle beendet ---")
+
+
+if __name__ == "__main__":
+    run_multi_model_test()
@@ -0,0 +1,87 @@
+# test/test_news_index.py
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.news_index import NewsIndex, IndexedNewsProvider
+from src.news_ingestion import NewsIngestor
+from src.news_provider import NewsProvider, as_of_datetime
+
+
+class _FakeProvider(NewsProvider):
+    """Durchsucht eine feste Artikelliste und zählt die Downloads."""
+    source_name = "Testquelle"
+    politeness_delay = 0
+
+    def __init__(self, articles):
+        super().__init__()
+        self.articles = articles
+        self.downloads = []
+        # Unternehmen, deren Suche wie bei einem Ausfall der Such-API abbricht
+        self.failing_companies = set()
+
+    def _get_article_identifiers(self, company_name, num_pages_to_fetch, cutoff):
+        found = [{'identifier': identifier, 'date': date}
+                 for identifier, (companies, date, _) in self.articles.items() if company_name in companies]
+        if company_name in self.failing_companies:
+            return [], False
+        return found, True
+
+    def _extract_text_from_identifier(self, identifier):
+        self.downloads.append(identifier)
+        return self.articles[identifier][2]
+
+
+def run_news_index_test():
+    """Prüft das inkrementelle Einsammeln in den Index und die Abfrage für historische Enddaten."""
+    print("--- Teste NewsIndex ---\n")
+    now = datetime.now(timezone.utc)
+    articles = {
+        'a1': (['Siemens'], now - timedelta(days=1), "Siemens hebt die Quartalszahlen an."),
+        'a2': (['Siemens', 'SAP'], now - timedelta(days=3), "Siemens und SAP vereinbaren eine Kooperation."),
+        'a3': (['SAP'], now - timedelta(days=30), "SAP meldet einen alten Ausblick."),
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        news_index = NewsIndex(os.path.join(tmp_dir, 'news_index.sqlite'))
+        provider = _FakeProvider(articles)
+        ingestor = NewsIngestor(news_index, [provider], ['Siemens', 'SAP'], backfill_days=14)
+
+        stats = ingestor.poll_once()
+        first_ok = stats['new'] == 2 and sorted(provider.downloads) == ['a1', 'a2'] and len(news_index) == 2
+        print(f"-> Erste Runde lädt jeden Artikel einmal: {'ERFOLG' if first_ok else 'FEHLER'} {provider.downloads}")
+
+        articles['a4'] = (['SAP'], now, "SAP übernimmt ein Start-up.")
+        provider.downloads.clear()
+        stats = ingestor.poll_once()
+        second_ok = provider.downloads == ['a4'] and stats['new'] == 1
+        print(f"-> Folgerunde lädt nur neue Artikel: {'ERFOLG' if second_ok else 'FEHLER'} {provider.downloads}")
+
+        indexed = IndexedNewsProvider(news_index)
+        sap_articles = [article['identifier'] for article in indexed.fetch_dated_articles('SAP', 7)]
+        print(f"-> Gemeinsamer Artikel beiden Unternehmen zugeordnet: "
+              f"{'ERFOLG' if sorted(sap_articles) == ['a2', 'a4'] else 'FEHLER'} {sap_articles}")
+
+        as_of = as_of_datetime((now - timedelta(days=2)).strftime('%Y-%m-%d'))
+        historical = [article['identifier'] for article in indexed.fetch_dated_articles('Siemens', 7, as_of)]
+        print(f"-> Historisches Enddatum ohne spätere Artikel: "
+              f"{'ERFOLG' if historical == ['a2'] else 'FEHLER'} {historical}")
+
+        # Eine fehlgeschlagene Suche darf den Zeitraum nicht als eingesammelt vermerken
+        covered_before = news_index.coverage('Siemens', provider.source_name)
+        provider.failing_companies.add('Siemens')
+        stats = ingestor.poll_once()
+        failed_ok = stats['errors'] == 1 and news_index.coverage('Siemens', provider.source_name) == covered_before
+        print(f"-> Fehlgeschlagene Suche ohne Abdeckung: {'ERFOLG' if failed_ok else 'FEHLER'} {stats}")
+        provider.failing_companies.clear()
+
+        found = [article['identifier'] for article in news_index.search('Quartalszahlen')]
+        print(f"-> Volltextsuche: {'ERFOLG' if found == ['a1'] else 'FEHLER'} {found}")
+        news_index.close()
+    print("--- NewsIndex Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_news_index_test()
@@ -0,0 +1,117 @@
+# test/test_price_store.py
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.price_store import PriceStore, FixturePriceSource
+
+
+class CountingPriceSource(FixturePriceSource):
+    """Zählt die Aufrufe der Datenquelle, um gesammelte und eingesparte Downloads zu prüfen."""
+
+    def __init__(self, fixture_dir: str):
+        super().__init__(fixture_dir)
+        self.calls = []
+
+    def download(self, tickers, start, end):
+        self.calls.append(list(tickers))
+        return super().download(tickers, start, end)
+
+
+class FailingPriceSource(CountingPriceSource):
+    """Liefert wie bei einem vorübergehenden yfinance-Fehler für keinen Ticker ein Ergebnis."""
+
+    def download(self, tickers, start, end):
+        self.calls.append(list(tickers))
+        return {}
+
+
+class EmptyPriceSource(CountingPriceSource):
+    """Lädt erfolgreich, findet im Zeitraum aber keine Kurse (z.B. nur Feiertage)."""
+
+    def download(self, tickers, start, end):
+        self.calls.append(list(tickers))
+        return {ticker: pd.DataFrame() for ticker in tickers}
+
+
+class BlockingPriceSource(CountingPriceSource):
+    """Hält den Download von 'SIE.DE' an, bis 'release' gesetzt wird."""
+
+    def __init__(self, fixture_dir: str):
+        super().__init__(fixture_dir)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def download(self, tickers, start, end):
+        if 'SIE.DE' in tickers:
+            self.started.set()
+            self.release.wait(timeout=10)
+        return super().download(tickers, start, end)
+
+
+def run_price_store_test():
+    """Prüft den gesammelten Download, das Nachladen fehlender Tage und das Wiederverwenden gespeicherter Kurse."""
+    print("--- Teste PriceStore ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trading_days = pd.bdate_range('2025-07-01', '2025-09-30', name='Date')
+        for ticker in ['SIE.DE', 'SAP.DE']:
+            pd.DataFrame({'Close': range(len(trading_days))}, index=trading_days).to_csv(
+                os.path.join(tmp_dir, f"{ticker}.csv"))
+
+        store_dir = os.path.join(tmp_dir, 'store')
+        source = CountingPriceSource(tmp_dir)
+        store = PriceStore(source=source, store_dir=store_dir)
+        store.ensure(['SIE.DE', 'SAP.DE'], datetime(2025, 8, 1), datetime(2025, 9, 1))
+        print(f"-> Ein Aufruf für beide Ticker: {'ERFOLG' if source.calls == [['SIE.DE', 'SAP.DE']] else 'FEHLER'}")
+
+        history = store.get_history('SIE.DE', datetime(2025, 8, 1), datetime(2025, 9, 15))
+        print(f"-> Nur fehlende Tage nachgeladen: {'ERFOLG' if source.calls[-1] == ['SIE.DE'] and len(source.calls) == 2 else 'FEHLER'}")
+        print(f"-> Zeitraum vollständig: {'ERFOLG' if history.index[-1] == pd.Timestamp('2025-09-12') else 'FEHLER'}")
+
+        reopened_source = CountingPriceSource(tmp_dir)
+        reopened = PriceStore(source=reopened_source, store_dir=store_dir)
+        history = reopened.get_history('SAP.DE', datetime(2025, 8, 10), datetime(2025, 8, 20))
+        print(f"-> Gespeicherte Kurse ohne Download genutzt: {'ERFOLG' if not reopened_source.calls and len(history) == 7 else 'FEHLER'}")
+
+        for failing_store_dir in (os.path.join(tmp_dir, 'failing_store'), None):
+            failing_source = FailingPriceSource(tmp_dir)
+            failing_store = PriceStore(source=failing_source, store_dir=failing_store_dir)
+            history = failing_store.get_history('SIE.DE', datetime(2025, 8, 1), datetime(2025, 9, 1))
+            failing_store.get_history('SIE.DE', datetime(2025, 8, 1), datetime(2025, 9, 1))
+            retried = history is None and len(failing_source.calls) == 2
+            print(f"-> Fehlgeschlagener Download nicht als abgedeckt vermerkt "
+                  f"(store_dir={failing_store_dir is not None}): {'ERFOLG' if retried else 'FEHLER'}")
+
+        # 24.-26.12.2025 sind Feiertage, 27./28.12. ein Wochenende
+        empty_source = EmptyPriceSource(tmp_dir)
+        empty_store = PriceStore(source=empty_source, store_dir=None)
+        for _ in range(2):
+            empty_store.get_history('SIE.DE', datetime(2025, 12, 24), datetime(2025, 12, 27))
+        print(f"-> Zeitraum ohne Handelstage nur einmal angefragt: "
+              f"{'ERFOLG' if len(empty_source.calls) == 1 else 'FEHLER'} ({len(empty_source.calls)} Aufrufe)")
+        weekend_source = EmptyPriceSource(tmp_dir)
+        PriceStore(source=weekend_source, store_dir=None).ensure(['SIE.DE'], datetime(2025, 12, 27),
+                                                                 datetime(2025, 12, 29))
+        print(f"-> Wochenende ohne Download: {'ERFOLG' if not weekend_source.calls else 'FEHLER'}")
+
+        blocking_source = BlockingPriceSource(tmp_dir)
+        blocking_store = PriceStore(source=blocking_source, store_dir=None)
+        blocked = threading.Thread(target=blocking_store.get_history,
+                                   args=('SIE.DE', datetime(2025, 8, 1), datetime(2025, 9, 1)))
+        blocked.start()
+        blocking_source.started.wait(timeout=10)
+        other_history = blocking_store.get_history('SAP.DE', datetime(2025, 8, 1), datetime(2025, 9, 1))
+        not_blocked = blocked.is_alive() and other_history is not None
+        blocking_source.release.set()
+        blocked.join()
+        print(f"-> Anderer Ticker wartet nicht auf laufenden Download: {'ERFOLG' if not_blocked else 'FEHLER'}")
+    print("--- PriceStore Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_price_store_test()
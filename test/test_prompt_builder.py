@@ -0,0 +1,40 @@
+# test/test_prompt_builder.py
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.prompt_builder import PromptBuilder, estimate_tokens
+
+
+def run_prompt_builder_test():
+    """Prüft Relevanz-Sortierung, Token-Budget und kompakte Kurstabelle des PromptBuilders."""
+    print("--- Teste PromptBuilder ---\n")
+    now = datetime(2025, 9, 22, tzinfo=timezone.utc)
+    articles = [
+        {'source': 'Tagesschau', 'date': now - timedelta(days=6), 'text': "Das Wetter in Berlin bleibt sonnig. " * 150},
+        {'source': 'Handelsblatt', 'date': now, 'text': "Siemens hebt den Ausblick an, die Aktie steigt. " * 60},
+    ]
+    builder = PromptBuilder(news_token_budget=1000)
+
+    ranked = builder.rank_articles('Siemens', articles)
+    print(f"-> Relevantester Artikel zuerst: {'ERFOLG' if ranked[0]['source'] == 'Handelsblatt' else 'FEHLER'}")
+
+    packed, dropped = builder.pack_articles('Siemens', articles)
+    packed_tokens = sum(estimate_tokens(text) for text in packed)
+    print(f"-> Token-Budget eingehalten ({packed_tokens} <= 1000): {'ERFOLG' if packed_tokens <= 1000 else 'FEHLER'}")
+    print(f"-> Weniger relevanter Artikel gekürzt: {'ERFOLG' if dropped == 1 else 'FEHLER'}")
+
+    trading_days = pd.bdate_range('2025-09-15', '2025-09-19')
+    history = pd.DataFrame({'Open': 100.0, 'High': 102.0, 'Low': 99.0, 'Close': [100.123, 101.0, 102.5, 101.2, 103.0],
+                            'Volume': 1500000.0, 'Dividends': 0.0}, index=trading_days)
+    table = builder.format_price_history(history)
+    print(table)
+    print(f"-> Nur benötigte Spalten: {'ERFOLG' if table.splitlines()[0] == 'Date;Close;Volume' else 'FEHLER'}")
+    print("--- PromptBuilder Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_prompt_builder_test()
@@ -0,0 +1,37 @@
+# test/test_rate_limiter.py
+import sys
+import os
+import time
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rate_limiter import TokenBucketRateLimiter
+
+
+def run_rate_limiter_test():
+    """Prüft, dass der Token-Bucket Bursts bis zum Kontingent erlaubt und danach drosselt."""
+    print("--- Teste TokenBucketRateLimiter ---\n")
+    limiter = TokenBucketRateLimiter(requests_per_minute=600)
+
+    start = time.monotonic()
+    for _ in range(600):
+        limiter.acquire()
+    burst_duration = time.monotonic() - start
+    print(f"-> 600 Anfragen im Burst: {burst_duration:.2f}s {'ERFOLG' if burst_duration < 0.1 else 'FEHLER'}")
+
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    throttled_duration = time.monotonic() - start
+    print(f"-> 5 weitere Anfragen (10/s): {throttled_duration:.2f}s {'ERFOLG' if 0.4 < throttled_duration < 0.7 else 'FEHLER'}")
+
+    token_limiter = TokenBucketRateLimiter(requests_per_minute=1000, tokens_per_minute=6000)
+    token_limiter.acquire(tokens=6000)
+    wait_seconds = asyncio.run(token_limiter.acquire_async(tokens=50))
+    print(f"-> TPM-Wartezeit für 50 Tokens: {wait_seconds:.2f}s {'ERFOLG' if 0.4 < wait_seconds < 0.6 else 'FEHLER'}")
+    print("--- TokenBucketRateLimiter Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_rate_limiter_test()
@@ -0,0 +1,92 @@
+# test/test_replay.py
+import sys
+import os
+import json
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.replay import FaultInjector, RecordingTransport, ReplayTransport, RecordingGenAIClient, ReplayGenAIClient
+from src.ai_client import AIClient
+from src.controller import ExperimentController
+
+
+class _FakeResponse:
+    status_code = 200
+    headers = {'Content-Type': 'application/json'}
+
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeTransport:
+    """Steht für die echte HttpTransport und beantwortet jede Anfrage mit einem festen JSON."""
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        return _FakeResponse(json.dumps({'url': url, 'page': (params or {}).get('page')}))
+
+    def close(self):
+        pass
+
+
+class _FakeModels:
+    def generate_content(self, model, contents, config=None):
+        return _FakeResponse("Handlungsempfehlung: KAUFEN")
+
+
+class _FakeGenAIClient:
+    models = _FakeModels()
+    files = None
+    batches = None
+
+
+def run_replay_test():
+    """Zeichnet HTTP- und Gemini-Antworten auf und spielt sie mit künstlichen Fehlern wieder ab."""
+    print("--- Teste Record/Replay ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        recorder = RecordingTransport(os.path.join(tmp_dir, 'http'), _FakeTransport())
+        recorder.get('https://example.org/suche', params={'page': 1})
+
+        replay = ReplayTransport(os.path.join(tmp_dir, 'http'))
+        response = replay.get('https://example.org/suche', params={'page': 1})
+        print(f"-> Aufzeichnung abgespielt: {'ERFOLG' if response.json()['page'] == 1 else 'FEHLER'}")
+        try:
+            replay.get('https://example.org/suche', params={'page': 2})
+            print("-> Fehlende Aufzeichnung erkannt: FEHLER")
+        except Exception as e:
+            print(f"-> Fehlende Aufzeichnung erkannt: ERFOLG ({e.__class__.__name__})")
+
+        always_failing = ReplayTransport(os.path.join(tmp_dir, 'http'),
+                                         FaultInjector(error_rate=1.0, error_status_codes=(503,)), max_retries=2)
+        response = always_failing.get('https://example.org/suche', params={'page': 1})
+        print(f"-> Eingefügter 503 nach Wiederholungen: {'ERFOLG' if response.status_code == 503 else 'FEHLER'} "
+              f"({always_failing.fault_injector.injected_errors} Fehler eingefügt)")
+
+        gemini_dir = os.path.join(tmp_dir, 'gemini')
+        recording_client = AIClient(model='gemini-test', requests_per_minute=1000,
+                                    client=RecordingGenAIClient(gemini_dir, _FakeGenAIClient()))
+        recorded = recording_client.get_prediction('Siemens', ["Siemens hebt den Ausblick an."], _history())
+
+        flaky_client = AIClient(model='gemini-test', requests_per_minute=1000, backoff_base_seconds=0.01,
+                                client=ReplayGenAIClient(gemini_dir, FaultInjector(error_rate=0.5, seed=1)))
+        replayed = flaky_client.get_prediction('Siemens', ["Siemens hebt den Ausblick an."], _history())
+        print(f"-> Gemini-Antwort trotz 503/429 abgespielt: {'ERFOLG' if replayed == recorded else 'FEHLER'}")
+
+        # Mit den Standard-Caches würden Treffer nie aufgezeichnet bzw. Fixtures in die echten Caches gelangen
+        controller = ExperimentController('gemini-test', fixture_mode='replay', fixture_dir=tmp_dir,
+                                          journal_path=None, news_token_budget=1500)
+        caches_off = controller.article_cache is None and controller.response_cache is None and \
+            controller.finance.price_store.store_dir is None
+        print(f"-> Caches im Fixture-Modus abgeschaltet: {'ERFOLG' if caches_off else 'FEHLER'}")
+        budget = controller.ai_client.prompt_builder.news_token_budget
+        print(f"-> Token-Budget an den PromptBuilder übergeben: {'ERFOLG' if budget == 1500 else 'FEHLER'} ({budget})")
+    print("--- Record/Replay Test beendet ---")
+
+
+def _history():
+    return pd.DataFrame({'Close': [100.0, 101.5]}, index=pd.bdate_range('2025-09-18', periods=2))
+
+
+if __name__ == "__main__":
+    run_replay_test()
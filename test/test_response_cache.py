@@ -0,0 +1,30 @@
+# test/test_response_cache.py
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.response_cache import ResponseCache
+
+
+def run_response_cache_test():
+    """Prüft, dass Antworten nur bei identischem Modell, Prompt und Einstellungen wiederverwendet werden."""
+    print("--- Teste ResponseCache ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResponseCache(os.path.join(tmp_dir, 'responses.sqlite'))
+        key = ResponseCache.make_key("gemini-2.5-pro", "Prompt A")
+        cache.put(key, "gemini-2.5-pro", "Handlungsempfehlung: KAUFEN")
+
+        print(f"-> Gleicher Schlüssel: {'ERFOLG' if cache.get(key) == 'Handlungsempfehlung: KAUFEN' else 'FEHLER'}")
+        other_model = ResponseCache.make_key("gemini-2.5-flash", "Prompt A")
+        print(f"-> Anderes Modell: {'ERFOLG' if cache.get(other_model) is None else 'FEHLER'}")
+        other_settings = ResponseCache.make_key("gemini-2.5-pro", "Prompt A", {'temperature': 0.2})
+        print(f"-> Andere Einstellungen: {'ERFOLG' if cache.get(other_settings) is None else 'FEHLER'}")
+        print(f"-> Zähler: {cache.hits} Treffer, {cache.misses} Fehlschläge")
+        cache.close()
+    print("--- ResponseCache Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_response_cache_test()
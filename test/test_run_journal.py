@@ -0,0 +1,56 @@
+# test/test_run_journal.py
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.run_journal import RunJournal
+from src.prompt_builder import PromptBuilder
+
+
+def run_run_journal_test():
+    """Prüft, dass abgeschlossene Durchläufe einen Neustart überdauern und unvollständige Zeilen ignoriert werden."""
+    print("--- Teste RunJournal ---\n")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        journal_path = os.path.join(tmp_dir, 'run_journal.jsonl')
+        journal = RunJournal(journal_path)
+        journal.record_completed('2025-09-23', 'Siemens', 7, 'gemini-2.5-pro',
+                                 {'Durchlauf_ID': 5, 'KI_Handlungsempfehlung': 'KAUFEN'})
+
+        # Simuliert einen Abbruch mitten im Schreiben der nächsten Zeile
+        with open(journal_path, 'a', encoding='utf-8') as journal_file:
+            journal_file.write('{"key": ["2025-09-23", "SAP", 2')
+
+        restarted = RunJournal(journal_path)
+        result = restarted.completed_result('2025-09-23', 'Siemens', 7, 'gemini-2.5-pro')
+        print(f"-> Abgeschlossener Durchlauf gefunden: {'ERFOLG' if result and result['KI_Handlungsempfehlung'] == 'KAUFEN' else 'FEHLER'}")
+        other_model = restarted.completed_result('2025-09-23', 'Siemens', 7, 'gemini-2.5-flash')
+        print(f"-> Anderes Modell gilt als offen: {'ERFOLG' if other_model is None else 'FEHLER'}")
+        partial = restarted.completed_result('2025-09-23', 'SAP', 2, 'gemini-2.5-pro')
+        print(f"-> Unvollständige Zeile ignoriert: {'ERFOLG' if partial is None else 'FEHLER'}")
+
+        restarted.record_completed('2025-09-23', 'SAP', 2, 'gemini-2.5-pro', {'Durchlauf_ID': 1})
+        reloaded = RunJournal(journal_path)
+        appended = reloaded.completed_result('2025-09-23', 'SAP', 2, 'gemini-2.5-pro')
+        print(f"-> Neuer Eintrag nach Abbruch lesbar: {'ERFOLG' if appended is not None else 'FEHLER'}")
+
+        # Nach einer Änderung des Prompts gelten alle Durchläufe wieder als offen
+        fingerprint = PromptBuilder().fingerprint()
+        changed_fingerprints = {PromptBuilder(news_token_budget=3000).fingerprint(),
+                                PromptBuilder().fingerprint(structured=True)}
+        fingerprint_ok = fingerprint == PromptBuilder().fingerprint() and fingerprint not in changed_fingerprints
+        print(f"-> Kennung ändert sich mit Budget und Modus: {'ERFOLG' if fingerprint_ok else 'FEHLER'}")
+        configured = RunJournal(journal_path, config_fingerprint=fingerprint)
+        configured.record_completed('2025-09-23', 'Siemens', 7, 'gemini-2.5-pro', {'Durchlauf_ID': 5})
+        reused = RunJournal(journal_path, config_fingerprint=fingerprint)
+        changed = RunJournal(journal_path, config_fingerprint=changed_fingerprints.pop())
+        config_ok = configured.completed_result('2025-09-23', 'SAP', 2, 'gemini-2.5-pro') is None and \
+            reused.completed_result('2025-09-23', 'Siemens', 7, 'gemini-2.5-pro') is not None and \
+            changed.completed_result('2025-09-23', 'Siemens', 7, 'gemini-2.5-pro') is None
+        print(f"-> Einträge anderer Konfigurationen ignoriert: {'ERFOLG' if config_ok else 'FEHLER'}")
+    print("--- RunJournal Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_run_journal_test()
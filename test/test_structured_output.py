@@ -0,0 +1,123 @@
+# test/test_structured_output.py
+import sys
+import os
+import json
+import asyncio
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ai_client import AIClient
+from src.batch_client import LocalBatchBackend
+from src.structured_output import parse_prediction, to_result_columns
+
+VALID_RESPONSE = json.dumps({
+    'handlungsempfehlung': 'KAUFEN', 'stimmung': 'positiv', 'stimmung_score': 0.6,
+    'prognose_5_tage_prozent': 2.5, 'begruendung': "Starke Quartalszahlen und ein angehobener Ausblick."
+})
+# Freitext statt JSON, wie ihn das Modell gelegentlich trotz Schema liefert
+MALFORMED_RESPONSE = "Handlungsempfehlung: KAUFEN. Die Stimmung ist positiv."
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _ScriptedModels:
+    """Gibt die vorgegebenen Antworten der Reihe nach zurück und merkt sich die Prompts."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    def generate_content(self, model, contents, config=None):
+        self.prompts.append(contents)
+        return _Response(self.responses.pop(0))
+
+
+class _AsyncScriptedModels(_ScriptedModels):
+    async def generate_content(self, model, contents, config=None):
+        return _ScriptedModels.generate_content(self, model, contents, config)
+
+
+class _AsyncNamespace:
+    def __init__(self, models):
+        self.models = models
+
+
+class _ScriptedClient:
+    def __init__(self, responses):
+        self.models = _ScriptedModels(responses)
+        self.aio = _AsyncNamespace(_AsyncScriptedModels(responses))
+
+
+def _history():
+    return pd.DataFrame({'Close': [100.0, 101.5]}, index=pd.bdate_range('2025-09-18', periods=2))
+
+
+def run_structured_output_test():
+    """Prüft Schema-Validierung, Reparatur-Anfrage und die Übernahme in Ergebnisspalten."""
+    print("--- Teste strukturierte Prognosen ---\n")
+    articles = ["Siemens hebt den Ausblick an. " * 50]
+
+    fenced = parse_prediction(f"```json\n{VALID_RESPONSE}\n```")
+    columns = to_result_columns(fenced)
+    columns_ok = columns['KI_Handlungsempfehlung'] == 'KAUFEN' and columns['KI_Stimmung_Score'] == 0.6
+    print(f"-> JSON-Antwort in Ergebnisspalten: {'ERFOLG' if columns_ok else 'FEHLER'} {columns}")
+
+    client = _ScriptedClient([VALID_RESPONSE])
+    ai_client = AIClient(model='gemini-test', requests_per_minute=1000, client=client, structured_output=True)
+    result = ai_client.get_prediction('Siemens', articles, _history())
+    schema_requested = 'stimmung_score' in client.models.prompts[0] and \
+        ai_client.generation_config['response_mime_type'] == 'application/json'
+    print(f"-> Gültige Antwort ohne Reparatur: "
+          f"{'ERFOLG' if result == VALID_RESPONSE and schema_requested else 'FEHLER'}")
+
+    client = _ScriptedClient([MALFORMED_RESPONSE, VALID_RESPONSE])
+    ai_client = AIClient(model='gemini-test', requests_per_minute=1000, client=client, structured_output=True)
+    result = ai_client.get_prediction('Siemens', articles, _history())
+    repair_prompt = client.models.prompts[1]
+    repair_is_cheap = len(repair_prompt) < len(client.models.prompts[0]) and MALFORMED_RESPONSE in repair_prompt
+    print(f"-> Eine kurze Reparatur-Anfrage: "
+          f"{'ERFOLG' if result == VALID_RESPONSE and repair_is_cheap else 'FEHLER'} "
+          f"({len(repair_prompt)} statt {len(client.models.prompts[0])} Zeichen)")
+
+    client = _ScriptedClient([MALFORMED_RESPONSE, MALFORMED_RESPONSE])
+    ai_client = AIClient(model='gemini-test', requests_per_minute=1000, client=client, structured_output=True)
+    result = ai_client.get_prediction('Siemens', articles, _history())
+    print(f"-> Nach erfolgloser Reparatur als Fehler markiert: "
+          f"{'ERFOLG' if AIClient.is_error_response(result) and not client.models.responses else 'FEHLER'}")
+
+    client = _ScriptedClient([MALFORMED_RESPONSE, VALID_RESPONSE])
+    ai_client = AIClient(model='gemini-test', requests_per_minute=1000, client=client, structured_output=True)
+    result = asyncio.run(ai_client.get_prediction_async('Siemens', articles, _history()))
+    print(f"-> Reparatur auch asynchron: "
+          f"{'ERFOLG' if result == VALID_RESPONSE and len(client.aio.models.prompts) == 2 else 'FEHLER'}")
+
+    # Blockierte Anfragen liefern eine Antwort ohne Text
+    for structured_output in (True, False):
+        client = _ScriptedClient([None])
+        ai_client = AIClient(model='gemini-test', requests_per_minute=1000, client=client,
+                             structured_output=structured_output)
+        result = ai_client.get_prediction('Siemens', articles, _history())
+        print(f"-> Antwort ohne Text als Fehler (strukturiert={structured_output}): "
+              f"{'ERFOLG' if AIClient.is_error_response(result) and len(client.models.prompts) == 1 else 'FEHLER'}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        request_file = os.path.join(tmp_dir, 'batch_requests.jsonl')
+        ai_client = AIClient(model='gemini-test', requests_per_minute=1000, client=_ScriptedClient([]),
+                             structured_output=True)
+        predictions = ai_client.get_predictions_batch({1: ('Siemens', articles, _history())}, request_file,
+                                                      LocalBatchBackend(lambda prompt: VALID_RESPONSE))
+        with open(request_file, encoding='utf-8') as batch_file:
+            request = json.loads(batch_file.readline())['request']
+        config_ok = 'response_json_schema' in request.get('generation_config', {})
+        batch_ok = config_ok and predictions[1] == VALID_RESPONSE
+        print(f"-> Schema in der Batch-Anfrage: {'ERFOLG' if batch_ok else 'FEHLER'}")
+    print("--- Test strukturierte Prognosen beendet ---")
+
+
+if __name__ == "__main__":
+    run_structured_output_test()
@@ -0,0 +1,53 @@
+# test/test_text_extraction.py
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.text_extraction import TextExtractor, available_backends
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'html')
+INLINE_EXPECTED = [
+    "Die Siemens-Aktie stieg um 7%, der DAX legte zu.",
+    "Erste Zeile zweite Zeile",
+    "Direkt folgender Absatz mit FettKursiv.",
+]
+
+
+def run_text_extraction_test():
+    """Prüft, dass alle installierten Backends auf den gespeicherten Artikeln denselben Text liefern."""
+    print("--- Teste TextExtractor ---\n")
+    with open(os.path.join(FIXTURE_DIR, 'spiegel_article.html'), encoding='utf-8') as fixture_file:
+        spiegel_html = fixture_file.read()
+    with open(os.path.join(FIXTURE_DIR, 'tagesschau_article.json'), encoding='utf-8') as fixture_file:
+        tagesschau_blocks = [block['value'] for block in json.load(fixture_file)['content'] if block['type'] == 'text']
+    with open(os.path.join(FIXTURE_DIR, 'inline_markup.html'), encoding='utf-8') as fixture_file:
+        inline_html = fixture_file.read()
+
+    print(f"Installierte Backends: {available_backends()}")
+    outputs = {}
+    inline_ok = True
+    for backend in available_backends():
+        extractor = TextExtractor(backend)
+        outputs[backend] = (extractor.fragments_to_text(tagesschau_blocks),
+                            extractor.select_text(spiegel_html, 'div[data-area="text"] p'))
+        inline_paragraphs = extractor.select_text(inline_html, 'div[data-area="text"] p')
+        inline_fragments = extractor.fragments_to_text(['<p><a href="#">Siemens</a>-Aktie</p>', '<strong>7</strong>%'])
+        if inline_paragraphs != INLINE_EXPECTED or inline_fragments != ["Siemens-Aktie", "7%"]:
+            inline_ok = False
+            print(f"   {backend}: {inline_paragraphs} {inline_fragments}")
+
+    reference_blocks, reference_paragraphs = next(iter(outputs.values()))
+    print(f"-> Ein Text pro Fragment: {'ERFOLG' if len(reference_blocks) == len(tagesschau_blocks) else 'FEHLER'}")
+    print(f"-> Nur Artikelabsätze gewählt: {'ERFOLG' if len(reference_paragraphs) == 30 else 'FEHLER'}")
+    print(f"-> Links und Hervorhebungen lesbar: "
+          f"{'ERFOLG' if all('<' not in text and '  ' not in text for text in reference_blocks) else 'FEHLER'}")
+    print(f"-> Inline-Markup ohne zusätzliche Leerzeichen: {'ERFOLG' if inline_ok else 'FEHLER'}")
+    identical = all(output == outputs[available_backends()[0]] for output in outputs.values())
+    print(f"-> Alle Backends liefern denselben Text: {'ERFOLG' if identical else 'FEHLER'}")
+    print("--- TextExtractor Test beendet ---")
+
+
+if __name__ == "__main__":
+    run_text_extraction_test()